@@ -0,0 +1,76 @@
+"""Benchmark: filtros em cascata (caminho antigo x FilterIndex).
+
+Caminho antigo: copia o DataFrame, aplica máscaras com .astype(str) e recalcula
+sorted(set(...)) para cada combo. Novo: interseção de posições e contagem de
+códigos no FilterIndex. Roda sem display.
+
+    python benchmarks/benchFilter.py [linhas]
+"""
+import sys
+import time
+
+import numpy as np
+
+from synthetic import make_defaultview
+from filterIndex import FilterIndex
+
+FILTER_COLUMNS = ["EMPRESA", "IDENTIFICAÇÃO", "EQUIPAMENTO", "STATUS DA ANÁLISE"]
+REPEATS = 5
+
+
+def legacy_filter(df_original, selections):
+    df_filtered = df_original.copy()
+    for col, value in selections.items():
+        if value and col in df_filtered.columns:
+            df_filtered = df_filtered[df_filtered[col].astype(str) == value]
+    options = {col: sorted(list(set(df_filtered[col].astype(str)))) for col in FILTER_COLUMNS}
+    return df_filtered, options
+
+
+def index_filter(index, selections):
+    positions = index.filter(selections)
+    options = {col: index.options(col, positions) for col in FILTER_COLUMNS}
+    return positions, options
+
+
+def timed(func, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_defaultview(rows).fillna("")
+
+    start = time.perf_counter()
+    index = FilterIndex(df, FILTER_COLUMNS)
+    print(f"{rows} linhas | construção do índice: {time.perf_counter() - start:.3f} s\n")
+
+    scenarios = [
+        ("status", {"STATUS DA ANÁLISE": "APROVADO"}),
+        ("status + empresa", {"STATUS DA ANÁLISE": "APROVADO", "EMPRESA": "EMPRESA 007"}),
+        ("empresa + identificação + status", {"EMPRESA": "EMPRESA 007", "IDENTIFICAÇÃO": "IWT",
+                                              "STATUS DA ANÁLISE": "APROVADO"}),
+        ("todos os filtros", {"EMPRESA": "EMPRESA 007", "IDENTIFICAÇÃO": "IWT",
+                              "EQUIPAMENTO": "EQUIP-0042", "STATUS DA ANÁLISE": "APROVADO"}),
+    ]
+
+    print(f"{'cenário':<34} {'antigo (ms)':>12} {'índice (ms)':>12} {'ganho':>8}")
+    for name, selections in scenarios:
+        legacy_time, (df_filtered, legacy_options) = timed(legacy_filter, df, selections)
+        index_time, (positions, index_options) = timed(index_filter, index, selections)
+
+        # Confere que os dois caminhos produzem o mesmo resultado
+        assert np.array_equal(df.index.get_indexer(df_filtered.index), positions), name
+        assert legacy_options == index_options, name
+
+        print(f"{name:<34} {legacy_time * 1000:>12.1f} {index_time * 1000:>12.2f} "
+              f"{legacy_time / index_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: travamento do loop de eventos do Tk durante a carga dos dados.
+
+Abre a aplicação com um xlsx sintético e mede, com o EventLoopMonitor, o maior
+atraso do loop do Tk enquanto a carga (em segundo plano) acontece — a frio
+(Excel) e com o cache. Meta: nenhum travamento acima de ~50 ms. Requer display.
+
+    python benchmarks/benchLoadStall.py [linhas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import make_defaultview
+from eventLoopMonitor import EventLoopMonitor
+import downloadFiles
+
+TARGET_MS = 50
+
+
+def measure_load(excel_path):
+    downloadFiles.EXCEL_PATH = excel_path
+    app = downloadFiles.SharePointViewerApp()  # A carga começa assim que a janela aparece
+    monitor = EventLoopMonitor(app)
+    monitor.start()
+
+    start = time.perf_counter()
+    while app.dataset is None or app._loading:
+        app.update()
+    elapsed = time.perf_counter() - start
+
+    monitor.stop()
+    app.destroy()
+    return elapsed, monitor
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = os.path.join(tmp, "DefaultView-Data.xlsx")
+        make_defaultview(rows).to_excel(excel_path, sheet_name="DefaultView", index=False)
+
+        print(f"{rows} linhas | meta: travamento máximo <= {TARGET_MS} ms\n")
+        print(f"{'carga':<8} {'tempo (s)':>10} {'p95 (ms)':>10} {'máx (ms)':>10}")
+        for label in ("Excel", "cache"):
+            elapsed, monitor = measure_load(excel_path)
+            flag = "" if monitor.max_stall_ms <= TARGET_MS else "  <- acima da meta"
+            print(f"{label:<8} {elapsed:>10.2f} {monitor.percentile(95):>10.1f} "
+                  f"{monitor.max_stall_ms:>10.1f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
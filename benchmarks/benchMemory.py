@@ -0,0 +1,127 @@
+"""Benchmark: memória do conjunto DefaultView (fillna("") + cópias x compacto).
+
+Cada modo roda em um processo separado, que lê o DataFrame de um pickle
+(como o cache da aplicação), monta os índices e aplica alguns filtros. O
+modo compacto monta o Dataset como a aplicação (Dataset.from_frame: índices
+de filtro e de busca) e também busca e ordena uma vez, o que monta a
+permutação do SortIndex. Mede o pico de memória (RSS) do processo e o
+tamanho do DataFrame. Roda sem display.
+
+    python benchmarks/benchMemory.py [linhas]
+"""
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from synthetic import make_defaultview
+
+FILTERS = [{"STATUS DA ANÁLISE": "APROVADO"},
+           {"STATUS DA ANÁLISE": "APROVADO", "EMPRESA": "EMPRESA 007"},
+           {"EMPRESA": "EMPRESA 042", "IDENTIFICAÇÃO": "GUINDASTE"}]
+FILTER_COLUMNS = ["EMPRESA", "IDENTIFICAÇÃO", "EQUIPAMENTO", "STATUS DA ANÁLISE"]
+SEARCH_QUERY = "guindaste"
+SORT_KEYS = [("EMPRESA", True)]
+
+
+def peak_rss_mb():
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / 1024 / 1024
+
+    # No Linux o ru_maxrss herda o pico do processo pai (fork); VmHWM é só deste processo
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode, path):
+    """Processo filho: carrega, indexa e filtra no modo informado."""
+    from core import Dataset
+    from filterIndex import FilterIndex
+
+    with open(path, "rb") as f:
+        df = pickle.load(f)
+
+    if mode == "antes":
+        # Caminho antigo: todas as colunas viram objetos str e cada filtro copia o DataFrame
+        df = df.fillna("")
+        index = FilterIndex(df, FILTER_COLUMNS)
+        views = []
+        for selections in FILTERS:
+            mask = np.ones(len(df), dtype=bool)
+            for col, value in selections.items():
+                mask &= (df[col].astype(str) == value).to_numpy()
+            views.append(df[mask].copy())
+        rows = [len(view) for view in views]
+    else:
+        # O cache já guarda o DataFrame compacto; filtros são arrays de posições.
+        # Mesmos índices da aplicação: filtro, busca e (na primeira ordenação) SortIndex
+        dataset = Dataset.from_frame(df, compact=False)
+        rows = [len(dataset.filter(selections)) for selections in FILTERS]
+        dataset.sort(dataset.search(SEARCH_QUERY), SORT_KEYS)
+
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    print(f"{frame_mb:.1f} {peak_rss_mb():.1f} {','.join(map(str, rows))}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        run_mode(sys.argv[2], sys.argv[3])
+        return
+
+    from compactFrame import compact_frame
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    raw = make_defaultview(rows)
+    raw = raw.mask(raw == "")  # Células vazias chegam do Excel como NaN
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"antes": os.path.join(tmp, "raw.pkl"), "depois": os.path.join(tmp, "compact.pkl")}
+        with open(paths["antes"], "wb") as f:
+            pickle.dump(raw, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(paths["depois"], "wb") as f:
+            pickle.dump(compact_frame(raw), f, protocol=pickle.HIGHEST_PROTOCOL)
+        del raw
+
+        print(f"{rows} linhas | {len(FILTERS)} filtros aplicados\n")
+        print(f"{'modo':<8} {'DataFrame (MB)':>15} {'pico RSS (MB)':>14}")
+        results = {}
+        for mode, path in paths.items():
+            output = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            frame_mb, peak_mb, counts = float(output[0]), float(output[1]), output[2]
+            results[mode] = (frame_mb, peak_mb, counts)
+            print(f"{mode:<8} {frame_mb:>15.1f} {peak_mb:>14.1f}")
+
+    assert results["antes"][2] == results["depois"][2], "os filtros retornaram linhas diferentes"
+    print(f"\nredução: DataFrame {results['antes'][0] / results['depois'][0]:.1f}x, "
+          f"pico RSS {results['antes'][1] / results['depois'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
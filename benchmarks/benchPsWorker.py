@@ -0,0 +1,65 @@
+"""Benchmark: powershell.exe por operação (frio) x worker persistente (quente).
+
+Usa o benchmarks/mockPsWorker.py, que simula o custo de subida do PowerShell
+(importar PnP.PowerShell + autenticar), com o mesmo protocolo do psWorker.ps1.
+Também valida a reinicialização automática após uma queda. Roda no Linux.
+
+    python benchmarks/benchPsWorker.py [subida_s] [operações]
+"""
+import os
+import sys
+import time
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from psWorker import PowerShellWorker, WorkerCrashed
+
+MOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mockPsWorker.py")
+
+
+def worker(startup):
+    return PowerShellWorker([sys.executable, MOCK, "--startup", str(startup)])
+
+
+def main():
+    startup = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    lines = []
+
+    # Frio: um processo novo por operação (comportamento antigo do _run_powershell)
+    cold = []
+    for _ in range(operations):
+        start = time.perf_counter()
+        w = worker(startup)
+        w.run("exportAllColumns.ps1", ["-Work", "0.1"], lines.append)
+        w.stop()
+        cold.append(time.perf_counter() - start)
+
+    # Quente: o mesmo worker atende todas as operações
+    w = worker(startup)
+    warm = []
+    for _ in range(operations):
+        start = time.perf_counter()
+        w.run("exportAllColumns.ps1", ["-Work", "0.1"], lines.append)
+        warm.append(time.perf_counter() - start)
+    first_output = [t["first_output"] for t in w.timings if t["event"] == "run"]
+
+    # Queda no meio de um comando: o próximo run() reinicia o worker
+    try:
+        w.run("crash.ps1")
+        raise AssertionError("o worker deveria ter caído")
+    except WorkerCrashed:
+        pass
+    exit_code = w.run("exportAllColumns.ps1", ["-ExitCode", "7"])
+    assert exit_code == 7 and w.restarts == 1
+    w.stop()
+
+    print(f"subida simulada: {startup:.1f} s | {operations} operações de ~0.1 s\n")
+    print(f"frio  (processo por operação): média {sum(cold) / len(cold):.2f} s")
+    print(f"quente (worker persistente):   média {sum(warm[1:]) / max(1, len(warm) - 1):.3f} s "
+          f"(primeira, com subida: {warm[0]:.2f} s)")
+    print(f"primeira saída no worker quente: {min(first_output) * 1000:.1f} ms")
+    print(f"reinicializações após queda: {w.restarts}")
+
+
+if __name__ == "__main__":
+    main()
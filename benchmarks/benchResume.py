@@ -0,0 +1,104 @@
+"""Benchmark: downloads retomáveis e sem duplicação (manifesto local).
+
+Contra o SharePoint simulado:
+  1. primeira execução (tudo baixado; anexos repetidos viram hardlinks);
+  2. nova execução com tudo no disco (GET condicional, nada é retransferido);
+  3. execução com arquivos interrompidos (.part) retomados via Range.
+Mostra bytes transferidos e tempo de cada etapa e confere que um anexo
+atualizado no SharePoint não vira origem de hardlinks com o conteúdo antigo.
+Roda sem display.
+
+    python benchmarks/benchResume.py [itens] [latência_ms]
+"""
+import os
+import sys
+import tempfile
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from fakeSharePoint import ATTACHMENTS_PREFIX, make_attachments, start_server
+from attachmentManifest import AttachmentManifest
+from downloadEngine import DownloadEngine, DownloadJob, build_url
+
+
+def make_jobs(origin, files, target_dir):
+    return [DownloadJob(build_url(origin, path), os.path.join(target_dir, *path.split("/")[-2:]),
+                        item_id=path.split("/")[-2], name=path.split("/")[-1])
+            for path in files]
+
+
+def run(server, jobs, manifest):
+    sent_before = server.bytes_sent
+    engine = DownloadEngine(concurrency=8, manifest=manifest)
+    errors = engine.run(jobs)
+    assert not errors, errors[:3]
+    return engine.stats(), server.bytes_sent - sent_before
+
+
+def check_updated_attachment(server, origin, tmp):
+    """Item 1 baixa OLD, muda para NEW; depois o OLD do item 2 precisa chegar como OLD."""
+    old, new = b"OLD" * 4096, b"NEW" * 4096
+    first, second = f"{ATTACHMENTS_PREFIX}/atualizado-1/doc.pdf", f"{ATTACHMENTS_PREFIX}/atualizado-2/doc.pdf"
+    target_dir = os.path.join(tmp, "Atualizados")
+    manifest = AttachmentManifest(os.path.join(tmp, "atualizados.sqlite"))
+
+    try:
+        server.files[first] = old
+        run(server, make_jobs(origin, [first], target_dir), manifest)
+        server.files[first] = new
+        run(server, make_jobs(origin, [first], target_dir), manifest)
+        server.files[second] = old
+        stats, _ = run(server, make_jobs(origin, [second], target_dir), manifest)
+    finally:
+        manifest.close()
+        # O servidor compartilha o dicionário de anexos com main(): não deixa sobras
+        server.files.pop(first, None)
+        server.files.pop(second, None)
+
+    for path, body in ((first, new), (second, old)):
+        with open(os.path.join(target_dir, *path.split("/")[-2:]), "rb") as f:
+            assert f.read() == body, f"{path}: conteúdo de outra versão do anexo"
+    assert stats["linked"] == 0
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    files = make_attachments(items=items, shared=5)
+    count, total = len(files), sum(len(body) for body in files.values())
+    server, origin = start_server(files, latency=latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target_dir = os.path.join(tmp, "Downloads")
+        manifest = AttachmentManifest(os.path.join(tmp, "manifest.sqlite"))
+        jobs = make_jobs(origin, files, target_dir)
+
+        rows = [("primeira execução", *run(server, jobs, manifest))]
+        rows.append(("reexecução (nada mudou)", *run(server, jobs, manifest)))
+
+        # Simula downloads interrompidos no meio em 20% dos arquivos
+        for job in jobs[::5]:
+            with open(job.path, "rb") as f:
+                head = f.read(os.path.getsize(job.path) // 2)
+            os.remove(job.path)
+            with open(job.path + ".part", "wb") as f:
+                f.write(head)
+        rows.append(("retomada de .part", *run(server, jobs, manifest)))
+
+        for job, path in zip(jobs, files):
+            with open(job.path, "rb") as f:
+                assert f.read() == files[path], job.path
+        shared_links = os.stat(jobs[2].path).st_nlink
+        manifest.close()
+        check_updated_attachment(server, origin, tmp)
+
+    print(f"{count} anexos ({total / 1024 / 1024:.1f} MB) | latência {latency * 1000:.0f} ms\n")
+    print(f"{'etapa':<26} {'tempo (s)':>10} {'MB transf.':>11} {'pulados':>8} {'retomados':>10} {'hardlinks':>10}")
+    for name, stats, sent in rows:
+        print(f"{name:<26} {stats['elapsed']:>10.2f} {sent / 1024 / 1024:>11.1f} {stats['skipped']:>8} "
+              f"{stats['resumed']:>10} {stats['linked']:>10}")
+    print(f"\nlinks para o mesmo conteúdo de 'certificado.pdf': {shared_links}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
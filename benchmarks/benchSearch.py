@@ -0,0 +1,65 @@
+"""Benchmark: busca livre (índice de trigramas) em todas as colunas.
+
+Mede a construção do índice e a latência de cada busca em 200k linhas,
+comparando com a varredura das colunas pelo pandas (str.contains). Meta: busca
+em até 50 ms. Roda sem display.
+
+    python benchmarks/benchSearch.py [linhas]
+"""
+import sys
+import time
+
+import numpy as np
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from synthetic import make_defaultview
+from compactFrame import compact_frame
+from searchIndex import SearchIndex, normalize
+
+TARGET_MS = 50
+QUERIES = ["guindaste", "opacidade", "empresa 042", "equip-12", "analise", "2025-03",
+           "samir laudo", "calibracao aprovado", "naoexiste"]
+
+
+def scan(df, terms):
+    """Caminho sem índice: str.contains (normalizado) em cada coluna."""
+    result = np.ones(len(df), dtype=bool)
+    for term in terms:
+        rows = np.zeros(len(df), dtype=bool)
+        for col in df.columns:
+            text = df[col].astype(object).where(df[col].notna(), "").astype(str).map(normalize)
+            rows |= text.str.contains(term, regex=False).to_numpy()
+        result &= rows
+    return np.flatnonzero(result)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_defaultview(rows)
+    df = compact_frame(df.mask(df == ""))
+
+    start = time.perf_counter()
+    index = SearchIndex(df)
+    build = time.perf_counter() - start
+
+    print(f"{rows} linhas | construção do índice: {build:.2f} s | meta: busca <= {TARGET_MS} ms\n")
+    print(f"{'busca':<22} {'linhas':>8} {'varredura (ms)':>15} {'índice (ms)':>12}")
+    for query in QUERIES:
+        indexed_ms, positions = timed(lambda: index.search(query))
+        scan_ms, expected = timed(lambda: scan(df, index.terms(query)), repeat=1)
+        assert np.array_equal(positions, expected), f"resultado diferente para {query!r}"
+        flag = "" if indexed_ms <= TARGET_MS else "  <- acima da meta"
+        print(f"{query:<22} {len(positions):>8} {scan_ms:>15.1f} {indexed_ms:>12.2f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark: leitura da DefaultView na inicialização (Excel x cache binário).
+
+Gera um xlsx sintético, mede a leitura a frio (openpyxl + gravação do cache) e
+a leitura com o cache válido. Roda sem display.
+
+    python benchmarks/benchStartup.py [linhas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import make_defaultview
+from dataCache import cache_path_for, read_excel_cached
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = os.path.join(tmp, "DefaultView-Data.xlsx")
+        make_defaultview(rows).to_excel(excel_path, sheet_name="DefaultView", index=False)
+
+        start = time.perf_counter()
+        df_cold, from_cache = read_excel_cached(excel_path)
+        cold = time.perf_counter() - start
+        assert not from_cache
+
+        start = time.perf_counter()
+        df_hit, from_cache = read_excel_cached(excel_path)
+        hit = time.perf_counter() - start
+        assert from_cache and df_hit.equals(df_cold)
+
+        cache_size = os.path.getsize(cache_path_for(excel_path)) / 1024 / 1024
+        excel_size = os.path.getsize(excel_path) / 1024 / 1024
+
+    print(f"{rows} linhas | xlsx {excel_size:.1f} MB | cache {cache_size:.1f} MB")
+    print(f"leitura a frio (Excel + gravação do cache): {cold:.2f} s")
+    print(f"leitura com cache:                          {hit:.3f} s ({cold / hit:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: sincronização de várias listas em sequência x em paralelo.
+
+Cada fonte é exportada pelo fakeExporter (um processo por fonte, como o
+powershell.exe) depois de uma latência fixa que simula a paginação no
+SharePoint. Uma das fontes falha na primeira tentativa para exercitar o
+backoff. Compara concorrência 1 com a concorrência padrão e confere que o
+dataset mesclado é o mesmo. Roda sem display.
+
+    python benchmarks/benchSyncSources.py [fontes] [linhas por fonte] [latência s]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from core import Source, run_sync_jobs, sync_jobs
+from syncScheduler import SYNC_CONCURRENCY, SyncScheduler
+
+FAKE_EXPORTER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakeExporter.py")
+FLAKY_SOURCE = "Lista 02"
+
+
+def make_runner(rows, latency):
+    """Runner no lugar do run_powershell: latência + fakeExporter; FLAKY_SOURCE falha uma vez."""
+    failed = set()
+    lock = threading.Lock()
+
+    def runner(script_path, args, on_line=None):
+        time.sleep(latency)
+        list_id = args[args.index("-ListId") + 1]
+        with lock:
+            if list_id == FLAKY_SOURCE and list_id not in failed:
+                failed.add(list_id)
+                return 1
+        command = [sys.executable, FAKE_EXPORTER] + list(args) + ["-Rows", str(rows)]
+        return subprocess.run(command, capture_output=True).returncode
+
+    return runner
+
+
+def run(sources, rows, latency, concurrency):
+    start = time.perf_counter()
+    jobs = sync_jobs(sources, full=True, runner=make_runner(rows, latency))
+    dataset = run_sync_jobs(jobs, scheduler=SyncScheduler(concurrency, backoff=0.5))
+    return time.perf_counter() - start, dataset, jobs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    print(f"{count} fontes x {rows} linhas | latência simulada {latency:.1f} s por exportação\n")
+    results = {}
+    for concurrency in (1, SYNC_CONCURRENCY):
+        with tempfile.TemporaryDirectory() as tmp:
+            sources = [Source(f"Lista {i:02d}", "https://exemplo.sharepoint.com/sites/teste", f"Lista {i:02d}",
+                              excel_path=os.path.join(tmp, f"lista{i:02d}.xlsx")) for i in range(count)]
+            seconds, dataset, jobs = run(sources, rows, latency, concurrency)
+
+        failed = [job.name for job in jobs if not job.ok]
+        assert not failed, f"fontes com erro: {failed}"
+        assert next(job for job in jobs if job.name == FLAKY_SOURCE).attempts == 2
+        results[concurrency] = (seconds, dataset)
+        slowest = max(jobs, key=lambda job: job.seconds)
+        print(f"concorrência {concurrency}: {seconds:6.2f} s  ({len(dataset)} linhas; "
+              f"mais lenta: {slowest.name}, {slowest.seconds:.2f} s em {slowest.attempts} tentativa(s))")
+
+    sequential, parallel = results[1], results[SYNC_CONCURRENCY]
+    assert sequential[1].df.equals(parallel[1].df), "os datasets mesclados diferem"
+    counts = sequential[1].df["ORIGEM"].value_counts()
+    assert len(counts) == count and (counts == rows).all()
+    print(f"\nganho: {sequential[0] / parallel[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: latência filtro -> renderização da tabela.
+
+Compara o preenchimento clássico (apaga tudo e insere linha a linha) com o
+VirtualTreeview. Precisa de um display (Tk).
+
+    python benchmarks/benchTreeview.py
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from synthetic import make_defaultview
+from virtualTreeview import VirtualTreeview
+
+SIZES = [1_000, 10_000, 100_000]
+COL_STATUS = "STATUS DA ANÁLISE"
+
+
+def render_classic(tree, df):
+    tree.delete(*tree.get_children())
+    for index, row in df.iterrows():
+        tree.insert("", "end", values=list(row))
+
+
+def render_virtual(tree, df):
+    tree.set_data(df)
+
+
+def bench(root, tree_cls, render, df):
+    tree = tree_cls(root, show="headings", height=30)
+    tree.pack(fill="both", expand=True)
+    tree["columns"] = list(df.columns)
+    root.update()
+
+    start = time.perf_counter()
+    df_filtered = df[df[COL_STATUS].astype(str) != ""]  # Filtro que mantém todas as linhas
+    render(tree, df_filtered)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+
+    tree.destroy()
+    return elapsed
+
+
+def main():
+    root = tk.Tk()
+    root.geometry("1200x800")
+    print(f"{'linhas':>8} {'clássico (s)':>14} {'virtual (s)':>12}")
+    for size in SIZES:
+        df = make_defaultview(size).fillna("")
+        classic = bench(root, ttk.Treeview, render_classic, df)
+        virtual = bench(root, VirtualTreeview, render_virtual, df)
+        print(f"{size:>8} {classic:>14.3f} {virtual:>12.4f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
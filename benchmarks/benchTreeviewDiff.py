@@ -0,0 +1,95 @@
+"""Benchmark: operações nos itens da tabela por mudança de filtro.
+
+Compara o caminho antigo do update_treeview (reatribui colunas e cabeçalhos,
+apaga a janela e insere todas as linhas de novo) com o atual (diferença entre
+as janelas, com iids estáveis pelo ID). Conta as operações feitas no widget e
+mede o tempo em sequências típicas: refinar e limpar filtros, digitar na
+busca, alternar a ordenação e filtrar com a tabela rolada. Precisa de um
+display (Tk).
+
+    python benchmarks/benchTreeviewDiff.py [linhas]
+"""
+import sys
+import time
+import tkinter as tk
+
+import synthetic  # noqa: F401 (ajusta o sys.path para os módulos de src/)
+from core import Dataset
+from synthetic import make_defaultview
+from virtualTreeview import VirtualTreeview
+
+STATUS = "STATUS DA ANÁLISE"
+
+
+def scenarios(ds):
+    """Sequências de visões (posições), como produzidas pelos filtros da interface."""
+    everything = ds.filter({})
+    approved = ds.filter({STATUS: "APROVADO"})
+    company = ds.filter({STATUS: "APROVADO", "EMPRESA": "EMPRESA 007"})
+    return {
+        "refinar/limpar filtros": [everything, approved, company, approved, everything],
+        "busca digitada": [ds.search(query, everything) for query in ("gui", "guin", "guind", "guinda", "")],
+        "ordenar coluna": [ds.sort(everything, keys) for keys in
+                           ([("EMPRESA", True)], [("EMPRESA", False)], [], [("EMPRESA", True)])],
+        "filtro com a tabela rolada": [everything, approved, everything, approved],
+    }
+
+
+def show_before(tree, df, positions):
+    """update_treeview antigo: colunas e cabeçalhos reatribuídos e a janela refeita."""
+    cols = list(df.columns)
+    tree["columns"] = cols
+    for col in cols:
+        tree.heading(col, text=col)
+        tree.column(col, width=100, minwidth=50)
+    tree.set_data(df, positions)
+    return 1 + 2 * len(cols)
+
+
+def show_after(tree, df, positions):
+    """update_treeview atual: mesmas colunas e cabeçalhos, só a diferença das linhas."""
+    tree.update_data(df, positions)
+    return 0
+
+
+def run(root, ds, show, views, scrolled):
+    tree = VirtualTreeview(root, key_columns=("ORIGEM", "ID"), show="headings", height=30)
+    tree.pack(fill="both", expand=True)
+    tree["columns"] = list(ds.df.columns)
+    tree.set_data(ds.df, views[0])
+    if scrolled:
+        tree.yview("moveto", 0.5)
+    root.update()
+
+    ops, elapsed = 0, 0.0
+    for positions in views[1:]:
+        before = sum(tree.widget_ops.values())
+        start = time.perf_counter()
+        extra = show(tree, ds.df, positions)
+        root.update_idletasks()
+        elapsed += time.perf_counter() - start
+        ops += extra + sum(tree.widget_ops.values()) - before
+
+    tree.destroy()
+    changes = len(views) - 1
+    return ops / changes, elapsed / changes * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ds = Dataset.from_frame(make_defaultview(rows))
+
+    root = tk.Tk()
+    root.geometry("1200x800")
+    print(f"{rows} linhas | operações no widget e tempo por mudança de visão\n")
+    print(f"{'cenário':<28} {'ops antes':>10} {'ops depois':>11} {'ms antes':>9} {'ms depois':>10}")
+    for name, views in scenarios(ds).items():
+        scrolled = "rolada" in name
+        ops_before, ms_before = run(root, ds, show_before, views, scrolled)
+        ops_after, ms_after = run(root, ds, show_after, views, scrolled)
+        print(f"{name:<28} {ops_before:>10.1f} {ops_after:>11.1f} {ms_before:>9.1f} {ms_after:>10.1f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Exportador local que substitui o exportAllColumns.ps1 nos testes/benchmarks.
+
+Aceita os mesmos parâmetros do script PowerShell. Gera uma lista sintética
+fixa (semente derivada de -ListId: cada fonte tem os seus dados) e, no modo
+delta (-Since/-DeltaPath), grava um delta fixo sobre ela no formato lido por
+deltaSync.read_delta. -PageDelay simula a paginação no SharePoint (uma página
+de -PageSize itens a cada -PageDelay segundos) e, com -StreamPath, cada página
+é gravada em NDJSON (valores como texto) assim que "lida", antes do Excel.
+
+    python benchmarks/fakeExporter.py -OutputPath lista.xlsx [-Rows 10000]
+    python benchmarks/fakeExporter.py -OutputPath lista.xlsx -StreamPath lista.ndjson [-PageDelay 0.5]
+    python benchmarks/fakeExporter.py -Since "2025-01-01 00:00" -DeltaPath delta.json
+"""
+import argparse
+import json
+import time
+import zlib
+
+from synthetic import make_defaultview, make_delta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prefix_chars="-")
+    parser.add_argument("-Rows", type=int, default=10_000)
+    parser.add_argument("-OutputPath", default="DefaultView-Data.xlsx")
+    parser.add_argument("-Since", default="")
+    parser.add_argument("-DeltaPath", default="")
+    parser.add_argument("-SiteUrl", default="")
+    parser.add_argument("-ListId", default="")
+    parser.add_argument("-StreamPath", default="")
+    parser.add_argument("-PageSize", type=int, default=2000)
+    parser.add_argument("-PageDelay", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    df = make_defaultview(args.Rows, seed=zlib.crc32(args.ListId.encode()) if args.ListId else 42)
+    if args.Since and args.DeltaPath:
+        print(f"Gerando delta desde {args.Since}...")
+        with open(args.DeltaPath, "w", encoding="utf-8") as f:
+            json.dump(make_delta(df), f, ensure_ascii=False)
+        print(f"Delta gravado em: {args.DeltaPath}")
+    else:
+        if args.StreamPath or args.PageDelay:
+            read_pages(df, args.PageSize, args.PageDelay, args.StreamPath)
+        print(f"Gerando Excel com {args.Rows} itens...")
+        df.to_excel(args.OutputPath, sheet_name="DefaultView", index=False)
+        print(f"File generated at: {args.OutputPath}")
+
+
+def read_pages(df, page_size, page_delay, stream_path=""):
+    """Percorre a lista em páginas; com stream_path acrescenta cada uma ao NDJSON, como o exportAllColumns.ps1."""
+    text = df.astype(object).where(df.notna(), "").astype(str)
+    if stream_path:
+        open(stream_path, "w", encoding="utf-8").close()
+    for start in range(0, len(text), page_size):
+        time.sleep(page_delay)
+        if stream_path:
+            page = text.iloc[start:start + page_size].to_dict(orient="records")
+            with open(stream_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in page)
+        print(json.dumps({"type": "progress", "phase": "Baixando itens",
+                          "done": min(start + page_size, len(text)), "total": len(text)}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
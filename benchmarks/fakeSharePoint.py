@@ -0,0 +1,105 @@
+"""Servidor HTTP local que imita os endpoints de anexos do SharePoint.
+
+Serve arquivos em /sites/<site>/Lists/<lista>/Attachments/<id>/<nome> com
+keep-alive (HTTP/1.1), Content-Length, ETag (If-None-Match -> 304),
+requisições Range/If-Range e autenticação Bearer opcional. Pode simular latência por requisição.
+
+    python benchmarks/fakeSharePoint.py   # sobe na porta 8765 com 200 anexos
+"""
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import numpy as np
+
+ATTACHMENTS_PREFIX = "/sites/CC-Subcontractors-BR/Lists/Docs/Attachments"
+
+
+def make_attachments(items=100, per_item=2, size=256 * 1024, shared=0, seed=1):
+    """Retorna {caminho relativo ao servidor: conteúdo} com anexos sintéticos.
+
+    shared > 0 acrescenta a cada item um anexo com conteúdo repetido entre os
+    itens (há `shared` conteúdos distintos), como um mesmo certificado anexado
+    a vários equipamentos.
+    """
+    rng = np.random.default_rng(seed)
+    common = [rng.bytes(size) for _ in range(shared)]
+    files = {}
+    for item_id in range(1, items + 1):
+        for n in range(per_item):
+            files[f"{ATTACHMENTS_PREFIX}/{item_id}/documento {n}.pdf"] = rng.bytes(size)
+        if shared:
+            files[f"{ATTACHMENTS_PREFIX}/{item_id}/certificado.pdf"] = common[item_id % shared]
+    return files
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Mantém a conexão aberta entre requisições
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+            return self._send(401, b"")
+
+        body = server.files.get(unquote(self.path))
+        if body is None:
+            return self._send(404, b"")
+
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", {"ETag": etag})
+
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if match and (if_range is None or if_range == etag):
+            if int(match.group(1)) >= len(body):
+                return self._send(416, b"", {"Content-Range": f"bytes */{len(body)}"})
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(body) - 1
+            headers = {"ETag": etag, "Content-Range": f"bytes {start}-{end}/{len(body)}"}
+            return self._send(206, body[start:end + 1], headers)
+        return self._send(200, body, {"ETag": etag})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+        self.wfile.write(body)
+
+
+def start_server(files, token=None, latency=0.0, port=0):
+    """Sobe o servidor em uma thread. Retorna (server, origem 'http://127.0.0.1:porta')."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    server.files = files
+    server.token = token
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.bytes_sent = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    server, origin = start_server(make_attachments(), port=8765)
+    print(f"Servindo {len(server.files)} anexos em {origin}{ATTACHMENTS_PREFIX}/ (Ctrl+C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,61 @@
+"""Worker simulado com o mesmo protocolo do src/psWorker.ps1 (roda no Linux).
+
+Simula o custo de subida (importar PnP.PowerShell + autenticar) com --startup
+e executa "scripts" falsos: emite linhas de log e de progresso e encerra com a
+mensagem "done". Um script chamado "crash" derruba o processo, para testar a
+reinicialização automática.
+
+    python benchmarks/mockPsWorker.py --startup 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def emit(message):
+    sys.stdout.write((json.dumps(message) if isinstance(message, dict) else message) + "\n")
+    sys.stdout.flush()
+
+
+def run_script(script, params):
+    name = os.path.splitext(os.path.basename(script))[0]
+    if name == "crash":
+        os._exit(3)
+
+    total = int(params.get("Items", 20))
+    work = float(params.get("Work", 0.2))
+    emit(f"Executando {name}...")
+    for done in range(1, total + 1):
+        time.sleep(work / total)
+        emit({"type": "progress", "phase": name, "done": done, "total": total, "bytes": 0})
+    emit(f"{name} concluído")
+    return int(params.get("ExitCode", 0))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--startup", type=float, default=2.0)
+    args = parser.parse_args()
+
+    emit("Importando PnP.PowerShell e conectando (simulado)...")
+    time.sleep(args.startup)
+    emit({"type": "ready"})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        command = json.loads(line)
+        if command.get("type") == "exit":
+            break
+        exit_code, error = 0, ""
+        try:
+            exit_code = run_script(command["script"], command.get("params") or {})
+        except Exception as e:
+            exit_code, error = 1, str(e)
+        emit({"type": "done", "id": command["id"], "exit_code": exit_code, "error": error})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Gera planilhas DefaultView sintéticas para os benchmarks."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+
+# Permite importar os módulos da aplicação (src/) nos benchmarks
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+EMPRESAS = [f"EMPRESA {i:03d}" for i in range(120)]
+IDENTIFICACOES = ["IWT", "TEST", "GUINDASTE", "MUNCK", "VEICULO", "PLATAFORMA", "GERADOR", "COMPRESSOR"]
+EQUIPAMENTOS = [f"EQUIP-{i:04d}" for i in range(2000)]
+STATUS = ["APROVADO", "REPROVADO", "AGUARDANDO ANÁLISE", "EM REVISÃO"]
+DOCUMENTOS = ["Veículo - CRLV", "Guindaste/Guindauto -Teste de Opacidade", "ART", "Certificado de Calibração",
+              "Laudo Técnico", "Checklist NR-12", "Apólice de Seguro"]
+
+
+def make_defaultview(rows, seed=42):
+    """Retorna um DataFrame com as mesmas colunas da DefaultView exportada."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 700 * 24 * 60, rows), unit="min")
+    fmt_dates = dates.strftime("%Y-%m-%d %H:%M")
+    return pd.DataFrame({
+        "ID": np.arange(1, rows + 1),
+        "IDENTIFICAÇÃO": rng.choice(IDENTIFICACOES, rows),
+        "EQUIPAMENTO": rng.choice(EQUIPAMENTOS, rows),
+        "MODELO": rng.choice(["TEST", "MUNCK", "XCMG", "LIEBHERR", ""], rows),
+        "EMPRESA": rng.choice(EMPRESAS, rows),
+        "DOCUMENTOS": rng.choice(DOCUMENTOS, rows),
+        "DATA DO VENCIMENTO": fmt_dates,
+        "STATUS DA ANÁLISE": rng.choice(STATUS, rows),
+        "STATUS DO VENCIMENTO": rng.choice(["VENCIDO", "VIGENTE", "A VENCER"], rows),
+        "Attachments": rng.choice(["Sim", "Não"], rows),
+        "Created": fmt_dates,
+        "Created By": rng.choice(["Samir Pessoa Rodrigues", "Laryssa Priscila H. de Souza"], rows),
+        "Modified": fmt_dates,
+        "Modified By": rng.choice(["Samir Pessoa Rodrigues", "Laryssa Priscila H. de Souza"], rows),
+    })
+
+
+def make_delta(df, updated=500, added=200, removed=100, seed=7):
+    """Simula o resultado do exportador em modo delta sobre df.
+
+    Retorna o payload {"ids": [...], "items": [...]} no formato de deltaSync.read_delta.
+    """
+    rng = np.random.default_rng(seed)
+    ids = df["ID"].to_numpy()
+    removed_ids = set(rng.choice(ids, removed, replace=False).tolist())
+    candidates = np.array([i for i in ids if i not in removed_ids])
+    updated_ids = rng.choice(candidates, updated, replace=False)
+
+    changed = df[df["ID"].isin(updated_ids)].copy()
+    changed["STATUS DA ANÁLISE"] = rng.choice(STATUS + ["NOVO STATUS"], len(changed))
+    changed["Modified"] = "2026-01-01 10:00"
+
+    new_rows = make_defaultview(added, seed=seed + 1)
+    new_rows["ID"] = np.arange(ids.max() + 1, ids.max() + 1 + added)
+    new_rows["EMPRESA"] = rng.choice(EMPRESAS + ["EMPRESA NOVA"], added)
+
+    items = pd.concat([changed, new_rows]).astype(str).to_dict("records")
+    current = [int(i) for i in ids if i not in removed_ids] + new_rows["ID"].tolist()
+    return {"ids": current, "items": items}
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    item_id    TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    url        TEXT,
+    size       INTEGER,
+    etag       TEXT,
+    sha256     TEXT,              -- NULL enquanto o download está incompleto
+    local_path TEXT,
+    updated_at REAL,
+    PRIMARY KEY (item_id, name)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,      -- Conteúdo único: demais cópias são hardlinks deste arquivo
+    path   TEXT NOT NULL,
+    size   INTEGER,
+    mtime  INTEGER                -- st_mtime_ns do arquivo ao registrar (detecta sobrescrita)
+);
+"""
+HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentManifest:
+    """Manifesto local (SQLite) dos anexos já baixados.
+
+    Guarda, por item e nome de anexo, tamanho, ETag, hash e caminho local. O
+    motor de download usa essas informações para pular arquivos inalterados
+    (GET condicional), retomar downloads parciais e gravar conteúdo repetido
+    uma única vez (hardlink). Seguro para uso pelas threads do pool.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(blobs)")]
+        if "mtime" not in columns:
+            # Manifesto de uma versão anterior: blobs sem mtime são conferidos pelo hash
+            self._conn.execute("ALTER TABLE blobs ADD COLUMN mtime INTEGER")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, item_id, name):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM files WHERE item_id = ? AND name = ?", (str(item_id), name)
+            ).fetchone()
+
+    def is_current(self, record):
+        """O registro aponta para um arquivo completo, presente e do tamanho esperado?"""
+        return (record is not None and record["sha256"] is not None and record["local_path"]
+                and os.path.isfile(record["local_path"])
+                and os.path.getsize(record["local_path"]) == record["size"])
+
+    def start(self, item_id, name, url, etag, local_path):
+        """Marca o download como em andamento (guarda a ETag para retomar com Range)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (item_id, name, url, size, etag, sha256, local_path, updated_at) "
+                "VALUES (?, ?, ?, NULL, ?, NULL, ?, ?)",
+                (str(item_id), name, url, etag, local_path, time.time()))
+
+    def complete(self, item_id, name, url, size, etag, sha256, local_path):
+        """Registra o anexo baixado em local_path (que acabou de ser sobrescrito com sha256).
+
+        Blobs de outro conteúdo que apontavam para local_path passam para outra
+        cópia íntegra do mesmo conteúdo, ou são removidos.
+        """
+        with self._lock, self._conn:
+            stale = self._conn.execute("SELECT sha256 FROM blobs WHERE path = ? AND sha256 != ?",
+                                       (local_path, sha256)).fetchall()
+            for row in stale:
+                self._repoint_blob(row["sha256"], local_path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (item_id, name, url, size, etag, sha256, local_path, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(item_id), name, url, size, etag, sha256, local_path, time.time()))
+
+    def move(self, item_id, name, local_path):
+        """Atualiza o caminho local de um anexo inalterado (ex.: nova pasta do dia)."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE files SET local_path = ?, updated_at = ? WHERE item_id = ? AND name = ?",
+                               (local_path, time.time(), str(item_id), name))
+
+    def _repoint_blob(self, sha256, replaced_path):
+        # Chamado com o lock e a transação abertos
+        rows = self._conn.execute(
+            "SELECT local_path, size FROM files WHERE sha256 = ? AND local_path != ?",
+            (sha256, replaced_path)).fetchall()
+        for row in rows:
+            path = row["local_path"]
+            if os.path.isfile(path) and os.path.getsize(path) == row["size"] and file_sha256(path) == sha256:
+                self._conn.execute("UPDATE blobs SET path = ?, size = ?, mtime = ? WHERE sha256 = ?",
+                                   (path, row["size"], os.stat(path).st_mtime_ns, sha256))
+                return
+        self._conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+
+    def blob_path(self, sha256):
+        """Caminho de um arquivo existente com esse conteúdo, ou None.
+
+        O arquivo é conferido (tamanho e mtime; sem mtime registrado, o hash)
+        antes de ser usado: se foi sobrescrito com outro conteúdo, o blob é
+        descartado e nada é ligado a ele.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT path, size, mtime FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        if row is None:
+            return None
+        path = row["path"]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is not None and stat.st_size == row["size"]:
+            if row["mtime"] is not None and stat.st_mtime_ns == row["mtime"]:
+                return path
+            if file_sha256(path) == sha256:
+                self.add_blob(sha256, path, row["size"])
+                return path
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM blobs WHERE sha256 = ? AND path = ?", (sha256, path))
+        return None
+
+    def add_blob(self, sha256, path, size):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO blobs (sha256, path, size, mtime) VALUES (?, ?, ?, ?)",
+                               (sha256, path, size, os.stat(path).st_mtime_ns))
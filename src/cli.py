@@ -0,0 +1,132 @@
+"""Linha de comando (sem interface gráfica) para rodar em agendadores/CI.
+
+Exemplos:
+    python src/cli.py --sync delta --status Aprovado --empresa "ACME" --target-dir D:\\Anexos
+    python src/cli.py --sync none --status Aprovado --no-download --list-ids
+
+Sincronizar e baixar exigem login no SharePoint. Sem navegador (agendador),
+use o login por certificado: --client-id, --tenant e --thumbprint (ou as
+variáveis DOCSDOWNLOADER_CLIENT_ID, DOCSDOWNLOADER_TENANT e
+DOCSDOWNLOADER_THUMBPRINT). Sem ele a execução falha logo, a menos que
+--interactive permita o login pelo navegador.
+
+Com um sources.json (várias listas/sites) as fontes são sincronizadas em
+paralelo e mescladas; a coluna ORIGEM indica a fonte de cada linha.
+
+O resultado sai em JSON no stdout; logs e progresso dos scripts vão para o
+stderr. O código de saída é 0 em caso de sucesso, 1 em caso de erro e 2 quando
+o download termina com falhas em algum arquivo ou alguma fonte não sincroniza.
+"""
+import argparse
+import json
+import os
+import sys
+
+import core
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DocsDownloader sem interface gráfica")
+    parser.add_argument("--empresa", default="", help="Filtro de Empresa (valor exato)")
+    parser.add_argument("--identificacao", default="", help="Filtro de Identificação (valor exato)")
+    parser.add_argument("--equipamento", default="", help="Filtro de Equipamento (valor exato)")
+    parser.add_argument("--status", default="", help="Filtro de Status da Análise (valor exato)")
+    parser.add_argument("--busca", default="", help="Busca livre em todas as colunas (parte do texto)")
+    parser.add_argument("--sync", choices=["none", "delta", "full"], default="delta",
+                        help="Sincroniza com o SharePoint antes de filtrar (padrão: delta)")
+    parser.add_argument("--no-download", action="store_true", help="Apenas filtra, sem baixar anexos")
+    parser.add_argument("--list-ids", action="store_true", help="Inclui os IDs filtrados no resultado")
+    parser.add_argument("--target-dir", default=core.DOWNLOAD_DIR, help="Pasta de destino dos anexos")
+    parser.add_argument("--concurrency", type=int, default=core.DOWNLOAD_CONCURRENCY,
+                        help="Downloads simultâneos")
+    parser.add_argument("--excel", default=core.EXCEL_PATH, help="Planilha DefaultView local")
+    parser.add_argument("--sources", default=core.SOURCES_PATH,
+                        help="Configuração de várias listas (usada se o arquivo existir)")
+    parser.add_argument("--sync-concurrency", type=int, default=core.SYNC_CONCURRENCY,
+                        help="Fontes sincronizadas simultaneamente")
+    parser.add_argument("--client-id", default=None,
+                        help=f"App do Entra ID usado no login; também via {core.AUTH_ENV['client_id']}")
+    parser.add_argument("--tenant", default=None,
+                        help=f"Tenant para o login por certificado; também via {core.AUTH_ENV['tenant']}")
+    parser.add_argument("--thumbprint", default=None,
+                        help=f"Certificado (thumbprint) do login sem navegador; também via "
+                             f"{core.AUTH_ENV['thumbprint']}")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Permite o login pelo navegador quando não há certificado configurado")
+    parser.add_argument("--quiet", action="store_true", help="Não repassa os logs dos scripts ao stderr")
+    parser.add_argument("--telemetry", default=None, metavar="ARQUIVO",
+                        help=f"Grava os tempos (telemetria) em JSONL; também via {core.TELEMETRY_ENV}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def log(line):
+        if not args.quiet:
+            sys.stderr.write(line.rstrip("\n") + "\n")
+            sys.stderr.flush()
+
+    result = {"ok": False}
+    exit_code = 1
+    try:
+        core.start_telemetry_export(args.telemetry)
+        unattended = core.configure_auth(args.client_id, args.tenant, args.thumbprint,
+                                         interactive=args.interactive)
+        if not unattended and not args.interactive and (args.sync != "none" or not args.no_download):
+            # Sem certificado o PnP abriria o navegador e o agendador ficaria preso
+            raise RuntimeError("Login sem navegador não configurado: informe --client-id, --tenant e "
+                               "--thumbprint (ou as variáveis DOCSDOWNLOADER_*) ou use --interactive")
+        sources = core.load_sources(args.sources)
+        dataset = None
+        sync_failed = False
+        if sources:
+            dataset, from_cache = core.Dataset.load_all(sources)
+        elif os.path.exists(args.excel):
+            dataset, from_cache = core.Dataset.load(args.excel)
+        if dataset is not None:
+            result["load"] = {"rows": len(dataset), "origin": "cache" if from_cache else "Excel"}
+
+        if args.sync != "none" and sources:
+            dataset, result["sync"] = core.sync_sources(sources, dataset, full=args.sync == "full",
+                                                        on_line=log, concurrency=args.sync_concurrency)
+            sync_failed = any(not stats["ok"] for stats in result["sync"].values())
+        elif args.sync != "none":
+            dataset, result["sync"] = core.sync(dataset, args.excel, full=args.sync == "full", on_line=log)
+
+        if dataset is None:
+            raise FileNotFoundError(f"Excel não encontrado: {args.excel}")
+
+        selections = dataset.selections(args.empresa, args.identificacao, args.equipamento, args.status)
+        positions = dataset.search(args.busca, dataset.filter(selections))
+        ids = dataset.ids(positions)
+        result["filter"] = {"selections": {col: value for col, value in selections.items() if value},
+                            "count": len(ids)}
+        if args.busca:
+            result["filter"]["busca"] = args.busca
+        if args.list_ids:
+            result["filter"]["ids"] = ids
+
+        exit_code = 2 if sync_failed else 0
+        if ids and not args.no_download:
+            groups = core.download_groups(dataset.ids_by_source(positions), sources,
+                                          args.target_dir) if sources else None
+            result["download"] = core.download(ids, args.target_dir, on_line=log,
+                                               concurrency=args.concurrency, groups=groups)
+            if result["download"]["errors"]:
+                exit_code = 2
+        result["ok"] = True
+
+    except Exception as e:
+        result["error"] = str(e)
+        exit_code = 1
+    finally:
+        core.TELEMETRY.stop_export()
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Colunas de texto com até esta fração de valores distintos viram categóricas
+CATEGORY_MAX_RATIO = 0.5
+NUMERIC_KINDS = ("integer", "floating", "mixed-integer-float", "decimal")
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _compact_numeric(series):
+    """Inteiros com vazios viram Int64; demais numéricos, Float64 (vazio = <NA>)."""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if len(present) and np.array_equal(present, np.round(present)) and np.abs(present).max() < 2 ** 53:
+        return series.astype("Int64")
+    return series.astype("Float64")
+
+
+def _compact_text(series, max_ratio):
+    # Texto vazio é tratado como ausente (o Excel antigo/cache podia trazer "")
+    series = series.mask(series.astype(object) == "")
+    present = series.dropna()
+    if not len(present):
+        return series.astype("category")
+
+    # Números guardados como objetos (ex.: cache antigo com "" nos vazios) voltam a ser numéricos;
+    # textos com cara de número ("00123") continuam texto
+    if pd.api.types.infer_dtype(present, skipna=True) in NUMERIC_KINDS:
+        return _compact_numeric(pd.to_numeric(series, errors="coerce"))
+
+    if present.nunique() <= max_ratio * len(series):
+        return series.astype("category")
+    return series
+
+
+def compact_frame(df, max_ratio=CATEGORY_MAX_RATIO):
+    """Converte o DataFrame lido do Excel para tipos compactos.
+
+    - texto repetitivo (empresa, status, equipamento...) vira category: um
+      código por linha em vez de um objeto str;
+    - números com células vazias viram Int64/Float64 nullable, em vez de
+      float com NaN ou de objetos com "" (como fazia o fillna("") antigo);
+    - o restante do texto é mantido, com ausentes como NaN.
+
+    Ausentes são exibidos como "" pela tabela e tratados como "" pelo índice
+    de filtros, então o comportamento da interface não muda.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype) \
+                or pd.api.types.is_datetime64_any_dtype(dtype):
+            columns[col] = series
+        elif pd.api.types.is_numeric_dtype(dtype):
+            # Int64/Float64 já são compactos
+            columns[col] = series if pd.api.types.is_extension_array_dtype(dtype) else _compact_numeric(series)
+        elif _is_text(series):
+            columns[col] = _compact_text(series, max_ratio)
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def align_dtypes(base, delta):
+    """Ajusta as colunas do delta aos tipos do conjunto local antes do concat.
+
+    Categóricas recebem as categorias novas (nos dois lados) e numéricas são
+    convertidas, para que o resultado continue compacto sem reprocessar todas
+    as linhas. Retorna (base, delta).
+    """
+    base = base.copy(deep=False)
+    delta = delta.copy()
+    for col in delta.columns:
+        values = delta[col].mask(delta[col].astype(object) == "")
+        dtype = base[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            new = pd.Index(values.dropna().unique()).difference(dtype.categories)
+            if len(new):
+                base[col] = base[col].cat.add_categories(new)
+            delta[col] = pd.Categorical(values, categories=base[col].cat.categories)
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numbers = pd.to_numeric(values, errors="coerce")
+            # Texto em coluna numérica: deixa o concat promover para object
+            if numbers.notna().sum() != values.notna().sum():
+                delta[col] = values
+                continue
+            try:
+                delta[col] = numbers.astype(dtype)
+            except (TypeError, ValueError):
+                delta[col] = numbers
+        else:
+            delta[col] = values
+    return base, delta
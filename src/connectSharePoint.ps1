@@ -0,0 +1,44 @@
+# Conexão ao SharePoint usada por todos os scripts (carregado com ". connectSharePoint.ps1").
+#
+# Os cmdlets recebem a conexão explicitamente (-ReturnConnection). Modos de login:
+#   - Certificado (sem navegador, para agendadores): ClientId + Tenant + Thumbprint
+#     (DOCSDOWNLOADER_CLIENT_ID, DOCSDOWNLOADER_TENANT e DOCSDOWNLOADER_THUMBPRINT);
+#     o certificado fica no repositório de certificados do Windows.
+#   - Interativo com app do Entra ID (-Interactive -ClientId): abre o navegador e
+#     emite token OAuth.
+#   - Sem ClientId: -UseWebLogin (navegador), como sempre. Autentica só com cookies
+#     (FedAuth/rtFa) e não emite token, então não serve para o motor de download
+#     em Python: quem precisa do token passa -RequireToken.
+# Com DOCSDOWNLOADER_NONINTERACTIVE=1 (definido pelo cli.py) o login pelo navegador
+# falha em vez de esperar por um usuário que não existe.
+
+function Connect-DocsSharePoint {
+    param(
+        [Parameter(Mandatory=$true)]
+        [string]$Url,
+        [string]$ClientId = $env:DOCSDOWNLOADER_CLIENT_ID,
+        [string]$Tenant = $env:DOCSDOWNLOADER_TENANT,
+        [string]$Thumbprint = $env:DOCSDOWNLOADER_THUMBPRINT,
+        [switch]$RequireToken
+    )
+
+    if ($ClientId -and $Tenant -and $Thumbprint) {
+        $conn = Connect-PnPOnline -Url $Url -ClientId $ClientId -Tenant $Tenant -Thumbprint $Thumbprint -ReturnConnection
+    } elseif ($env:DOCSDOWNLOADER_NONINTERACTIVE -eq "1") {
+        throw ("Login interativo indisponível em modo não interativo: informe ClientId, Tenant e Thumbprint " +
+               "(DOCSDOWNLOADER_CLIENT_ID, DOCSDOWNLOADER_TENANT e DOCSDOWNLOADER_THUMBPRINT) para o login por certificado.")
+    } elseif ($ClientId) {
+        $conn = Connect-PnPOnline -Url $Url -Interactive -ClientId $ClientId -ReturnConnection
+    } elseif ($RequireToken) {
+        throw (Get-DocsClientIdMessage)
+    } else {
+        $conn = Connect-PnPOnline -Url $Url -UseWebLogin -ReturnConnection
+    }
+    if (-not $conn) { throw "Connect-PnPOnline não retornou a conexão." }
+    return $conn
+}
+
+function Get-DocsClientIdMessage {
+    return ("O download de anexos precisa de token OAuth: registre um app no Entra ID com permissão no " +
+            "SharePoint e informe o Application (client) ID em DOCSDOWNLOADER_CLIENT_ID.")
+}
@@ -0,0 +1,678 @@
+"""Núcleo sem interface gráfica: carga dos dados, filtros e orquestração.
+
+Usado pela interface (downloadFiles.py) e pela linha de comando (cli.py). Não
+importa tkinter/customtkinter.
+"""
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+from attachmentManifest import AttachmentManifest
+from downloadEngine import DownloadEngine, jobs_from_listing
+from psWorker import hidden_startupinfo
+from syncScheduler import SYNC_CONCURRENCY, SyncJob, SyncScheduler
+from telemetry import TELEMETRY
+
+# dataCache, deltaSync e filterIndex dependem do pandas (~0,5 s para importar):
+# são importados sob demanda, para que a janela apareça antes (ver preload_data_layer)
+
+# Define o caminho do Excel na raiz do projeto (um nível acima de src)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+
+# ==== CONFIGURAÇÕES ====
+PS_EXPORT_SCRIPT = os.path.join(SRC_DIR, "exportAllColumns.ps1")
+PS_DOWNLOAD_SCRIPT = os.path.join(SRC_DIR, "downloadAttachments.ps1")
+EXCEL_PATH = os.path.join(BASE_DIR, "DefaultView-Data.xlsx")
+SHEET_NAME = "DefaultView"
+DELTA_PATH = os.path.join(BASE_DIR, "DefaultView-Delta.json")
+STREAM_PATH = os.path.join(BASE_DIR, "DefaultView-Stream.ndjson")  # Itens gravados pelo exportador página a página
+STREAM_BUSY_RATIO = 4  # Espera entre remontagens do dataset parcial = 4x a duração da última (~20% de CPU)
+FIRST_PAGE_ROWS = 500  # Linhas exibidas antes da leitura completa do Excel
+
+# Download de anexos (motor em Python)
+DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads")
+DOWNLOAD_CONCURRENCY = 8        # Downloads simultâneos
+DOWNLOAD_RATE_PER_HOST = 20     # Requisições por segundo por host
+ATTACHMENTS_LIST_PATH = os.path.join(tempfile.gettempdir(), "DocsDownloader-anexos.json")
+MANIFEST_PATH = os.path.join(BASE_DIR, "attachments-manifest.sqlite")  # Anexos já baixados
+
+# Várias listas/sites (opcional): sem sources.json a aplicação usa só a lista padrão acima
+SOURCES_PATH = os.path.join(BASE_DIR, "sources.json")
+SOURCES_DIR = os.path.join(BASE_DIR, "sources")  # Planilha e delta de cada fonte
+SOURCE_COLUMN = "ORIGEM"  # Coluna com o nome da fonte de cada linha no dataset mesclado
+
+# Telemetria: gravação opcional dos tempos em JSONL (janela de diagnóstico, --telemetry ou variável de ambiente)
+TELEMETRY_PATH = os.path.join(BASE_DIR, "telemetry.jsonl")
+TELEMETRY_ENV = "DOCSDOWNLOADER_TELEMETRY"  # Caminho do arquivo; "1" usa TELEMETRY_PATH
+STARTUP_PROFILE_PATH = os.path.join(BASE_DIR, "startup-profile.txt")  # Relatório do --profile-startup
+
+# Login no SharePoint (connectSharePoint.ps1): os scripts leem estas variáveis de ambiente.
+# ClientId + Tenant + Thumbprint = login por certificado, sem navegador (agendadores)
+AUTH_ENV = {"client_id": "DOCSDOWNLOADER_CLIENT_ID", "tenant": "DOCSDOWNLOADER_TENANT",
+            "thumbprint": "DOCSDOWNLOADER_THUMBPRINT"}
+NONINTERACTIVE_ENV = "DOCSDOWNLOADER_NONINTERACTIVE"  # "1": os scripts falham em vez de abrir o navegador
+
+# Nomes padrão das colunas; substituídos pelos encontrados na planilha (PT/EN)
+DEFAULT_COLUMNS = {
+    "col_id": "ID",
+    "col_empresa": "EMPRESA",
+    "col_identificacao": "IDENTIFICAÇÃO",
+    "col_equipamento": "EQUIPAMENTO",
+    "col_status": "STATUS DA ANÁLISE",
+    "col_modified": "Modified",
+}
+COLUMN_ALIASES = {
+    "col_id": ["ID"],
+    "col_empresa": ["EMPRESA", "COMPANY"],
+    "col_identificacao": ["IDENTIFICAÇÃO", "IDENTIFICACAO"],
+    "col_equipamento": ["EQUIPAMENTO", "EQUIPMENT"],
+    "col_status": ["STATUS DA ANÁLISE", "ANALYSIS STATUS"],
+    "col_modified": ["MODIFIED", "MODIFICADO"],
+}
+FILTER_KEYS = ["col_empresa", "col_identificacao", "col_equipamento", "col_status"]
+
+
+def preload_data_layer():
+    """Importa pandas e os módulos de dados. Retorna o tempo gasto (s).
+
+    Chamado em uma thread na abertura da aplicação, em paralelo à montagem dos
+    widgets; a carga dos dados reaproveita os módulos já importados.
+    """
+    start = time.perf_counter()
+    import compactFrame  # noqa: F401
+    import dataCache  # noqa: F401
+    import deltaSync  # noqa: F401
+    import filterIndex  # noqa: F401
+    import searchIndex  # noqa: F401
+    import sortIndex  # noqa: F401
+    return time.perf_counter() - start
+
+
+class PowerShellError(Exception):
+    def __init__(self, script_path, return_code):
+        super().__init__(f"{os.path.basename(script_path)} terminou com código {return_code}")
+        self.return_code = return_code
+
+
+def resolve_columns(columns, defaults=DEFAULT_COLUMNS):
+    """Mapeia as colunas de ID e filtros pelos nomes (PT/EN) presentes na planilha"""
+    cols_upper = [str(c).upper() for c in columns]
+    resolved = dict(defaults)
+    for key, names in COLUMN_ALIASES.items():
+        for name in names:
+            if name in cols_upper:
+                resolved[key] = columns[cols_upper.index(name)]
+                break
+    return resolved
+
+
+class Source:
+    """Uma lista do SharePoint configurada em sources.json."""
+
+    def __init__(self, name, site_url, list_id, excel_path=None, delta_path=None, stream_path=None):
+        self.name = name
+        self.site_url = site_url
+        self.list_id = list_id
+        slug = re.sub(r"[^\w-]+", "_", name).strip("_") or "fonte"
+        self.excel_path = excel_path or os.path.join(SOURCES_DIR, f"{slug}.xlsx")
+        self.delta_path = delta_path or os.path.join(SOURCES_DIR, f"{slug}-delta.json")
+        # Ao lado da planilha (como o cache): só existe durante a sincronização completa
+        self.stream_path = stream_path or os.path.splitext(self.excel_path)[0] + "-stream.ndjson"
+
+    @property
+    def key(self):
+        """Identifica a lista (site + GUID) nas chaves do manifesto de anexos; não muda se o nome mudar."""
+        return f"{self.site_url.rstrip('/')}|{self.list_id}"
+
+    def script_args(self):
+        """Argumentos que apontam os scripts PowerShell para esta lista."""
+        return ["-SiteUrl", self.site_url, "-ListId", self.list_id]
+
+    def export_args(self):
+        return self.script_args() + ["-OutputPath", self.excel_path]
+
+
+def load_sources(path=SOURCES_PATH):
+    """Fontes do sources.json, ou [] quando ele não existe (modo de lista única).
+
+    Formato: {"sources": [{"name": ..., "site_url": ..., "list_id": ...}, ...]};
+    "excel_path" é opcional (relativo à raiz do projeto).
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8-sig") as f:
+        config = json.load(f)
+
+    sources = []
+    for entry in config.get("sources", []) if isinstance(config, dict) else config:
+        excel_path = entry.get("excel_path")
+        if excel_path:
+            excel_path = os.path.join(BASE_DIR, excel_path)
+        sources.append(Source(entry["name"], entry["site_url"], entry["list_id"], excel_path))
+
+    names = [source.name for source in sources]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Fontes com nome repetido em {os.path.basename(path)}: {', '.join(duplicated)}")
+    return sources
+
+
+def clean_id(raw_id):
+    """ID como texto inteiro ("12.0" -> "12"), como esperado pelos scripts."""
+    try:
+        return str(int(float(raw_id)))
+    except (TypeError, ValueError):
+        return str(raw_id)
+
+
+class Dataset:
+    """DataFrame da DefaultView com as colunas resolvidas e os índices de filtro e de busca.
+
+    search_index=None: dataset parcial do streaming (substituído pelo completo em
+    StreamLoad.finish). Ele não tem índice de busca e não aplica busca nem
+    ordenação, para que nenhum índice seja montado na thread da interface.
+    """
+
+    def __init__(self, df, columns, filter_index, search_index, parts=None):
+        from sortIndex import SortIndex
+
+        self.df = df
+        self.columns = columns
+        self.filter_index = filter_index
+        self.search_index = search_index
+        self.sort_index = SortIndex(df)  # Permutações calculadas na primeira ordenação de cada coluna
+        self.parts = parts or {}  # Várias fontes: nome -> dataset da fonte (o delta é aplicado nele)
+        for attr, col in columns.items():
+            setattr(self, attr, col)
+
+    @classmethod
+    def from_frame(cls, df, defaults=DEFAULT_COLUMNS, compact=True, partial=False):
+        """compact: converte para tipos compactos (category, Int64...); ver compactFrame.
+
+        partial=True: dataset parcial do streaming, sem índice de busca.
+        """
+        from compactFrame import compact_frame
+        from filterIndex import FilterIndex
+        from searchIndex import SearchIndex
+
+        if compact:
+            df = compact_frame(df)
+        columns = resolve_columns(list(df.columns), defaults)
+        return cls(df, columns, FilterIndex(df, [columns[key] for key in FILTER_KEYS]),
+                   None if partial else SearchIndex(df))
+
+    @property
+    def partial(self):
+        return self.search_index is None
+
+    @classmethod
+    def load(cls, excel_path=EXCEL_PATH, on_preview=None, preview_rows=FIRST_PAGE_ROWS,
+             defaults=DEFAULT_COLUMNS):
+        """Lê a planilha (cache binário quando possível). Retorna (dataset, from_cache)."""
+        from compactFrame import compact_frame
+        from dataCache import read_excel_cached
+
+        # O cache já guarda o DataFrame compacto: a conversão só roda quando o Excel muda
+        df, from_cache = read_excel_cached(excel_path, sheet_name=SHEET_NAME, on_preview=on_preview,
+                                           preview_rows=preview_rows, transform=compact_frame)
+        return cls.from_frame(df, defaults, compact=False), from_cache
+
+    @classmethod
+    def merge(cls, parts, defaults=DEFAULT_COLUMNS):
+        """Junta os datasets das fontes em um só, com a coluna SOURCE_COLUMN na frente."""
+        import pandas as pd
+
+        frames = []
+        for name, part in parts.items():
+            frame = part.df.copy(deep=False)
+            frame.insert(0, SOURCE_COLUMN, name)
+            frames.append(frame)
+        # Categorias diferentes entre as fontes viram object no concat: from_frame compacta de novo
+        dataset = cls.from_frame(pd.concat(frames, ignore_index=True), defaults)
+        dataset.parts = dict(parts)
+        return dataset
+
+    @classmethod
+    def load_all(cls, sources, defaults=DEFAULT_COLUMNS):
+        """Carrega as planilhas locais das fontes e mescla. Retorna (dataset ou None, from_cache).
+
+        Fontes ainda não sincronizadas (sem planilha) são ignoradas.
+        """
+        parts, from_cache = {}, True
+        for source in sources:
+            if os.path.exists(source.excel_path):
+                parts[source.name], cached = cls.load(source.excel_path, defaults=defaults)
+                from_cache = from_cache and cached
+        if not parts:
+            return None, False
+        return cls.merge(parts, defaults), from_cache
+
+    def __len__(self):
+        return len(self.df)
+
+    def selections(self, empresa="", identificacao="", equipamento="", status=""):
+        """Seleções no formato do FilterIndex (valores vazios são ignorados)."""
+        return {
+            self.col_empresa: empresa or "",
+            self.col_identificacao: identificacao or "",
+            self.col_equipamento: equipamento or "",
+            self.col_status: status or "",
+        }
+
+    def filter(self, selections):
+        """Posições das linhas que atendem às seleções (mesma semântica dos combos)."""
+        return self.filter_index.filter(selections)
+
+    def search(self, query, positions=None):
+        """Restringe as posições às linhas que contêm os termos da busca livre.
+
+        Busca sem termos válidos (ou dataset parcial) não filtra nada.
+        """
+        import numpy as np
+        from searchIndex import SearchIndex
+
+        if self.partial or not SearchIndex.terms(query):
+            return np.arange(len(self.df), dtype=np.int64) if positions is None else positions
+        return self.search_index.search(query, positions)
+
+    def sort(self, positions, keys):
+        """Ordena as posições por keys: [(coluna, crescente), ...]. Dataset parcial: sem ordenação."""
+        if self.partial:
+            return positions
+        return self.sort_index.sort(positions, keys)
+
+    def options(self, col, positions=None):
+        return self.filter_index.options(col, positions)
+
+    def default_status(self):
+        """Status selecionado ao abrir a aplicação ("Aprovado"), se existir."""
+        for opt in self.options(self.col_status):
+            if str(opt).lower() == "aprovado":
+                return opt
+        return None
+
+    def ids(self, positions=None):
+        if self.col_id not in self.df.columns:
+            raise KeyError(f"Coluna ID '{self.col_id}' não encontrada.")
+        values = self.df[self.col_id] if positions is None else self.df[self.col_id].iloc[positions]
+        return [clean_id(v) for v in values]
+
+    def ids_by_source(self, positions=None):
+        """IDs agrupados por fonte: {nome da fonte: [ids]} (os IDs só são únicos dentro da lista)."""
+        frame = self.df if positions is None else self.df.iloc[positions]
+        groups = {}
+        for source, raw_id in zip(frame[SOURCE_COLUMN], frame[self.col_id]):
+            groups.setdefault(source, []).append(clean_id(raw_id))
+        return groups
+
+    def last_modified(self):
+        from deltaSync import last_modified
+
+        return last_modified(self.df, self.col_modified)
+
+    def apply_delta(self, delta_path=DELTA_PATH, excel_path=EXCEL_PATH):
+        """Aplica o delta do exportador. Retorna (novo dataset, estatísticas)."""
+        from dataCache import save_cache
+        from deltaSync import merge_delta, read_delta
+        from searchIndex import SearchIndex
+
+        delta, current_ids = read_delta(delta_path)
+        merged, kept, changed, stats = merge_delta(self.df, delta, current_ids, self.col_id)
+
+        # Só as linhas alteradas/novas são reprocessadas no índice
+        filter_index = self.filter_index.updated(merged, kept, changed)
+
+        # O cache passa a ser o conjunto local atualizado (Excel + deltas)
+        save_cache(excel_path, SHEET_NAME, merged)
+
+        # O índice de busca é refeito (trabalha sobre os valores distintos, ~1 s em 200k linhas)
+        dataset = Dataset(merged, self.columns, filter_index, SearchIndex(merged))
+        return dataset, dict(stats, mode="delta", rows=len(merged))
+
+
+class StreamLoad:
+    """Monta o dataset a partir do export em streaming, à medida que as páginas chegam.
+
+    O exportador (-StreamPath) acrescenta cada página de itens ao arquivo NDJSON
+    enquanto lê a lista; uma thread (exportStream.StreamIngest) lê as páginas
+    novas e as guarda. Com on_rows, o dataset parcial (dataset; None antes da
+    primeira página) é remontado com todas as linhas recebidas, sem índice de
+    busca, e a espera até a próxima remontagem é STREAM_BUSY_RATIO vezes a
+    duração da última: com listas grandes ele é atualizado com menos
+    frequência, mas o trabalho (que disputa o GIL com a interface) fica em ~20%
+    do tempo. on_rows(dataset) é chamado da thread de leitura a cada
+    remontagem. Sem on_rows (linha de comando, fontes do sources.json) ninguém
+    olha os parciais: as páginas só são guardadas. O dataset completo, com o
+    índice de busca, é montado uma vez em finish().
+    """
+
+    def __init__(self, stream_path=STREAM_PATH, on_rows=None):
+        from exportStream import StreamIngest
+
+        self.stream_path = stream_path
+        self.on_rows = on_rows
+        self.dataset = None
+        self.first_rows_seconds = None
+        self._start = None
+        self._pages = []  # Páginas (texto) recebidas desde a última remontagem
+        self._text = None  # Todas as linhas até a última remontagem, como o exportador gravou
+        self._next_build = 0.0
+        self._ingest = StreamIngest(stream_path, self._pages.append,
+                                    on_poll=self._poll if on_rows else None)
+
+    def start(self):
+        """Apaga o arquivo da execução anterior e começa a acompanhá-lo (antes de iniciar o exportador)."""
+        if os.path.exists(self.stream_path):
+            os.remove(self.stream_path)
+        self._start = time.perf_counter()
+        self._ingest.start()
+        return self
+
+    def export_args(self):
+        return ["-StreamPath", self.stream_path]
+
+    def _poll(self):
+        if self._pages and time.perf_counter() >= self._next_build:
+            self._build()
+
+    def _merge_pages(self):
+        import pandas as pd
+
+        frames = ([self._text] if self._text is not None else []) + self._pages
+        self._pages.clear()
+        if frames:
+            self._text = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return self._text
+
+    def _build(self):
+        from exportStream import convert_numbers
+
+        start = time.perf_counter()
+        self.dataset = Dataset.from_frame(convert_numbers(self._merge_pages()), partial=True)
+        now = time.perf_counter()
+        self._next_build = now + STREAM_BUSY_RATIO * (now - start)
+        TELEMETRY.record("sync.stream_build", now - start, rows=len(self.dataset))
+        if self.first_rows_seconds is None:
+            self.first_rows_seconds = now - self._start
+            TELEMETRY.record("sync.first_rows", self.first_rows_seconds, rows=len(self.dataset))
+        self.on_rows(self.dataset)
+
+    def finish(self, excel_path=EXCEL_PATH):
+        """Chamado com o exportador encerrado: lê o restante e retorna o dataset completo.
+
+        O dataset passa a ser o cache da planilha gerada no fim do export, para
+        que a próxima abertura não precise ler o Excel. Retorna None se o
+        exportador não gravou o arquivo (versão sem streaming): leia o Excel.
+        """
+        from dataCache import save_cache
+        from exportStream import convert_numbers
+
+        self._ingest.stop()
+        self._remove()
+        text = self._merge_pages()
+        if text is None:
+            return None
+        # Tipos decididos com todas as linhas: mesmos da leitura do Excel gerado
+        self.dataset = Dataset.from_frame(convert_numbers(text))
+        if self.first_rows_seconds is None:
+            self.first_rows_seconds = time.perf_counter() - self._start
+        if os.path.exists(excel_path):
+            save_cache(excel_path, SHEET_NAME, self.dataset.df)
+        return self.dataset
+
+    def cancel(self):
+        """Exportador falhou: para a leitura e descarta o dataset parcial."""
+        self._ingest.stop(drain=False)
+        self._remove()
+        self.dataset = None
+
+    def _remove(self):
+        if os.path.exists(self.stream_path):
+            os.remove(self.stream_path)
+
+
+# ==== ORQUESTRAÇÃO ====
+def run_powershell(script_path, args=(), on_line=None):
+    """Executa um script em um powershell.exe novo. Retorna o exit code.
+
+    stdout e stderr são lidos linha a linha e entregues a on_line. Os tempos de
+    subida do processo, da primeira saída e total vão para a telemetria.
+    """
+    cmd = ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", script_path] + list(args)
+    script = os.path.basename(script_path)
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        startupinfo=hidden_startupinfo(),
+        bufsize=1,
+        encoding='utf-8',  # Força UTF-8 para evitar erros de decodificação
+        errors='replace'
+    )
+    TELEMETRY.record("powershell.spawn", time.perf_counter() - start, mode="process", script=script)
+    first_output = None
+    for line in process.stdout:
+        if first_output is None:
+            first_output = time.perf_counter() - start
+            TELEMETRY.record("powershell.first_output", first_output, mode="process", script=script)
+        if on_line:
+            on_line(line)
+    return_code = process.wait()
+    TELEMETRY.record("powershell.total", time.perf_counter() - start, mode="process", script=script,
+                     return_code=return_code)
+    return return_code
+
+
+def start_telemetry_export(path=None):
+    """Liga a gravação da telemetria em JSONL: path, a variável TELEMETRY_ENV ou nada.
+
+    Retorna o caminho usado (None se continua desligada).
+    """
+    path = path or os.environ.get(TELEMETRY_ENV)
+    if not path:
+        return None
+    if path == "1":
+        path = TELEMETRY_PATH
+    TELEMETRY.export(path)
+    return path
+
+
+def configure_auth(client_id=None, tenant=None, thumbprint=None, interactive=True):
+    """Repassa o login aos scripts PowerShell (pelo ambiente, herdado pelos processos filhos).
+
+    Valores vazios mantêm os das variáveis AUTH_ENV. Com interactive=False os
+    scripts falham se precisarem de login pelo navegador. Retorna True se o
+    login por certificado (sem navegador) está configurado.
+    """
+    values = {"client_id": client_id, "tenant": tenant, "thumbprint": thumbprint}
+    for key, value in values.items():
+        if value:
+            os.environ[AUTH_ENV[key]] = value
+    if interactive:
+        os.environ.pop(NONINTERACTIVE_ENV, None)
+    else:
+        os.environ[NONINTERACTIVE_ENV] = "1"
+    return all(os.environ.get(name) for name in AUTH_ENV.values())
+
+
+def _check(script_path, return_code):
+    if return_code != 0:
+        raise PowerShellError(script_path, return_code)
+
+
+def sync_args(dataset, full=False, delta_path=DELTA_PATH):
+    """Argumentos do exportador: modo delta quando há dados locais com Modified."""
+    since = None if full or dataset is None else dataset.last_modified()
+    if not since:
+        return []
+    return ["-Since", since, "-DeltaPath", delta_path]
+
+
+def sync(dataset, excel_path=EXCEL_PATH, full=False, runner=run_powershell, on_line=None,
+         delta_path=DELTA_PATH, source_args=(), stream_path=STREAM_PATH, on_rows=None):
+    """Sincroniza com o SharePoint. Retorna (dataset atualizado, estatísticas).
+
+    source_args: argumentos de Source.export_args() (vazio = lista padrão).
+    stream_path: na sincronização completa o exportador grava as páginas neste
+    NDJSON e o dataset é montado a partir dele, sem ler o Excel de volta (com
+    on_rows, datasets parciais são montados e entregues durante o export);
+    None lê o Excel ao final.
+    """
+    start = time.perf_counter()
+    args = sync_args(dataset, full, delta_path)
+    if args:
+        if os.path.exists(delta_path):
+            os.remove(delta_path)
+        _check(PS_EXPORT_SCRIPT, runner(PS_EXPORT_SCRIPT, list(source_args) + args, on_line))
+        dataset, stats = dataset.apply_delta(delta_path, excel_path)
+    elif stream_path:
+        stream = StreamLoad(stream_path, on_rows).start()
+        try:
+            _check(PS_EXPORT_SCRIPT, runner(PS_EXPORT_SCRIPT, list(source_args) + stream.export_args(), on_line))
+        except Exception:
+            stream.cancel()
+            raise
+        dataset = stream.finish(excel_path)
+        if dataset is None:
+            dataset, _ = Dataset.load(excel_path)
+        stats = {"mode": "full", "rows": len(dataset), "first_rows_seconds": stream.first_rows_seconds}
+    else:
+        _check(PS_EXPORT_SCRIPT, runner(PS_EXPORT_SCRIPT, list(source_args), on_line))
+        dataset, _ = Dataset.load(excel_path)
+        stats = {"mode": "full", "rows": len(dataset)}
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    TELEMETRY.record("sync", stats["seconds"], mode=stats["mode"], rows=stats["rows"])
+    return dataset, stats
+
+
+def sync_jobs(sources, parts=None, full=False, runner=run_powershell, on_line=None):
+    """Um SyncJob por fonte; o resultado de cada job é o (dataset, estatísticas) de sync().
+
+    parts: datasets atuais das fontes (Dataset.parts); sem ele a planilha local é lida.
+    """
+    parts = parts or {}
+
+    def make_task(source):
+        def task():
+            os.makedirs(os.path.dirname(source.excel_path), exist_ok=True)
+            dataset = parts.get(source.name)
+            if dataset is None and not full and os.path.exists(source.excel_path):
+                dataset, _ = Dataset.load(source.excel_path)
+            source_line = (lambda line: on_line(f"[{source.name}] {line}")) if on_line else None
+            return sync(dataset, source.excel_path, full, runner, source_line, source.delta_path,
+                        source.export_args(), source.stream_path)
+        return task
+
+    return [SyncJob(source.name, make_task(source)) for source in sources]
+
+
+def run_sync_jobs(jobs, parts=None, scheduler=None, on_update=None):
+    """Executa os jobs em paralelo e mescla os resultados. Retorna o dataset (ou None).
+
+    Fontes que falharam mantêm os dados anteriores (se houver).
+    """
+    (scheduler or SyncScheduler()).run(jobs, on_update)
+    parts = dict(parts or {})
+    for job in jobs:
+        if job.ok:
+            parts[job.name] = job.result[0]
+    return Dataset.merge(parts) if parts else None
+
+
+def sync_sources(sources, dataset=None, full=False, runner=run_powershell, on_line=None,
+                 concurrency=SYNC_CONCURRENCY):
+    """Sincroniza várias fontes em paralelo. Retorna (dataset mesclado, estatísticas por fonte)."""
+    parts = dataset.parts if dataset is not None else None
+    jobs = sync_jobs(sources, parts, full, runner, on_line)
+    dataset = run_sync_jobs(jobs, parts, SyncScheduler(concurrency))
+    # A duração do job (com as novas tentativas) prevalece sobre a da última execução de sync()
+    stats = {job.name: dict(job.result[1], **job.summary()) if job.ok else job.summary() for job in jobs}
+    return dataset, stats
+
+
+def check_download_auth():
+    """O motor de download precisa de token OAuth, que só o login com app do Entra ID emite.
+
+    Sem DOCSDOWNLOADER_CLIENT_ID a sincronização funciona (login pelo navegador,
+    só com cookies), mas o download não: RuntimeError com a explicação.
+    """
+    if not os.environ.get(AUTH_ENV["client_id"]):
+        raise RuntimeError("O download de anexos precisa de token OAuth: registre um app no Entra ID com "
+                           "permissão no SharePoint e informe o Application (client) ID na variável de "
+                           f"ambiente {AUTH_ENV['client_id']} (e reinicie a aplicação).")
+
+
+def list_attachments_args(ids, list_path=ATTACHMENTS_LIST_PATH):
+    """Argumentos do downloadAttachments.ps1 em modo listagem."""
+    check_download_auth()
+    if os.path.exists(list_path):
+        os.remove(list_path)
+    return ["-Ids", ",".join(ids), "-ListOnly", "-ListPath", list_path]
+
+
+def read_listing(list_path=ATTACHMENTS_LIST_PATH, target_dir=DOWNLOAD_DIR, source=None):
+    """Lê a listagem de anexos e a apaga (ela contém o token de acesso)."""
+    try:
+        return jobs_from_listing(list_path, target_dir, source.key if source else None)
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+
+
+def make_engine(headers, concurrency=DOWNLOAD_CONCURRENCY, rate_per_host=DOWNLOAD_RATE_PER_HOST,
+                manifest_path=MANIFEST_PATH):
+    # O manifesto evita baixar de novo o que já está no disco e retoma downloads parciais
+    return DownloadEngine(concurrency=concurrency, rate_per_host=rate_per_host, headers=headers,
+                          manifest=AttachmentManifest(manifest_path))
+
+
+def list_attachments(groups, target_dir=DOWNLOAD_DIR, runner=run_powershell, on_line=None,
+                     list_path=ATTACHMENTS_LIST_PATH):
+    """Lista os anexos de vários grupos de IDs. Retorna (jobs, headers) para o motor.
+
+    groups: [(ids, source ou None, pasta de destino do grupo)]. As fontes são do
+    mesmo tenant, então o token de qualquer uma serve para todas.
+    """
+    jobs, headers = [], {}
+    for ids, source, group_dir in groups:
+        args = (source.script_args() if source else []) + list_attachments_args(ids, list_path)
+        _check(PS_DOWNLOAD_SCRIPT, runner(PS_DOWNLOAD_SCRIPT, args, on_line))
+        group_jobs, group_headers = read_listing(list_path, group_dir or target_dir, source)
+        jobs.extend(group_jobs)
+        headers = group_headers or headers
+    return jobs, headers
+
+
+def download_groups(ids_by_source, sources, target_dir=DOWNLOAD_DIR):
+    """Grupos de list_attachments(): um por fonte ({nome: ids}), cada um na sua subpasta."""
+    by_name = {source.name: source for source in sources}
+    return [(ids, by_name[name], os.path.join(target_dir, name))
+            for name, ids in ids_by_source.items() if name in by_name]
+
+
+def download(ids, target_dir=DOWNLOAD_DIR, runner=run_powershell, on_line=None,
+             concurrency=DOWNLOAD_CONCURRENCY, rate_per_host=DOWNLOAD_RATE_PER_HOST,
+             manifest_path=MANIFEST_PATH, list_path=ATTACHMENTS_LIST_PATH, groups=None):
+    """Lista os anexos dos IDs e baixa com o motor concorrente. Retorna um resumo.
+
+    groups: no lugar de ids, grupos de download_groups() (várias fontes).
+    """
+    jobs, headers = list_attachments(groups or [(ids, None, target_dir)], target_dir, runner,
+                                     on_line, list_path)
+
+    engine = make_engine(headers, concurrency, rate_per_host, manifest_path)
+    try:
+        engine.run(jobs)
+    finally:
+        engine.manifest.close()
+
+    summary = engine.stats()
+    summary["target_dir"] = target_dir
+    summary["errors"] = [{"item_id": job.item_id, "name": job.name, "error": msg} for job, msg in engine.errors]
+    return summary
@@ -0,0 +1,72 @@
+import os
+import pickle
+
+import pandas as pd
+
+# Versão do formato do cache: incrementar quando o conteúdo salvo mudar
+CACHE_VERSION = 2
+
+
+def cache_path_for(excel_path):
+    """Arquivo de cache ao lado do Excel (ex.: DefaultView-Data.cache.pkl)."""
+    root, _ = os.path.splitext(excel_path)
+    return root + ".cache.pkl"
+
+
+def _signature(excel_path, sheet_name):
+    stat = os.stat(excel_path)
+    return {"version": CACHE_VERSION, "sheet": sheet_name,
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def load_cache(excel_path, sheet_name):
+    """Retorna o DataFrame do cache se ele corresponder ao Excel atual, senão None."""
+    path = cache_path_for(excel_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            # O cabeçalho vem primeiro: um cache obsoleto é descartado sem ler os dados
+            if pickle.load(f) != _signature(excel_path, sheet_name):
+                return None
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def save_cache(excel_path, sheet_name, df):
+    """Grava o cache de forma atômica. Falhas não são fatais (o Excel continua valendo)."""
+    path = cache_path_for(excel_path)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(_signature(excel_path, sheet_name), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_excel_cached(excel_path, sheet_name="DefaultView", on_preview=None, preview_rows=500,
+                      transform=None):
+    """Lê a planilha usando o cache binário quando possível.
+
+    Retorna (df, from_cache). O cache é refeito sempre que o mtime ou o tamanho
+    do Excel mudam. Sem cache válido, on_preview (se informado) recebe antes as
+    primeiras preview_rows linhas, para exibição enquanto o restante é lido.
+    transform (se informado) é aplicado ao DataFrame lido do Excel antes de
+    gravar o cache, então só roda quando o Excel muda.
+    """
+    df = load_cache(excel_path, sheet_name)
+    if df is not None:
+        return df, True
+
+    if on_preview is not None:
+        on_preview(pd.read_excel(excel_path, sheet_name=sheet_name, nrows=preview_rows))
+
+    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    if transform is not None:
+        df = transform(df)
+    save_cache(excel_path, sheet_name, df)
+    return df, False
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from compactFrame import align_dtypes
+
+
+def last_modified(df, col_modified):
+    """Maior valor da coluna Modified (formato yyyy-MM-dd HH:mm), ou None."""
+    if col_modified not in df.columns:
+        return None
+    values = df[col_modified].dropna().astype(str)
+    values = values[values != ""]
+    return values.max() if len(values) else None
+
+
+def read_delta(path):
+    """Lê o arquivo gerado pelo exportador no modo delta.
+
+    Formato: {"ids": [IDs existentes na lista], "items": [{coluna: valor}, ...]}
+    Retorna (DataFrame dos itens alterados, conjunto de IDs atuais). Sem a
+    chave "ids" o conjunto é None e nenhuma linha é removida.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        payload = json.load(f)
+    items = pd.DataFrame(payload.get("items") or [])
+    ids = payload.get("ids")
+    current_ids = None if ids is None else {int(i) for i in ids}
+    return items, current_ids
+
+
+def _id_keys(series):
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+
+
+def merge_delta(df, delta, current_ids, col_id):
+    """Aplica o delta ao DataFrame local, usando col_id como chave.
+
+    Itens alterados são substituídos na mesma posição, novos vão para o final e
+    IDs que não existem mais na lista são removidos. Retorna
+    (df_merged, kept, changed, stats), onde kept são as posições de df mantidas
+    (na ordem em que aparecem no resultado) e changed as posições do resultado
+    com valores novos — usados para atualizar o FilterIndex incrementalmente.
+    """
+    keys = _id_keys(df[col_id])
+    if current_ids is None:
+        kept = np.arange(len(df))
+    else:
+        kept = np.flatnonzero(np.isin(keys, list(current_ids)))
+    base = df.iloc[kept].reset_index(drop=True)
+
+    # Colunas desconhecidas são ignoradas: mudança de esquema exige sincronização completa
+    delta = delta.reindex(columns=df.columns) if len(delta) else delta
+    position_of = {key: pos for pos, key in enumerate(keys[kept])}
+
+    take = np.arange(len(base))
+    appended = []
+    updated = []
+    for row, key in enumerate(_id_keys(delta[col_id]) if len(delta) else []):
+        pos = position_of.get(key)
+        if pos is None:
+            appended.append(len(base) + row)
+        else:
+            take[pos] = len(base) + row
+            updated.append(pos)
+
+    if len(delta):
+        # O JSON traz tudo como texto; mantém os tipos (compactos) das colunas locais
+        base, delta = align_dtypes(base, delta)
+        combined = pd.concat([base, delta], ignore_index=True)
+        merged = combined.iloc[np.concatenate([take, appended]).astype(np.int64)].reset_index(drop=True)
+    else:
+        merged = base
+
+    changed = np.array(sorted(updated) + list(range(len(base), len(base) + len(appended))), dtype=np.int64)
+    stats = {"updated": len(updated), "added": len(appended), "removed": len(df) - len(kept)}
+    return merged, kept, changed, stats
@@ -4,20 +4,55 @@ param(
     [Parameter(Mandatory=$true)]
     [string]$Ids,  # IDs separados por vírgula (ex: "1,5,10")
 
-    [string]$TargetDir = "$env:USERPROFILE\Downloads"
+    [string]$TargetDir = "$env:USERPROFILE\Downloads",
+
+    # Modo listagem: não baixa nada, só grava em -ListPath (JSON) os anexos e um
+    # token de acesso para o motor de download em Python
+    [switch]$ListOnly,
+    [string]$ListPath = "",
+
+    # Fonte (sources.json); o padrão é a lista original
+    [string]$SiteUrl = "https://vestas.sharepoint.com/sites/CC-Subcontractors-BR",
+    [string]$ListId = "205a1e3b-9c65-4733-b67f-0effd21b7953",
+
+    # Login (ver connectSharePoint.ps1): app do Entra ID; com Tenant e Thumbprint, por certificado
+    [string]$ClientId = $env:DOCSDOWNLOADER_CLIENT_ID,
+    [string]$Tenant = $env:DOCSDOWNLOADER_TENANT,
+    [string]$Thumbprint = $env:DOCSDOWNLOADER_THUMBPRINT
 )
 
+. (Join-Path $PSScriptRoot "connectSharePoint.ps1")
+
 # ==== CONFIGURAÇÃO ====
-$siteUrl   = "https://vestas.sharepoint.com/sites/CC-Subcontractors-BR"
-$listaGuid = "205a1e3b-9c65-4733-b67f-0effd21b7953"
+$siteUrl   = $SiteUrl
+$listaGuid = $ListId
+
+# ==== PROGRESSO (protocolo lido pelo downloadFiles.py) ====
+# Uma linha JSON por atualização: {"type":"progress","phase":...,"done":...,"total":...,"bytes":...}
+function Send-Progress([string]$Phase, [int]$Done, [int]$Total, [long]$Bytes = 0) {
+    $msg = @{ type = "progress"; phase = $Phase; done = $Done; total = $Total; bytes = $Bytes }
+    [Console]::Out.WriteLine((ConvertTo-Json -InputObject $msg -Compress))
+}
 
 # ==== CONEXÃO ====
+# O motor em Python precisa de token OAuth; sem ClientId a conexão (inclusive a do
+# worker, que usa a mesma configuração) seria só por cookies
+if ($ListOnly -and -not $ClientId) {
+    Write-Error (Get-DocsClientIdMessage)
+    exit 1
+}
+
 try {
     Write-Host "Conectando ao SharePoint ($siteUrl)..." -ForegroundColor Cyan
     
-    # Força uma nova conexão interativa e guarda o objeto de conexão
+    # Abre uma nova conexão (ver connectSharePoint.ps1) e guarda o objeto
     # Isso isola este script de outros contextos que possam estar abertos
-    $conn = Connect-PnPOnline -Url $siteUrl -UseWebLogin
+    # Dentro do worker persistente (psWorker.ps1) reutiliza a conexão já aberta
+    if ($global:PnPWorkerConnection -and $global:PnPWorkerConnection.Url -eq $siteUrl) {
+        $conn = $global:PnPWorkerConnection
+    } else {
+        $conn = Connect-DocsSharePoint -Url $siteUrl -ClientId $ClientId -Tenant $Tenant -Thumbprint $Thumbprint -RequireToken:$ListOnly
+    }
     
     Write-Host "Conexão estabelecida com sucesso!" -ForegroundColor Green
 
@@ -38,14 +73,20 @@ catch {
 # ==== PROCESSAMENTO ====
 $idList = $Ids -split ","
 
-if (-not (Test-Path $TargetDir)) {
+if (-not $ListOnly -and -not (Test-Path $TargetDir)) {
     New-Item -ItemType Directory -Path $TargetDir -Force | Out-Null
 }
 
+$listing = New-Object System.Collections.Generic.List[object]
+$phase = if ($ListOnly) { "Listando anexos" } else { "Baixando anexos" }
+$processed = 0
+
 foreach ($id in $idList) {
     # Limpa espaços em branco
     $id = $id.Trim()
     if ([string]::IsNullOrWhiteSpace($id)) { continue }
+    Send-Progress $phase $processed $idList.Count
+    $processed++
 
     try {
         Write-Host "Processando Item ID: $id..." -ForegroundColor Cyan
@@ -77,6 +118,14 @@ foreach ($id in $idList) {
             $folderName = "{0}_{1}_{2}_{3}" -f $sIdent, $sEquip, $sEmpresa, $sDate
             $folderName = $folderName -replace '[\\/:*?"<>|]', '' -replace '\s+', '_'
             
+            if ($ListOnly) {
+                foreach ($file in $attachments) {
+                    $listing.Add([pscustomobject]@{ id = $id; folder = $folderName; name = $file.FileName; path = $file.ServerRelativeUrl })
+                }
+                Write-Host "  Anexos listados: $($attachments.Count)" -ForegroundColor Green
+                continue
+            }
+
             $itemDir = Join-Path $TargetDir $folderName
             if (-not (Test-Path $itemDir)) { New-Item -ItemType Directory -Path $itemDir -Force | Out-Null }
 
@@ -98,8 +147,26 @@ foreach ($id in $idList) {
     }
 }
 
+Send-Progress $phase $idList.Count $idList.Count
+
+if ($ListOnly) {
+    $token = Get-PnPAccessToken -ResourceTypeName SharePoint -Connection $conn
+    if (-not $token) {
+        Write-Error "A conexão não forneceu token de acesso para o download."
+        exit 1
+    }
+    $origin = ([Uri]$siteUrl).GetLeftPart([UriPartial]::Authority)
+    $payload = @{ origin = $origin; token = $token; files = @($listing) }
+    ConvertTo-Json -InputObject $payload -Depth 4 -Compress | Out-File -FilePath $ListPath -Encoding utf8
+    Write-Host "Listagem concluída: $($listing.Count) anexos." -ForegroundColor Green
+    exit 0
+}
+
 Write-Host "Concluído. Arquivos salvos em: $TargetDir" -ForegroundColor Yellow
 
 # Aguarda 2 segundos para você ver a mensagem de sucesso e fecha o terminal
-Start-Sleep -Seconds 2
-Stop-Process -Id $
\ No newline at end of file
+# (não se aplica ao worker persistente, que continua rodando)
+if (-not $global:PnPWorkerConnection) {
+    Start-Sleep -Seconds 2
+    Stop-Process -Id $
+}
\ No newline at end of file
@@ -0,0 +1,298 @@
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
+
+from telemetry import TELEMETRY
+
+CHUNK_SIZE = 256 * 1024
+MAX_RETRIES = 3
+
+
+class DownloadJob:
+    """Um anexo a baixar: URL de origem e caminho de destino no disco.
+
+    source identifica a lista do item (várias fontes): os IDs só são únicos
+    dentro de cada lista, então item_id passa a ser "fonte|id" — é a chave do
+    item no manifesto.
+    """
+
+    def __init__(self, url, path, item_id=None, name=None, source=None):
+        self.url = url
+        self.path = path
+        self.source = source
+        self.item_id = f"{source}|{item_id}" if source and item_id is not None else item_id
+        self.name = name or os.path.basename(path)
+
+
+def build_url(origin, server_relative_url):
+    """Monta a URL absoluta a partir da origem do site e do caminho relativo ao servidor."""
+    return origin.rstrip("/") + quote(server_relative_url, safe="/")
+
+
+def jobs_from_listing(listing_path, target_dir, source=None):
+    """Lê a listagem gerada por downloadAttachments.ps1 -ListOnly.
+
+    Retorna (jobs, headers), com os cabeçalhos de autenticação para o engine.
+    source: chave da lista (Source.key) quando há várias fontes.
+    """
+    with open(listing_path, "r", encoding="utf-8-sig") as f:
+        listing = json.load(f)
+    jobs = [
+        DownloadJob(build_url(listing["origin"], entry["path"]),
+                    os.path.join(target_dir, entry["folder"], entry["name"]),
+                    item_id=entry.get("id"), name=entry["name"], source=source)
+        for entry in listing.get("files") or []
+    ]
+    headers = {"Authorization": f"Bearer {listing['token']}"} if listing.get("token") else {}
+    return jobs, headers
+
+
+class RateLimiter:
+    """Limite de requisições por segundo por host (token bucket)."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate or 0)
+        self._tokens = {}
+        self._updated = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens = self._tokens.get(host, self.burst)
+                tokens = min(self.burst, tokens + (now - self._updated.get(host, now)) * self.rate)
+                self._updated[host] = now
+                if tokens >= 1:
+                    self._tokens[host] = tokens - 1
+                    return
+                self._tokens[host] = tokens
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadEngine:
+    """Baixa anexos em paralelo com conexões HTTP reutilizadas.
+
+    Cada thread do pool mantém uma conexão keep-alive por host e grava o corpo
+    da resposta em blocos (arquivo .part renomeado ao final). O progresso fica
+    em stats(), para a interface consultar periodicamente sem inundar a fila
+    de eventos do Tk.
+
+    Com um AttachmentManifest, arquivos inalterados (GET condicional pela ETag)
+    são pulados, arquivos .part são retomados com Range e conteúdo idêntico
+    entre itens é gravado uma vez e ligado por hardlink.
+    """
+
+    def __init__(self, concurrency=8, rate_per_host=None, headers=None, timeout=60, manifest=None):
+        self.concurrency = max(1, int(concurrency))
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_per_host)
+        self.manifest = manifest
+        self.errors = []
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._total = 0
+        self._done = 0
+        self._bytes = 0
+        self._skipped = 0
+        self._resumed = 0
+        self._linked = 0
+        self._started = None
+        self._finished = None
+
+    # ==== Execução ====
+    def run(self, jobs):
+        """Baixa todos os jobs (bloqueante). Retorna a lista de erros (job, mensagem)."""
+        jobs = list(jobs)
+        self._total = len(jobs)
+        self._started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self._run_job, jobs))
+        self._finished = time.perf_counter()
+        TELEMETRY.record("download", self._finished - self._started, files=self._total,
+                         bytes=self._bytes, errors=len(self.errors), concurrency=self.concurrency)
+        return self.errors
+
+    def cancel(self):
+        self._cancel.set()
+
+    def stats(self):
+        """Retorna {done, total, bytes, skipped, resumed, linked, elapsed, files_per_s, mb_per_s}."""
+        with self._lock:
+            done, downloaded = self._done, self._bytes
+            skipped, resumed, linked = self._skipped, self._resumed, self._linked
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            "done": done,
+            "total": self._total,
+            "bytes": downloaded,
+            "skipped": skipped,
+            "resumed": resumed,
+            "linked": linked,
+            "elapsed": elapsed,
+            "files_per_s": done / elapsed if elapsed else 0.0,
+            "mb_per_s": downloaded / 1024 / 1024 / elapsed if elapsed else 0.0,
+        }
+
+    def _run_job(self, job):
+        if self._cancel.is_set():
+            return
+        start = time.perf_counter()
+        try:
+            self._download(job)
+        except Exception as e:
+            with self._lock:
+                self.errors.append((job, str(e)))
+        finally:
+            with self._lock:
+                self._done += 1
+            TELEMETRY.record("download.file", time.perf_counter() - start)
+
+    # ==== HTTP ====
+    def _connection(self, scheme, host):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, host)
+        if key not in conns:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conns[key] = cls(host, timeout=self.timeout)
+        return conns[key]
+
+    def _drop_connection(self, scheme, host):
+        conn = self._local.conns.pop((scheme, host), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, url, headers):
+        """GET com reuso de conexão, nova tentativa em falha de rede e respeito a 429/503."""
+        parts = urlsplit(url)
+        path = parts.path + ("?" + parts.query if parts.query else "")
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire(parts.netloc)
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # Conexão keep-alive fechada pelo servidor: reabre e tenta de novo
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt == MAX_RETRIES:
+                    raise
+                continue
+
+            if response.status in (429, 503) and attempt < MAX_RETRIES:
+                response.read()
+                retry_after = response.getheader("Retry-After")
+                time.sleep(float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt)
+                continue
+            return response
+        raise DownloadError(f"Sem resposta de {parts.netloc}")
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _download(self, job):
+        record = self.manifest.lookup(job.item_id, job.name) if self.manifest else None
+        headers = dict(self.headers)
+        part_path = job.path + ".part"
+
+        if self.manifest and self.manifest.is_current(record) and record["etag"]:
+            # Já baixado: o servidor responde 304 se não mudou
+            headers["If-None-Match"] = record["etag"]
+        elif os.path.exists(part_path):
+            # Download interrompido: pede só o restante (If-Range garante que é o mesmo arquivo)
+            headers["Range"] = f"bytes={os.path.getsize(part_path)}-"
+            if record is not None and record["etag"]:
+                headers["If-Range"] = record["etag"]
+
+        response = self._request(job.url, headers)
+        if response.status == 304:
+            response.read()
+            self._reuse(record["local_path"], job.path)
+            if record["local_path"] != job.path:
+                self.manifest.move(job.item_id, job.name, job.path)
+            self._count("_skipped")
+            return
+        if response.status == 416:
+            # O .part não corresponde mais ao arquivo (ex.: já completo ou maior): recomeça
+            response.read()
+            os.remove(part_path)
+            return self._download(job)
+        if response.status not in (200, 206):
+            response.read()
+            raise DownloadError(f"HTTP {response.status} em {job.name}")
+
+        etag = response.getheader("ETag")
+        digest = hashlib.sha256()
+        if response.status == 206:
+            # Continua o .part: o hash precisa incluir o que já estava no disco
+            mode = "ab"
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            self._count("_resumed")
+        else:
+            mode = "wb"
+            os.makedirs(os.path.dirname(job.path) or ".", exist_ok=True)
+
+        if self.manifest:
+            self.manifest.start(job.item_id, job.name, job.url, etag, job.path)
+
+        with open(part_path, mode) as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                digest.update(chunk)
+                with self._lock:
+                    self._bytes += len(chunk)
+        os.replace(part_path, job.path)
+
+        if self.manifest:
+            sha256 = digest.hexdigest()
+            size = os.path.getsize(job.path)
+            existing = self.manifest.blob_path(sha256)
+            if existing and os.path.abspath(existing) != os.path.abspath(job.path):
+                # Mesmo conteúdo já existe em outro item: mantém uma única cópia no disco
+                self._reuse(existing, job.path)
+                self._count("_linked")
+            else:
+                self.manifest.add_blob(sha256, job.path, size)
+            self.manifest.complete(job.item_id, job.name, job.url, size, etag, sha256, job.path)
+
+    def _reuse(self, source, target):
+        """Faz target apontar para o conteúdo de source (hardlink; cópia se não suportado)."""
+        if os.path.abspath(source) == os.path.abspath(target):
+            return
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        if os.path.exists(target):
+            if os.path.samefile(source, target):
+                return
+            os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
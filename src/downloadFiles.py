@@ -1,18 +1,48 @@
+import time
+
+_IMPORT_START = time.perf_counter()  # Base dos tempos do --profile-startup
+
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-import pandas as pd
-import subprocess
 import os
+import sys
 import threading
 
-# Define o caminho do Excel na raiz do projeto (um nível acima de src)
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SRC_DIR = os.path.join(BASE_DIR, "src")
-
-# ==== CONFIGURAÇÕES ====
-PS_EXPORT_SCRIPT = os.path.join(SRC_DIR, "exportAllColumns.ps1")
-PS_DOWNLOAD_SCRIPT = os.path.join(SRC_DIR, "downloadAttachments.ps1")
-EXCEL_PATH = os.path.join(BASE_DIR, "DefaultView-Data.xlsx")
+# Configurações e lógica sem interface ficam em core.py (compartilhadas com a CLI).
+# O pandas não é importado aqui: ele carrega em segundo plano (preload_data_layer).
+from core import (ATTACHMENTS_LIST_PATH, DELTA_PATH, DOWNLOAD_DIR, EXCEL_PATH, FIRST_PAGE_ROWS,
+                  PS_DOWNLOAD_SCRIPT, PS_EXPORT_SCRIPT, SOURCE_COLUMN, STARTUP_PROFILE_PATH, STREAM_PATH,
+                  TELEMETRY_PATH, Dataset, StreamLoad,
+                  check_download_auth, download_groups, list_attachments, list_attachments_args, load_sources,
+                  make_engine, preload_data_layer, read_listing, run_powershell, run_sync_jobs,
+                  start_telemetry_export, sync_args, sync_jobs)
+from eventLoopMonitor import EventLoopMonitor
+from progressProtocol import ProgressTracker, format_eta
+from psWorker import PowerShellWorker
+from syncScheduler import DONE, FAILED, PENDING, RETRYING, RUNNING
+from telemetry import TELEMETRY
+from virtualTreeview import VirtualTreeview
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+PROGRESS_REFRESH_MS = 100  # Intervalo de atualização do popup de progresso
+PS_PERSISTENT_WORKER = True  # Reutiliza um único PowerShell (já conectado) entre operações
+SEARCH_DEBOUNCE_MS = 250  # Espera após a última tecla antes de aplicar a busca
+
+# Diagnóstico (Ctrl+Shift+D): o atraso do loop do Tk é medido o tempo todo
+LAG_INTERVAL_MS = 100     # Intervalo do tick que mede o atraso
+LAG_SAMPLES = 3000        # Últimas amostras guardadas (~5 min)
+DIAGNOSTICS_REFRESH_MS = 1000
+
+# Etapas exibidas pelo --profile-startup
+STARTUP_PHASES = [
+    ("imports", "Imports (interface)"),
+    ("janela", "Janela visível"),
+    ("widgets", "Construção dos widgets"),
+    ("pandas", "Import pandas/dados (paralelo)"),
+    ("dados", "Carga dos dados"),
+    ("total", "Total até a tabela preenchida"),
+]
 
 # Configuração do CustomTkinter
 ctk.set_appearance_mode("Dark")  # Modes: "System" (standard), "Dark", "Light"
@@ -22,9 +52,10 @@ class ProgressPopup(ctk.CTkToplevel):
     def __init__(self, parent, title="Processando..."):
         super().__init__(parent)
         self.title(title)
-        self.geometry("400x150")
+        self.geometry("400x170")
         self.resizable(False, False)
         self.attributes("-topmost", True)
+        self.determinate = False
         
         self.label = ctk.CTkLabel(self, text="Iniciando...", font=("Segoe UI", 14))
         self.label.pack(pady=(30, 10))
@@ -33,6 +64,9 @@ class ProgressPopup(ctk.CTkToplevel):
         self.progressbar.pack(pady=10)
         self.progressbar.start()
 
+        self.lbl_detail = ctk.CTkLabel(self, text="", text_color="gray", font=("Segoe UI", 12))
+        self.lbl_detail.pack()
+
         # Centraliza em relação à tela
         self.update_idletasks()
         width = self.winfo_width()
@@ -48,14 +82,153 @@ class ProgressPopup(ctk.CTkToplevel):
         if len(text) > 50:
             text = text[:47] + "..."
         self.label.configure(text=text)
+
+    def update_progress(self, done, total, text=None, detail=""):
+        """Passa para barra determinada (done/total) com texto de taxa/ETA"""
+        if total and not self.determinate:
+            self.progressbar.stop()
+            self.progressbar.configure(mode="determinate")
+            self.determinate = True
+        if total:
+            self.progressbar.set(min(1.0, done / total))
+        if text:
+            self.update_text(text)
+        self.lbl_detail.configure(text=detail)
     
     def close(self):
         self.grab_release()
         self.destroy()
 
+class SyncJobsPanel(ctk.CTkToplevel):
+    """Painel (não modal) com o estado, as tentativas e a duração da sincronização de cada lista"""
+
+    STATUS_COLORS = {PENDING: "gray", RUNNING: "#3b8ed0", RETRYING: "#f59e0b",
+                     DONE: "#10b981", FAILED: "#ef4444"}
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Sincronização das Listas")
+        self.geometry("640x380")
+
+        self.lbl_summary = ctk.CTkLabel(self, text="", font=("Segoe UI", 14))
+        self.lbl_summary.pack(pady=(15, 5))
+
+        self.body = ctk.CTkScrollableFrame(self)
+        self.body.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        self.body.grid_columnconfigure(1, weight=1)
+        for column, text in enumerate(["Lista", "Situação", "Duração"]):
+            ctk.CTkLabel(self.body, text=text, font=("Segoe UI", 12, "bold"),
+                         anchor="w").grid(row=0, column=column, padx=8, sticky="ew")
+        self._rows = []  # (job, labels de nome, situação e duração)
+
+    def set_jobs(self, jobs):
+        for _, *labels in self._rows:
+            for label in labels:
+                label.destroy()
+        self._rows = []
+        for row, job in enumerate(jobs, start=1):
+            name = ctk.CTkLabel(self.body, text=job.name, anchor="w")
+            name.grid(row=row, column=0, padx=8, sticky="w")
+            status = ctk.CTkLabel(self.body, text="", anchor="w")
+            status.grid(row=row, column=1, padx=8, sticky="ew")
+            duration = ctk.CTkLabel(self.body, text="", anchor="e", width=70)
+            duration.grid(row=row, column=2, padx=8, sticky="e")
+            self._rows.append((job, name, status, duration))
+        self.refresh()
+
+    def refresh(self):
+        finished = 0
+        for job, _, status, duration in self._rows:
+            text = job.status
+            if job.attempts > 1:
+                text += f" ({job.attempts}ª tentativa)"
+            if job.error and not job.ok:
+                text += f": {job.error}"
+            if len(text) > 60:
+                text = text[:57] + "..."
+            status.configure(text=text, text_color=self.STATUS_COLORS.get(job.status, "gray"))
+            seconds = job.seconds
+            duration.configure(text="" if seconds is None else f"{seconds:.1f} s")
+            finished += job.status in (DONE, FAILED)
+        self.lbl_summary.configure(text=f"{finished} de {len(self._rows)} listas concluídas")
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """Janela de diagnóstico (Ctrl+Shift+D): tempos dos caminhos críticos e atraso do loop do Tk"""
+
+    COLUMNS = [("name", "Operação", 220), ("count", "N", 60), ("p50", "p50 (ms)", 90),
+               ("p95", "p95 (ms)", 90), ("max", "máx (ms)", 90), ("last", "último (ms)", 90)]
+
+    def __init__(self, parent, lag_monitor):
+        super().__init__(parent)
+        self.title("Diagnóstico de Desempenho")
+        self.geometry("720x480")
+        self.lag_monitor = lag_monitor
+
+        self.lbl_lag = ctk.CTkLabel(self, text="", font=("Segoe UI", 13))
+        self.lbl_lag.pack(pady=(15, 10))
+
+        self.table = ttk.Treeview(self, columns=[key for key, _, _ in self.COLUMNS], show="headings", height=14)
+        for key, text, width in self.COLUMNS:
+            self.table.heading(key, text=text)
+            self.table.column(key, width=width, anchor="w" if key == "name" else "e")
+        self.table.pack(fill="both", expand=True, padx=15)
+
+        bottom = ctk.CTkFrame(self, fg_color="transparent")
+        bottom.pack(fill="x", padx=15, pady=15)
+        self.var_export = ctk.BooleanVar(value=TELEMETRY.export_path is not None)
+        ctk.CTkCheckBox(bottom, text="Gravar em arquivo (JSONL)", variable=self.var_export,
+                        command=self._toggle_export).pack(side="left")
+        ctk.CTkButton(bottom, text="Limpar", width=80, command=self._clear,
+                      fg_color="transparent", border_width=1,
+                      text_color=("gray10", "#DCE4EE")).pack(side="right")
+        self.lbl_export = ctk.CTkLabel(bottom, text="", text_color="gray", font=("Segoe UI", 11))
+        self.lbl_export.pack(side="left", padx=10)
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        stalls = self.lag_monitor.stalls_ms
+        seconds = len(stalls) * self.lag_monitor.interval_ms / 1000
+        self.lbl_lag.configure(text=f"Atraso do loop do Tk (últimos {seconds:.0f} s): "
+                                    f"p50 {self.lag_monitor.percentile(50):.0f} ms · "
+                                    f"p95 {self.lag_monitor.percentile(95):.0f} ms · "
+                                    f"máx {self.lag_monitor.max_stall_ms:.0f} ms")
+
+        self.table.delete(*self.table.get_children())
+        for name, stats in TELEMETRY.summary().items():
+            self.table.insert("", "end", values=[name, stats["count"]] + [
+                f"{stats[key] * 1000:.1f}" for key in ("p50", "p95", "max", "last")])
+
+        # A gravação pode ter sido desligada por um erro no arquivo (disco cheio, bloqueado...)
+        self.var_export.set(TELEMETRY.export_path is not None)
+        error = f"Gravação desligada: {TELEMETRY.export_error}" if TELEMETRY.export_error else ""
+        self.lbl_export.configure(text=TELEMETRY.export_path or error)
+        self.after(DIAGNOSTICS_REFRESH_MS, self.refresh)
+
+    def _toggle_export(self):
+        if not self.var_export.get():
+            TELEMETRY.stop_export()
+        else:
+            try:
+                TELEMETRY.export(TELEMETRY_PATH)
+            except OSError as e:
+                self.var_export.set(False)
+                messagebox.showerror("Erro", f"Não foi possível gravar a telemetria:\n{e}", parent=self)
+        self.lbl_export.configure(text=TELEMETRY.export_path or "")
+
+    def _clear(self):
+        TELEMETRY.clear()
+        self.lag_monitor.stalls_ms.clear()
+        self.refresh()
+
 class SharePointViewerApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        init_start = time.perf_counter()
         super().__init__()
+        self.profile_startup = profile_startup
+        self.startup_times = {"imports": IMPORT_SECONDS}
 
         self.title("Visualizador SharePoint - Vestas")
         
@@ -65,13 +238,41 @@ class SharePointViewerApp(ctk.CTk):
         self.geometry(f"{int(screen_width*0.8)}x{int(screen_height*0.8)}")
         self.state('zoomed')
 
+        self.dataset = None
         self.df_original = None 
+        self.filter_index = None
+        self._loading = False
+        self._reload_pending = False
+        self.stream = None  # Sincronização completa em streaming em andamento (StreamLoad)
+        self._stream_previous = None
+        self.ps_worker = PowerShellWorker()  # Sobe na primeira operação
+        self.sync_jobs = []      # Jobs da última sincronização de várias listas
+        self.job_panel = None
+        self._syncing = False
+        self.diagnostics = None
+        # Atraso do loop de eventos, medido o tempo todo; travamentos entram na telemetria
+        self.lag_monitor = EventLoopMonitor(self, interval_ms=LAG_INTERVAL_MS, maxlen=LAG_SAMPLES,
+                                            on_stall=lambda ms: TELEMETRY.record("tk.stall", ms / 1000))
+        self.bind("<Control-D>", lambda e: self.show_diagnostics())  # Ctrl+Shift+D
+        try:
+            start_telemetry_export()  # Opcional: variável de ambiente DOCSDOWNLOADER_TELEMETRY
+        except OSError:
+            pass
+        try:
+            self.sources = load_sources()  # Várias listas (sources.json); [] = só a lista padrão
+        except (OSError, ValueError, KeyError) as e:
+            self.sources = []
+            self.after(0, messagebox.showerror, "Erro no sources.json", str(e))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.col_empresa = "EMPRESA"
         self.col_identificacao = "IDENTIFICAÇÃO"
         self.col_equipamento = "EQUIPAMENTO"
         self.col_status = "STATUS DA ANÁLISE"
         self.col_id = "ID"
+        self.col_modified = "Modified"
         self.font_size = 10           
+        self.sort_keys = []  # Ordenação da tabela: [(coluna, crescente), ...]
+        self._heading_texts = {}  # Texto atual de cada cabeçalho da tabela
 
         # ==== LAYOUT PRINCIPAL ====
         # Grid configuration
@@ -95,6 +296,17 @@ class SharePointViewerApp(ctk.CTk):
                                       fg_color="#7c3aed", hover_color="#6d28d9")
         self.btn_sync.pack(side="right", padx=20, pady=10)
 
+        self.btn_full_sync = ctk.CTkButton(self.header_frame, text="Sincronização Completa", 
+                                           command=self.run_full_sync, 
+                                           fg_color="transparent", border_width=1, text_color=("gray10", "#DCE4EE"))
+        self.btn_full_sync.pack(side="right", padx=(5, 0), pady=10)
+
+        if self.sources:
+            self.btn_jobs = ctk.CTkButton(self.header_frame, text=f"Listas ({len(self.sources)})", width=90,
+                                          command=self.show_job_panel,
+                                          fg_color="transparent", border_width=1, text_color=("gray10", "#DCE4EE"))
+            self.btn_jobs.pack(side="right", padx=(5, 0), pady=10)
+
         self.btn_zoom_in = ctk.CTkButton(self.header_frame, text="🔍+", width=50, 
                                          command=lambda: self.change_zoom(1))
         self.btn_zoom_in.pack(side="right", padx=5)
@@ -109,6 +321,22 @@ class SharePointViewerApp(ctk.CTk):
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(1, weight=1) # Table expands
 
+        # Janela mínima primeiro: filtros e tabela são montados assim que ela aparece,
+        # enquanto o pandas e a camada de dados são importados em outra thread
+        self.lbl_splash = ctk.CTkLabel(self.content_frame, text="Carregando...",
+                                       text_color="gray", font=ctk.CTkFont(size=16))
+        self.lbl_splash.grid(row=1, column=0)
+        threading.Thread(target=self._preload, daemon=True).start()
+        self.after_idle(self._build_content, init_start)
+
+    def _preload(self):
+        self.startup_times["pandas"] = preload_data_layer()
+
+    def _build_content(self, init_start):
+        start = time.perf_counter()
+        self.startup_times["janela"] = start - init_start
+        self.lbl_splash.destroy()
+
         # 2.1 Filtros Frame
         self.filter_frame = ctk.CTkFrame(self.content_frame)
         self.filter_frame.grid(row=0, column=0, sticky="ew", pady=(0, 15))
@@ -147,6 +375,15 @@ class SharePointViewerApp(ctk.CTk):
                                           fg_color="#10b981", hover_color="#059669")
         self.btn_download.grid(row=0, column=9, padx=(0, 15), pady=15)
 
+        # Linha 2: busca livre em todas as colunas (combinada com os combos)
+        ctk.CTkLabel(self.filter_frame, text="Buscar:").grid(row=1, column=0, padx=(15, 5), pady=(0, 15), sticky="w")
+        self.entry_search = ctk.CTkEntry(self.filter_frame,
+                                         placeholder_text="Parte do nome do documento, equipamento, empresa...")
+        self.entry_search.grid(row=1, column=1, columnspan=7, padx=(0, 15), pady=(0, 15), sticky="ew")
+        self.entry_search.bind("<KeyRelease>", self._on_search_key)
+        self._search_job = None
+        self._last_query = ""
+
         # 2.2 Tabela (Treeview ainda precisa ser ttk, mas podemos estilizar)
         self.table_frame = ctk.CTkFrame(self.content_frame)
         self.table_frame.grid(row=1, column=0, sticky="nsew")
@@ -174,7 +411,10 @@ class SharePointViewerApp(ctk.CTk):
         style.map("Treeview.Heading", 
                   background=[('active', '#1f1f1f')])
 
-        self.tree = ttk.Treeview(self.table_frame, selectmode="extended", show="headings")
+        # Treeview virtual: só as linhas visíveis viram itens do Tk
+        # Os itens são identificados pela chave da linha (ORIGEM + ID), estável entre filtros
+        self.tree = VirtualTreeview(self.table_frame, key_columns=(SOURCE_COLUMN, self.col_id),
+                                    selectmode="extended", show="headings")
         self.tree.grid(row=0, column=0, sticky="nsew", padx=2, pady=2)
 
         # Scrollbars customizadas não são fáceis com ttk.Treeview, usando as padrão do ttk por enquanto
@@ -186,9 +426,54 @@ class SharePointViewerApp(ctk.CTk):
 
         self.tree.configure(yscrollcommand=self.vsb.set, xscrollcommand=self.hsb.set)
 
+        # Clique no cabeçalho ordena; Shift+clique acrescenta a coluna à ordenação
+        self.tree.bind("<ButtonRelease-1>", self._on_heading_click, add="+")
+
+        self.startup_times["widgets"] = time.perf_counter() - start
+        self.lag_monitor.start()
+
         # Carrega dados se existirem
-        if os.path.exists(EXCEL_PATH):
+        if self._has_local_data():
             self.load_data_from_excel()
+        elif self.profile_startup:
+            self._report_startup()
+
+    def _report_startup(self):
+        """--profile-startup: grava o tempo de cada etapa e fecha a aplicação.
+
+        Os tempos vão para a telemetria (startup.<etapa>, no JSONL se a gravação
+        estiver ligada) e para STARTUP_PROFILE_PATH: com pythonw ou executável
+        congelado não há stdout.
+        """
+        self.profile_startup = False
+        self.startup_times["total"] = time.perf_counter() - _IMPORT_START
+        lines = []
+        for key, label in STARTUP_PHASES:
+            if key in self.startup_times:
+                TELEMETRY.record(f"startup.{key}", self.startup_times[key])
+                lines.append(f"{label:<32} {self.startup_times[key]:>7.3f} s")
+        report = "Tempos de inicialização:\n" + "\n".join(lines) + "\n"
+        try:
+            with open(STARTUP_PROFILE_PATH, "w", encoding="utf-8") as f:
+                f.write(report)
+        except OSError:
+            pass  # Os tempos continuam na telemetria
+        if sys.stdout is not None:  # Rodando em um console: mostra também
+            sys.stdout.write(report)
+            sys.stdout.flush()
+        self.after(0, self._on_close)
+
+    def _on_close(self):
+        self.lag_monitor.stop()
+        self.ps_worker.stop()
+        TELEMETRY.stop_export()
+        self.destroy()
+
+    def show_diagnostics(self):
+        if self.diagnostics is None or not self.diagnostics.winfo_exists():
+            self.diagnostics = DiagnosticsWindow(self, self.lag_monitor)
+        else:
+            self.diagnostics.lift()
 
     def change_zoom(self, delta):
         new_size = self.font_size + delta
@@ -204,8 +489,9 @@ class SharePointViewerApp(ctk.CTk):
                 width = max(80, len(str(col)) * int(self.font_size * 1.2))
                 self.tree.column(col, width=width)
 
-            # Força atualização visual da tabela
+            # Força atualização visual da tabela (altura da linha muda a janela visível)
             self.tree.update()
+            self.tree.refresh()
 
     def _update_status(self, text, status_type="normal"):
         """Atualiza o label de status com cores apropriadas"""
@@ -218,10 +504,210 @@ class SharePointViewerApp(ctk.CTk):
         }
         self.lbl_status.configure(text=f"● {text}", text_color=colors.get(status_type, "gray"))
 
+    def _has_local_data(self):
+        if self.sources:
+            return any(os.path.exists(source.excel_path) for source in self.sources)
+        return os.path.exists(EXCEL_PATH)
+
     def run_powershell_sync(self):
-        self._run_powershell(PS_EXPORT_SCRIPT, "Sincronização concluída!", callback=self.load_data_from_excel)
+        if self.sources:
+            self.run_sources_sync()
+            return
+
+        # Sincronização incremental quando já há dados locais com a coluna Modified
+        args = sync_args(None if self._loading else self.dataset, delta_path=DELTA_PATH)
+        if not args:
+            self.run_full_sync()
+            return
+
+        if os.path.exists(DELTA_PATH):
+            os.remove(DELTA_PATH)
+        self._run_powershell(PS_EXPORT_SCRIPT, "Sincronização concluída!", args, callback=self.apply_delta_sync)
+
+    def run_full_sync(self):
+        if self.sources:
+            self.run_sources_sync(full=True)
+            return
+        if self._loading:
+            # Carga em andamento: exporta sem streaming e relê o Excel ao final
+            self._run_powershell(PS_EXPORT_SCRIPT, "Sincronização concluída!", callback=self.load_data_from_excel)
+            return
+
+        # Streaming: o exportador grava cada página em STREAM_PATH e as linhas entram
+        # na tabela (e no índice) durante o export, sem esperar o Excel
+        self._loading = True
+        self._reload_pending = False
+        self._stream_previous = self.dataset
+        self.stream = StreamLoad(STREAM_PATH, on_rows=self._on_stream_rows).start()
+        started = self._run_powershell(PS_EXPORT_SCRIPT, "Sincronização concluída!", self.stream.export_args(),
+                                       callback=self._finish_stream, on_error=self._cancel_stream)
+        if started is False:
+            self._cancel_stream()
+
+    def _on_stream_rows(self, dataset):
+        # Chamado da thread de leitura a cada remontagem: a tabela é atualizada na thread da interface
+        self.after(0, self._show_stream_rows, dataset)
+
+    def _show_stream_rows(self, dataset):
+        if self.stream is None or dataset is not self.stream.dataset:
+            return  # Sincronização já encerrada, ou já há uma remontagem mais nova na fila
+        self._set_dataset(dataset)
+        positions = self._filtered_positions()
+        # Mesmas colunas: só as linhas que entram na janela visível são inseridas
+        self.update_treeview(self.df_original, positions)
+        self.update_combo_options(positions)
+        self._update_status(f"Sincronizando... {len(dataset)} registros recebidos", "warning")
+
+    def _finish_stream(self):
+        stream, self.stream = self.stream, None
+        threading.Thread(target=self._stream_worker, args=(stream,), daemon=True).start()
+
+    def _stream_worker(self, stream):
+        try:
+            start = time.perf_counter()
+            dataset = stream.finish(EXCEL_PATH)
+            if dataset is None:
+                # Exportador sem streaming (nenhuma página gravada): lê a planilha gerada
+                dataset, _ = Dataset.load(EXCEL_PATH)
+            self.after(0, self._on_stream_finished, dataset, time.perf_counter() - start)
+
+        except Exception as e:
+            self.after(0, self._on_stream_error, str(e))
+
+    def _on_stream_finished(self, dataset, load_time):
+        # O dataset anterior (com DataFrame e índices) não é mais necessário
+        self._stream_previous = None
+        self._on_data_loaded(dataset, "streaming", load_time)
+
+    def _on_stream_error(self, error_msg):
+        # O dataset parcial não pode ficar como base de um delta (nem ir para o cache)
+        self._restore_stream_previous()
+        self._on_load_error(error_msg)
+
+    def _cancel_stream(self):
+        stream, self.stream = self.stream, None
+        if stream is None:
+            return
+        # A thread de leitura pode estar no meio de um bloco: não espera por ela aqui
+        threading.Thread(target=stream.cancel, daemon=True).start()
+        self._loading = False
+        self._restore_stream_previous()
+
+    def _restore_stream_previous(self):
+        previous, self._stream_previous = self._stream_previous, None
+        if previous is not None and previous is not self.dataset:
+            self._set_dataset(previous)
+            positions = self._filtered_positions()
+            self.update_treeview(self.df_original, positions)
+            self.update_combo_options(positions)
+
+    def apply_delta_sync(self):
+        if self._loading or self.dataset is None or not os.path.exists(DELTA_PATH):
+            self.load_data_from_excel()
+            return
+
+        self._loading = True
+        self._update_status("Aplicando alterações...", "warning")
+        threading.Thread(target=self._delta_worker, args=(self.dataset,), daemon=True).start()
+
+    def _delta_worker(self, dataset):
+        try:
+            dataset, stats = dataset.apply_delta(DELTA_PATH, EXCEL_PATH)
+            self.after(0, self._on_delta_applied, dataset, stats)
+
+        except Exception as e:
+            self.after(0, self._on_load_error, str(e))
+
+    def _on_delta_applied(self, dataset, stats):
+        self._loading = False
+        self._set_dataset(dataset)
+
+        positions = self._filtered_positions()
+        # Mantém a posição de rolagem e a seleção; só a janela visível é redesenhada
+        self.update_treeview(self.df_original, positions)
+        self.update_combo_options(positions)
+        self._update_status(f"Sincronizado: {stats['updated']} alterados, {stats['added']} novos, "
+                            f"{stats['removed']} removidos ({len(positions)} registros)", "success")
+
+        if self._reload_pending:
+            self.load_data_from_excel()
+
+    # ==== VÁRIAS LISTAS (sources.json) ====
+    def run_sources_sync(self, full=False):
+        """Exporta as listas em paralelo (um PowerShell por fonte) e mescla os resultados"""
+        if self._syncing:
+            self.show_job_panel()
+            return
+
+        # Com os datasets atuais das fontes, cada uma é sincronizada em modo delta
+        parts = None if self._loading or self.dataset is None else self.dataset.parts
+        self.sync_jobs = sync_jobs(self.sources, parts, full)
+        self._syncing = True
+        self._sync_start = time.perf_counter()
+        self._update_status(f"Sincronizando {len(self.sync_jobs)} listas...", "warning")
+        self.show_job_panel()
+
+        threading.Thread(target=self._sources_sync_worker, args=(self.sync_jobs, parts), daemon=True).start()
+        self._poll_jobs()
+
+    def _sources_sync_worker(self, jobs, parts):
+        try:
+            dataset = run_sync_jobs(jobs, parts)
+            self.after(0, self._on_sources_synced, dataset, jobs)
+        except Exception as e:
+            self.after(0, self._on_sources_sync_error, str(e))
+
+    def show_job_panel(self):
+        if self.job_panel is None or not self.job_panel.winfo_exists():
+            self.job_panel = SyncJobsPanel(self)
+            self.job_panel.set_jobs(self.sync_jobs)
+        else:
+            self.job_panel.set_jobs(self.sync_jobs)
+            self.job_panel.lift()
+
+    def _poll_jobs(self):
+        # O estado dos jobs é lido em intervalo fixo (as threads do agendador não tocam no Tk)
+        if self.job_panel is not None and self.job_panel.winfo_exists():
+            self.job_panel.refresh()
+        if self._syncing:
+            self.after(PROGRESS_REFRESH_MS * 2, self._poll_jobs)
+
+    def _on_sources_synced(self, dataset, jobs):
+        self._syncing = False
+        self._poll_jobs()
+        failed = [job.name for job in jobs if not job.ok]
+        elapsed = time.perf_counter() - self._sync_start
+
+        if dataset is None:
+            self._update_status("Nenhuma lista sincronizada", "error")
+        elif self._loading:
+            # Uma carga em andamento traria os dados antigos: repete a carga ao final dela
+            self._reload_pending = True
+        elif self.dataset is None:
+            self._on_data_loaded(dataset, "sincronização", elapsed)
+        else:
+            self._set_dataset(dataset)
+            positions = self._filtered_positions()
+            self.update_treeview(self.df_original, positions)  # Mantém rolagem e seleção
+            self.update_combo_options(positions)
+
+        synced = len(jobs) - len(failed)
+        if dataset is not None and not failed:
+            self._update_status(f"Sincronizado: {synced} listas, {len(dataset)} registros ({elapsed:.1f} s)",
+                                "success")
+        elif dataset is not None:
+            self._update_status(f"Sincronizado: {synced} de {len(jobs)} listas ({elapsed:.1f} s)", "warning")
+        if failed:
+            self.show_job_panel()
+            messagebox.showwarning("Sincronização", "Falha ao sincronizar:\n" + "\n".join(failed))
+
+    def _on_sources_sync_error(self, error_msg):
+        self._syncing = False
+        self._poll_jobs()
+        self._update_status("Erro na sincronização", "error")
+        messagebox.showerror("Erro", error_msg)
 
-    def _run_powershell(self, script_path, success_msg, args=[], callback=None):
+    def _run_powershell(self, script_path, success_msg, args=[], callback=None, notify=True, on_error=None):
         if not os.path.exists(script_path):
             messagebox.showerror("Erro", f"Script não encontrado:\n{script_path}")
             return False
@@ -230,126 +716,170 @@ class SharePointViewerApp(ctk.CTk):
         
         # Cria e exibe o popup
         popup = ProgressPopup(self, "Executando Script")
+        tracker = ProgressTracker()
+        finished = threading.Event()
         
         def thread_target():
             try:
-                cmd = ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", script_path] + args
-                
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-                
-                process = subprocess.Popen(
-                    cmd, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE, 
-                    text=True, 
-                    startupinfo=startupinfo,
-                    bufsize=1,
-                    universal_newlines=True,
-                    encoding='utf-8', # Força UTF-8 para evitar erros de decodificação
-                    errors='replace'
-                )
-                
-                # Lê a saída linha por linha para atualizar o popup
-                while True:
-                    line = process.stdout.readline()
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        clean_line = line.strip()
-                        if clean_line:
-                            # Atualiza o popup na thread principal
-                            self.after(0, popup.update_text, clean_line)
-                
-                stdout, stderr = process.communicate()
-                return_code = process.returncode
+                if PS_PERSISTENT_WORKER:
+                    # Worker já aberto: sem custo de subir o PowerShell e autenticar de novo
+                    return_code = self.ps_worker.run(script_path, args, tracker.feed)
+                    # O erro do script (mensagem "done") também entra no log do tracker
+                    output = tracker.tail()
+                    finished.set()
+                    self.after(0, lambda: self._on_process_finished(return_code, output, success_msg, popup, callback, notify, on_error))
+                    return
+
+                # Lê a saída linha por linha; o popup consulta o tracker em intervalo fixo
+                return_code = run_powershell(script_path, args, tracker.feed)
+                finished.set()
+
+                # stdout e stderr chegam juntos e ficam no log do tracker (últimas linhas)
+                output = tracker.tail()
 
                 # Finaliza na thread principal
-                self.after(0, lambda: self._on_process_finished(return_code, stdout, stderr, success_msg, popup, callback))
+                self.after(0, lambda: self._on_process_finished(return_code, output, success_msg, popup, callback, notify, on_error))
 
             except Exception as e:
-                self.after(0, lambda: self._on_process_error(str(e), popup))
+                finished.set()
+                self.after(0, self._on_process_error, str(e), popup, on_error)
 
         # Inicia a thread
         threading.Thread(target=thread_target, daemon=True).start()
+        self._poll_progress(tracker, popup, finished)
 
-    def _on_process_finished(self, return_code, stdout, stderr, success_msg, popup, callback):
+    def _poll_progress(self, tracker, popup, finished):
+        if finished.is_set() or not popup.winfo_exists():
+            return
+        state = tracker.poll()
+        if state is not None:
+            if state["total"]:
+                detail = f"{state['rate']:.1f} itens/s"
+                if state["bytes_rate"]:
+                    detail += f" · {state['bytes_rate'] / 1024 / 1024:.1f} MB/s"
+                detail += f" · restante: {format_eta(state['eta'])}"
+                popup.update_progress(state["done"], state["total"],
+                                      f"{state['phase']}: {state['done']}/{state['total']}", detail)
+            else:
+                popup.update_text(state["message"] or state["phase"])
+        self.after(PROGRESS_REFRESH_MS, self._poll_progress, tracker, popup, finished)
+
+    def _on_process_finished(self, return_code, output, success_msg, popup, callback, notify=True,
+                             on_error=None):
         popup.close()
         
         if return_code == 0:
             self._update_status(success_msg, "success")
-            messagebox.showinfo("Sucesso", success_msg)
+            if notify:
+                messagebox.showinfo("Sucesso", success_msg)
             if callback:
                 callback()
         else:
+            if on_error:
+                on_error()
             self._update_status("Erro na execução", "error")
-            err_msg = f"Erro:\n{stderr}\n\nSaída:\n{stdout}"
+            err_msg = f"O PowerShell terminou com código {return_code}.\n\nÚltimas linhas da saída:\n{output}"
             messagebox.showerror("Erro PowerShell", err_msg)
 
-    def _on_process_error(self, error_msg, popup):
+    def _on_process_error(self, error_msg, popup, on_error=None):
         popup.close()
+        if on_error:
+            on_error()
         self._update_status("Erro Crítico", "error")
         messagebox.showerror("Erro", error_msg)
 
     def load_data_from_excel(self):
-        if not os.path.exists(EXCEL_PATH):
+        if not self._has_local_data():
             self._update_status("Excel não encontrado", "error")
             return
 
-        try:
-            df = pd.read_excel(EXCEL_PATH, sheet_name="DefaultView")
-            self.df_original = df.fillna("")
+        # Uma carga por vez; se pedirem outra no meio (ex.: após sincronizar), repete ao final
+        if self._loading:
+            self._reload_pending = True
+            return
 
-            cols_upper = [c.upper() for c in self.df_original.columns]
-            
-            if "ID" in cols_upper:
-                self.col_id = self.df_original.columns[cols_upper.index("ID")]
-            
-            if "EMPRESA" in cols_upper:
-                self.col_empresa = self.df_original.columns[cols_upper.index("EMPRESA")]
-            elif "COMPANY" in cols_upper:
-                self.col_empresa = self.df_original.columns[cols_upper.index("COMPANY")]
-
-            if "IDENTIFICAÇÃO" in cols_upper:
-                self.col_identificacao = self.df_original.columns[cols_upper.index("IDENTIFICAÇÃO")]
-            elif "IDENTIFICACAO" in cols_upper:
-                self.col_identificacao = self.df_original.columns[cols_upper.index("IDENTIFICACAO")]
-
-            if "EQUIPAMENTO" in cols_upper:
-                self.col_equipamento = self.df_original.columns[cols_upper.index("EQUIPAMENTO")]
-            elif "EQUIPMENT" in cols_upper:
-                self.col_equipamento = self.df_original.columns[cols_upper.index("EQUIPMENT")]
-
-            if "STATUS DA ANÁLISE" in cols_upper:
-                self.col_status = self.df_original.columns[cols_upper.index("STATUS DA ANÁLISE")]            
-            elif "ANALYSIS STATUS" in cols_upper:
-                self.col_status = self.df_original.columns[cols_upper.index("ANALYSIS STATUS")]
-
-            self.update_combo_options(self.df_original)
-            
-            if self.col_status in self.df_original.columns:
-                options = self.combo_status.cget("values")
-                for opt in options:
-                    if str(opt).lower() == "aprovado":
-                        self.combo_status.set(opt)
-                        self.apply_filter(None)
-                        break
-            
-            if not self.combo_status.get():
-                self.update_treeview(self.df_original)
-                self._update_status(f"Carregado: {len(self.df_original)} registros", "success")
+        self._loading = True
+        self._reload_pending = False
+        self._update_status("Carregando dados...", "warning")
+
+        # Leitura e construção do índice rodam fora da thread do Tk
+        threading.Thread(target=self._load_worker, daemon=True).start()
+
+    def _load_worker(self):
+        try:
+            start = time.perf_counter()
+
+            def on_preview(preview):
+                self.after(0, self._on_first_page, preview)
+                self.after(0, self._update_status, "Lendo Excel (planilha completa)...", "warning")
+
+            # Usa o cache binário ao lado do Excel; só reprocessa o xlsx quando ele muda.
+            # O índice de filtros é construído junto, ainda fora da thread do Tk.
+            if self.sources:
+                # Várias listas: planilha (ou cache) de cada fonte, mescladas com a coluna ORIGEM
+                dataset, from_cache = Dataset.load_all(self.sources)
+            else:
+                dataset, from_cache = Dataset.load(EXCEL_PATH, on_preview=on_preview,
+                                                   preview_rows=FIRST_PAGE_ROWS)
+            origin = "cache" if from_cache else "Excel"
+            load_time = time.perf_counter() - start
+            TELEMETRY.record("load_data_from_excel", load_time, origin=origin, rows=len(dataset))
+
+            # Entrega o resultado para a thread principal
+            self.after(0, self._on_data_loaded, dataset, origin, load_time)
 
         except Exception as e:
-            messagebox.showerror("Erro ao ler Excel", str(e))
+            self.after(0, self._on_load_error, str(e))
+
+    def _set_dataset(self, dataset):
+        self.dataset = dataset
+        for attr, col in dataset.columns.items():
+            setattr(self, attr, col)
+        self.df_original = dataset.df
+        self.filter_index = dataset.filter_index
+        self.tree.key_columns = (SOURCE_COLUMN, self.col_id)
+
+    def _on_first_page(self, preview):
+        # Mostra as primeiras linhas enquanto a planilha completa é lida (só na primeira carga)
+        if self.df_original is None:
+            self.update_treeview(preview)
+            self._update_status(f"Carregando... exibindo as primeiras {len(preview)} linhas", "warning")
+
+    def _on_data_loaded(self, dataset, origin, load_time):
+        self._loading = False
+        self._set_dataset(dataset)
+
+        self.update_combo_options()
+        
+        if self.col_status in self.df_original.columns:
+            default_status = dataset.default_status()
+            if default_status is not None:
+                self.combo_status.set(default_status)
+                self.apply_filter(None)
+        
+        if not self.combo_status.get():
+            self.update_treeview(self.df_original, self._filtered_positions())
+            self._update_status(f"Carregado: {len(self.df_original)} registros ({origin}, {load_time:.2f} s)", "success")
+
+        if self.profile_startup:
+            self.startup_times["dados"] = load_time
+            self._report_startup()
+            return
+
+        if self._reload_pending:
+            self.load_data_from_excel()
+
+    def _on_load_error(self, error_msg):
+        self._loading = False
+        self._update_status("Erro ao ler Excel", "error")
+        messagebox.showerror("Erro ao ler Excel", error_msg)
 
-    def update_combo_options(self, df, ignore_combo=None):
-        """Atualiza as opções dos comboboxes baseado no DataFrame filtrado"""
+    @TELEMETRY.timed("update_combo_options")
+    def update_combo_options(self, positions=None, ignore_combo=None):
+        """Atualiza as opções dos comboboxes baseado nas linhas filtradas (posições)"""
         
         def get_options(col_name):
-            if col_name in df.columns:
-                return sorted(list(set(df[col_name].astype(str))))
-            return []
+            return self.filter_index.options(col_name, positions)
 
         if ignore_combo != self.combo_empresa:
             self.combo_empresa.configure(values=get_options(self.col_empresa))
@@ -363,107 +893,256 @@ class SharePointViewerApp(ctk.CTk):
         if ignore_combo != self.combo_status:
             self.combo_status.configure(values=get_options(self.col_status))
 
-    def update_treeview(self, df):
-        self.tree.delete(*self.tree.get_children())
-        
+    @TELEMETRY.timed("update_treeview")
+    def update_treeview(self, df, positions=None):
         cols = list(df.columns)
-        self.tree["columns"] = cols
-        
-        for col in cols:
-            self.tree.heading(col, text=col)
-            # Ajusta largura baseado no tamanho da fonte
-            # Multiplicador aproximado para largura de caractere
-            width = max(80, len(str(col)) * int(self.font_size * 1.2))
-            self.tree.column(col, width=width, minwidth=50)
+        if cols != list(self.tree["columns"]):
+            self.tree["columns"] = cols
+            self._heading_texts = {}
+            for col in cols:
+                # Ajusta largura baseado no tamanho da fonte
+                # Multiplicador aproximado para largura de caractere
+                width = max(80, len(str(col)) * int(self.font_size * 1.2))
+                self.tree.column(col, width=width, minwidth=50)
+            # Colunas novas: a tabela é montada do zero (topo, sem seleção)
+            self._update_headings(cols)
+            self.tree.set_data(df, positions)
+            return
+
+        # Mesmas colunas (filtro, busca, ordenação): só a diferença entre as linhas é
+        # aplicada, mantendo rolagem e seleção das linhas que continuam na visão
+        self._update_headings(cols)
+        self.tree.update_data(df, positions)
 
-        for index, row in df.iterrows():
-            self.tree.insert("", "end", values=list(row))
+    def _update_headings(self, cols):
+        # Só os cabeçalhos cujo texto mudou (setas de ordenação) são reconfigurados
+        for col in cols:
+            text = self._heading_text(col)
+            if self._heading_texts.get(col) != text:
+                self.tree.heading(col, text=text)
+                self._heading_texts[col] = text
+
+    def _heading_text(self, col):
+        # Indica a direção (e a prioridade, com várias colunas) da ordenação
+        for priority, (key, ascending) in enumerate(self.sort_keys, start=1):
+            if key == col:
+                arrow = "▲" if ascending else "▼"
+                return f"{col} {arrow}{priority if len(self.sort_keys) > 1 else ''}"
+        return str(col)
+
+    def _on_heading_click(self, event):
+        if self.dataset is None or self.tree.identify_region(event.x, event.y) != "heading":
+            return
+        column_id = self.tree.identify_column(event.x)  # "#1", "#2", ...
+        col = self.tree["columns"][int(column_id[1:]) - 1]
+
+        keys = list(self.sort_keys)
+        if event.state & 0x0001:  # Shift: acrescenta a coluna ou inverte a direção dela
+            if col in dict(keys):
+                keys = [(key, not ascending if key == col else ascending) for key, ascending in keys]
+            else:
+                keys.append((col, True))
+        elif keys == [(col, True)]:
+            keys = [(col, False)]
+        elif keys == [(col, False)]:
+            keys = []  # Terceiro clique volta à ordem original
+        else:
+            keys = [(col, True)]
+        self.sort_keys = keys
+
+        start = time.perf_counter()
+        positions = self._filtered_positions()
+        self.update_treeview(self.df_original, positions)
+        elapsed = (time.perf_counter() - start) * 1000
+        if keys:
+            order = ", ".join(f"{key} {'▲' if ascending else '▼'}" for key, ascending in keys)
+            self._update_status(f"Ordenado por {order} ({len(positions)} registros, {elapsed:.0f} ms)", "info")
+        else:
+            self._update_status(f"Ordem original ({len(positions)} registros)", "info")
+
+    def _current_selections(self):
+        return {
+            self.col_empresa: self.combo_empresa.get(),
+            self.col_identificacao: self.combo_identificacao.get(),
+            self.col_equipamento: self.combo_equipamento.get(),
+            self.col_status: self.combo_status.get(),
+        }
 
+    def _filtered_positions(self):
+        # Filtra pelo índice: interseção de posições, sem copiar o DataFrame
+        positions = self.filter_index.filter(self._current_selections())
+        positions = self.dataset.search(self.entry_search.get(), positions)
+        # Ordenação: permutação da coluna (já calculada) restrita às posições filtradas
+        return self.dataset.sort(positions, self.sort_keys)
+
+    def _on_search_key(self, event):
+        # Debounce: só filtra quando o usuário para de digitar
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self._apply_search)
+
+    def _apply_search(self):
+        self._search_job = None
+        query = self.entry_search.get()
+        if query == self._last_query:
+            return  # Teclas que não mudam o texto (setas, Shift...)
+        self._last_query = query
+        self.apply_filter(None)
+
+    @TELEMETRY.timed("apply_filter")
     def apply_filter(self, choice):
         if self.df_original is None: return
         
-        df_filtered = self.df_original.copy()
-
-        # Filtro Empresa
-        sel_empresa = self.combo_empresa.get()
-        if sel_empresa and self.col_empresa in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered[self.col_empresa].astype(str) == sel_empresa]
-
-        # Filtro Identificação
-        sel_ident = self.combo_identificacao.get()
-        if sel_ident and self.col_identificacao in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered[self.col_identificacao].astype(str) == sel_ident]
-
-        # Filtro Equipamento
-        sel_equip = self.combo_equipamento.get()
-        if sel_equip and self.col_equipamento in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered[self.col_equipamento].astype(str) == sel_equip]
-
-        # Filtro Status
-        sel_status = self.combo_status.get()
-        if sel_status and self.col_status in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered[self.col_status].astype(str) == sel_status]
+        positions = self._filtered_positions()
 
         # Atualiza a tabela
-        self.update_treeview(df_filtered)
-        self._update_status(f"Filtrado: {len(df_filtered)} registros", "info")
+        self.update_treeview(self.df_original, positions)
+        self._update_status(f"Filtrado: {len(positions)} registros", "info")
 
         # Atualiza as opções dos OUTROS combos para refletir o filtro atual (Cascata)
         # No CustomTkinter, não temos acesso fácil ao widget que disparou o evento via 'choice'
         # Então atualizamos todos.
-        self.update_combo_options(df_filtered)
+        self.update_combo_options(positions)
 
     def clear_filter(self):
         self.combo_empresa.set('')
         self.combo_identificacao.set('')
         self.combo_equipamento.set('')
         self.combo_status.set('')
+        self.entry_search.delete(0, "end")
+        self._last_query = ""
         
         if self.df_original is not None:
-            self.update_treeview(self.df_original)
-            self.update_combo_options(self.df_original)
+            # A ordenação escolhida é mantida
+            self.update_treeview(self.df_original, self._filtered_positions())
+            self.update_combo_options()
             self._update_status("Filtros limpos", "normal")
 
     def download_attachments(self):
-        selected_items = self.tree.selection()
-        
-        # Lógica: Se tem seleção, usa ela. Se não, usa todos os itens visíveis (filtrados)
-        if selected_items:
-            items_to_process = selected_items
+        # Lógica: Se tem seleção, usa ela. Se não, usa todos os itens visíveis (filtrados).
+        # Os IDs vêm direto do DataFrame pelas posições, sem formatar linha a linha da tabela.
+        positions = self.tree.selected_positions()
+        if len(positions):
             msg_context = "selecionados"
         else:
-            items_to_process = self.tree.get_children()
+            positions = self.tree.view_positions()
             msg_context = "visíveis (TODOS)"
 
-        if not items_to_process:
+        if self.dataset is None or not len(positions):
             messagebox.showwarning("Atenção", "Não há itens na tabela para baixar.")
             return
 
-        ids_to_download = []
-        columns = self.tree["columns"]
         try:
-            id_index = columns.index(self.col_id)
-        except ValueError:
+            ids_to_download = self.dataset.ids(positions)
+            # Várias listas: os IDs só são únicos dentro de cada fonte
+            ids_by_source = self.dataset.ids_by_source(positions) if self.sources else {}
+        except KeyError:
             messagebox.showerror("Erro", f"Coluna ID '{self.col_id}' não encontrada.")
             return
 
-        for item in items_to_process:
-            values = self.tree.item(item, 'values')
-            raw_id = values[id_index]
-            try:
-                clean_id = str(int(float(raw_id)))
-            except:
-                clean_id = str(raw_id)
-            ids_to_download.append(clean_id)
-
         if not ids_to_download: return
 
-        ids_str = ",".join(ids_to_download)
+        try:
+            check_download_auth()
+        except RuntimeError as e:
+            messagebox.showerror("Download", str(e))
+            return
+
         confirm = messagebox.askyesno("Confirmar", f"Baixar anexos de {len(ids_to_download)} itens {msg_context}?")
-        if confirm:
-            args = ["-Ids", ids_str]
-            self._run_powershell(PS_DOWNLOAD_SCRIPT, "Download concluído!", args)
+        if confirm and self.sources:
+            self._list_sources_attachments(download_groups(ids_by_source, self.sources, DOWNLOAD_DIR))
+        elif confirm:
+            # O PowerShell só lista os anexos (e fornece o token); o download é feito em Python
+            args = list_attachments_args(ids_to_download, ATTACHMENTS_LIST_PATH)
+            self._run_powershell(PS_DOWNLOAD_SCRIPT, "Anexos listados", args,
+                                 callback=self.start_native_download, notify=False)
+
+    def _list_sources_attachments(self, groups):
+        """Várias listas: lista os anexos de cada fonte (cada uma em sua subpasta) e baixa tudo junto"""
+        self._update_status("Listando anexos...", "warning")
+        popup = ProgressPopup(self, "Listando Anexos")
+        tracker = ProgressTracker()
+        finished = threading.Event()
+
+        def thread_target():
+            # Um PowerShell novo por fonte: o worker persistente fica conectado só ao site padrão
+            try:
+                listing = list_attachments(groups, DOWNLOAD_DIR, run_powershell, tracker.feed)
+                finished.set()
+                self.after(0, self._on_sources_listed, listing, popup)
+            except Exception as e:
+                finished.set()
+                self.after(0, self._on_process_error, str(e), popup)
+
+        threading.Thread(target=thread_target, daemon=True).start()
+        self._poll_progress(tracker, popup, finished)
+
+    def _on_sources_listed(self, listing, popup):
+        popup.close()
+        self.start_native_download(listing)
+
+    def start_native_download(self, listing=None):
+        try:
+            # A listagem contém o token de acesso: é apagada logo após a leitura
+            jobs, headers = listing or read_listing(ATTACHMENTS_LIST_PATH, DOWNLOAD_DIR)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Não foi possível ler a lista de anexos:\n{e}")
+            return
+
+        if not jobs:
+            self._update_status("Nenhum anexo encontrado", "normal")
+            messagebox.showinfo("Download", "Nenhum anexo encontrado nos itens selecionados.")
+            return
+
+        try:
+            engine = make_engine(headers)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Não foi possível abrir o manifesto de downloads:\n{e}")
+            return
+        popup = ProgressPopup(self, "Baixando Anexos")
+        self._update_status(f"Baixando {len(jobs)} anexos...", "warning")
+
+        def thread_target():
+            try:
+                try:
+                    engine.run(jobs)
+                finally:
+                    engine.manifest.close()
+                self.after(0, self._on_download_finished, engine, popup)
+            except Exception as e:
+                # Sem isso o popup modal (grab_set) ficaria aberto para sempre
+                self.after(0, self._on_process_error, str(e), popup)
+
+        threading.Thread(target=thread_target, daemon=True).start()
+        self._poll_download(engine, popup)
+
+    def _poll_download(self, engine, popup):
+        # Leitura periódica do progresso (não depende de eventos vindos das threads)
+        if not popup.winfo_exists():
+            return
+        stats = engine.stats()
+        remaining = stats["total"] - stats["done"]
+        eta = remaining / stats["files_per_s"] if stats["files_per_s"] else None
+        popup.update_progress(stats["done"], stats["total"], f"{stats['done']}/{stats['total']} arquivos",
+                              f"{stats['files_per_s']:.1f} arq/s · {stats['mb_per_s']:.1f} MB/s · "
+                              f"restante: {format_eta(eta)}")
+        self.after(PROGRESS_REFRESH_MS * 2, self._poll_download, engine, popup)
+
+    def _on_download_finished(self, engine, popup):
+        popup.close()
+        stats = engine.stats()
+        summary = (f"{stats['done'] - len(engine.errors)} de {stats['total']} arquivos em {stats['elapsed']:.1f} s "
+                   f"({stats['mb_per_s']:.1f} MB/s)\n"
+                   f"Já existentes (pulados): {stats['skipped']} · Retomados: {stats['resumed']} · "
+                   f"Duplicados (hardlink): {stats['linked']}\nSalvos em: {DOWNLOAD_DIR}")
+        if engine.errors:
+            self._update_status(f"Download com {len(engine.errors)} erros", "warning")
+            details = "\n".join(f"{job.name}: {msg}" for job, msg in engine.errors[:10])
+            messagebox.showwarning("Download concluído com erros", f"{summary}\n\nErros:\n{details}")
+        else:
+            self._update_status("Download concluído!", "success")
+            messagebox.showinfo("Sucesso", f"Download concluído!\n{summary}")
 
 if __name__ == "__main__":
-    app = SharePointViewerApp()
+    app = SharePointViewerApp(profile_startup="--profile-startup" in sys.argv[1:])
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import time
+from collections import deque
+
+from telemetry import percentile
+
+
+class EventLoopMonitor:
+    """Mede travamentos do loop de eventos do Tk.
+
+    Agenda um tick a cada interval_ms via after() e registra quanto cada tick
+    atrasou além do esperado. Um atraso alto significa que a thread principal
+    ficou ocupada (ex.: processando dados) e a janela não respondeu.
+
+    maxlen limita os atrasos guardados (monitor sempre ligado); on_stall(ms) é
+    chamado para atrasos a partir de stall_ms.
+    """
+
+    def __init__(self, widget, interval_ms=10, maxlen=None, on_stall=None, stall_ms=100):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.maxlen = maxlen
+        self.on_stall = on_stall
+        self.stall_ms = stall_ms
+        self.stalls_ms = deque(maxlen=maxlen)
+        self._job = None
+        self._last = None
+
+    def start(self):
+        self.stalls_ms = deque(maxlen=self.maxlen)
+        self._last = time.perf_counter()
+        self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        stall = max(0.0, (now - self._last) * 1000 - self.interval_ms)
+        self.stalls_ms.append(stall)
+        if self.on_stall and stall >= self.stall_ms:
+            self.on_stall(stall)
+        self._last = now
+        self._job = self.widget.after(self.interval_ms, self._tick)
+
+    @property
+    def max_stall_ms(self):
+        return max(self.stalls_ms, default=0.0)
+
+    def percentile(self, pct):
+        return percentile(self.stalls_ms, pct)
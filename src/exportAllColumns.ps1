@@ -2,27 +2,61 @@
 # If this is your first time using ImportExcel, install it:
 # Install-Module ImportExcel -Scope CurrentUser -Force
 
+param(
+    # Modo delta: exporta só os itens modificados desde esta data (yyyy-MM-dd HH:mm)
+    # e grava um JSON em -DeltaPath, sem gerar o Excel
+    [string]$Since = "",
+    [string]$DeltaPath = "",
+
+    # Fonte (sources.json): site, lista e planilha de saída; o padrão é a lista original
+    [string]$SiteUrl = "https://vestas.sharepoint.com/sites/CC-Subcontractors-BR",
+    [string]$ListId = "205a1e3b-9c65-4733-b67f-0effd21b7953",
+    [string]$OutputPath = "",
+
+    # Streaming: grava cada página de itens neste arquivo (uma linha JSON por item) assim
+    # que é lida, para a aplicação exibir as linhas durante o export; o Excel é gerado no final
+    [string]$StreamPath = "",
+
+    # Login (ver connectSharePoint.ps1): app do Entra ID; com Tenant e Thumbprint, por certificado
+    [string]$ClientId = $env:DOCSDOWNLOADER_CLIENT_ID,
+    [string]$Tenant = $env:DOCSDOWNLOADER_TENANT,
+    [string]$Thumbprint = $env:DOCSDOWNLOADER_THUMBPRINT
+)
+
+. (Join-Path $PSScriptRoot "connectSharePoint.ps1")
+
 # ==== PARAMETERS ====
-$siteUrl   = "https://vestas.sharepoint.com/sites/CC-Subcontractors-BR"
-$listGuid  = "205a1e3b-9c65-4733-b67f-0effd21b7953"
+$siteUrl   = $SiteUrl
+$listGuid  = $ListId
 
 # Salva na raiz do projeto (pasta pai de onde este script está)
 $projectRoot = Split-Path -Parent $PSScriptRoot
-$outputXlsx = Join-Path $projectRoot "DefaultView-Data.xlsx"
+$outputXlsx = if ($OutputPath) { $OutputPath } else { Join-Path $projectRoot "DefaultView-Data.xlsx" }
+
+# ==== PROGRESSO (protocolo lido pelo downloadFiles.py) ====
+# Uma linha JSON por atualização: {"type":"progress","phase":...,"done":...,"total":...,"bytes":...}
+function Send-Progress([string]$Phase, [int]$Done, [int]$Total, [long]$Bytes = 0) {
+    $msg = @{ type = "progress"; phase = $Phase; done = $Done; total = $Total; bytes = $Bytes }
+    [Console]::Out.WriteLine((ConvertTo-Json -InputObject $msg -Compress))
+}
 
 # ==== CONNECTION ====
-# If you use MFA, you may prefer: -Interactive
-Connect-PnPOnline -Url $siteUrl -UseWebLogin
+# Dentro do worker persistente (psWorker.ps1) a conexão já está aberta (se for o mesmo site)
+if ($global:PnPWorkerConnection -and $global:PnPWorkerConnection.Url -eq $siteUrl) {
+    $conn = $global:PnPWorkerConnection
+} else {
+    $conn = Connect-DocsSharePoint -Url $siteUrl -ClientId $ClientId -Tenant $Tenant -Thumbprint $Thumbprint
+}
 
 # ==== METADATA: DEFAULT VIEW COLUMNS ====
 Write-Host "Obtendo colunas da View Padrão..." -ForegroundColor Cyan
 
 # 1. Get the Default View
-$view = Get-PnPView -List $listGuid | Where-Object { $_.DefaultView -eq $true }
+$view = Get-PnPView -List $listGuid -Connection $conn | Where-Object { $_.DefaultView -eq $true }
 if (-not $view) { throw "Nenhuma view padrão encontrada na lista." }
 
 # 2. Get All Fields (to look up Display Names later)
-$allFields = Get-PnPField -List $listGuid
+$allFields = Get-PnPField -List $listGuid -Connection $conn
 
 # 3. Map "View Fields" (which might be pseudo-fields like LinkTitle) to "Real Fields"
 $pseudoMap = @{
@@ -63,81 +97,143 @@ foreach ($vf in $view.ViewFields) {
 Write-Host "Colunas encontradas: $($columns.Count)" -ForegroundColor Gray
 
 # ==== COLLECTING ITEMS (OPTIMIZED) ====
-Write-Host "Baixando itens ..." -ForegroundColor Cyan
 $fieldsToLoad = $columns.Internal | Select-Object -Unique
-$items = Get-PnPListItem -List $listGuid -Fields $fieldsToLoad
+$deltaMode = -not [string]::IsNullOrWhiteSpace($Since) -and -not [string]::IsNullOrWhiteSpace($DeltaPath)
 
-# ==== TRANSFORMING TO OBJECTS (OPTIMIZED) ====
-Write-Host "Processando $($items.Count) registros..." -ForegroundColor Cyan
+if ($deltaMode) {
+    # 1. Passada leve (só ID e Modified) para saber o que mudou e o que foi excluído
+    Write-Host "Verificando alterações desde $Since ..." -ForegroundColor Cyan
+    $light = Get-PnPListItem -List $listGuid -Connection $conn -Fields "ID", "Modified" -PageSize 2000
 
+    # Margem de 1 dia (fuso horário / precisão em minutos); o merge por ID é idempotente
+    $sinceDate = [datetime]::ParseExact($Since, "yyyy-MM-dd HH:mm", $null).AddDays(-1)
+    $allIds = @($light | ForEach-Object { $_.Id })
+    $changedIds = @($light | Where-Object { $_.FieldValues["Modified"] -ge $sinceDate } | ForEach-Object { $_.Id })
+    Write-Host "Itens alterados: $($changedIds.Count) de $($allIds.Count)" -ForegroundColor Gray
+
+    # 2. Carrega os itens alterados em lotes (CAML <In> aceita até 500 valores; ID é indexado)
+    $viewFields = ($fieldsToLoad | ForEach-Object { "<FieldRef Name='$_'/>" }) -join ""
+    $items = New-Object System.Collections.Generic.List[object]
+    for ($i = 0; $i -lt $changedIds.Count; $i += 500) {
+        $batch = $changedIds[$i..([Math]::Min($i + 499, $changedIds.Count - 1))]
+        $values = ($batch | ForEach-Object { "<Value Type='Counter'>$_</Value>" }) -join ""
+        $caml = "<View><ViewFields>$viewFields</ViewFields><Query><Where><In><FieldRef Name='ID'/><Values>$values</Values></In></Where></Query></View>"
+        foreach ($it in (Get-PnPListItem -List $listGuid -Connection $conn -Query $caml)) { $items.Add($it) }
+        Send-Progress "Baixando itens alterados" $items.Count $changedIds.Count
+    }
+}
+
+# ==== TRANSFORMING TO OBJECTS (OPTIMIZED) ====
 # Otimização: Lista Genérica para performance
 $dataList = New-Object System.Collections.Generic.List[object]
+$processed = 0
 
-foreach ($item in $items) {
-    $o = [ordered]@{}
+# Converte um lote de itens (a lista toda ou uma página, no streaming) e acrescenta em $dataList
+function Add-Rows($batch, [int]$total) {
+    foreach ($item in $batch) {
+        $script:processed++
+        if ($script:processed % 500 -eq 0) { Send-Progress "Processando registros" $script:processed $total }
+        $o = [ordered]@{}
     
-    # Otimização: Acesso direto ao dicionário de valores (evita chamadas COM)
-    $fieldValues = $item.FieldValues
+        # Otimização: Acesso direto ao dicionário de valores (evita chamadas COM)
+        $fieldValues = $item.FieldValues
     
-    foreach ($col in $columns) {
-        $key = $col.Internal
-        $val = $null
+        foreach ($col in $columns) {
+            $key = $col.Internal
+            $val = $null
         
-        # Tenta pegar do dicionário (Rápido)
-        if ($fieldValues.ContainsKey($key)) {
-            $val = $fieldValues[$key]
-        } else {
-            # Fallback (Lento, para colunas computadas)
-            try { $val = $item[$key] } catch {}
-        }
-
-        # Lógica In-Line (Remove overhead de função)
-        if ($null -eq $val) {
-            $o[$col.Title] = ""
-        }
-        else {
-            # Verificações de tipo otimizadas
-            if ($val -is [Microsoft.SharePoint.Client.FieldLookupValue]) {
-                $o[$col.Title] = $val.LookupValue
-            }
-            elseif ($val -is [Microsoft.SharePoint.Client.FieldUserValue]) {
-                $o[$col.Title] = $val.LookupValue
-            }
-            elseif ($val -is [string]) {
-                $o[$col.Title] = $val
-            }
-            elseif ($val -is [DateTime]) {
-                $o[$col.Title] = $val.ToString("yyyy-MM-dd HH:mm")
-            }
-            elseif ($val -is [bool]) {
-                $o[$col.Title] = if ($val) { "Sim" } else { "Não" }
+            # Tenta pegar do dicionário (Rápido)
+            if ($fieldValues.ContainsKey($key)) {
+                $val = $fieldValues[$key]
+            } else {
+                # Fallback (Lento, para colunas computadas)
+                try { $val = $item[$key] } catch {}
             }
-            elseif ($val -is [Microsoft.SharePoint.Client.FieldUrlValue]) {
-                $o[$col.Title] = if ($val.Description) { $val.Description } else { $val.Url }
-            }
-            # Taxonomy (Verificação por nome para evitar erro de assembly)
-            elseif ($val.GetType().Name -like "*TaxonomyFieldValue*") {
-                try { $o[$col.Title] = $val.Label } catch { $o[$col.Title] = $val.ToString() }
-            }
-            # Arrays (Multi-choice/User)
-            elseif ($val -is [System.Collections.IEnumerable]) {
-                $parts = @()
-                foreach ($sub in $val) {
-                    if ($sub -is [Microsoft.SharePoint.Client.FieldLookupValue]) { $parts += $sub.LookupValue }
-                    elseif ($sub -is [Microsoft.SharePoint.Client.FieldUserValue]) { $parts += $sub.LookupValue }
-                    elseif ($sub.GetType().Name -like "*TaxonomyFieldValue*") { try { $parts += $sub.Label } catch { $parts += $sub.ToString() } }
-                    else { $parts += $sub.ToString() }
-                }
-                $o[$col.Title] = $parts -join "; "
+
+            # Lógica In-Line (Remove overhead de função)
+            if ($null -eq $val) {
+                $o[$col.Title] = ""
             }
             else {
-                $o[$col.Title] = $val.ToString()
+                # Verificações de tipo otimizadas
+                if ($val -is [Microsoft.SharePoint.Client.FieldLookupValue]) {
+                    $o[$col.Title] = $val.LookupValue
+                }
+                elseif ($val -is [Microsoft.SharePoint.Client.FieldUserValue]) {
+                    $o[$col.Title] = $val.LookupValue
+                }
+                elseif ($val -is [string]) {
+                    $o[$col.Title] = $val
+                }
+                elseif ($val -is [DateTime]) {
+                    $o[$col.Title] = $val.ToString("yyyy-MM-dd HH:mm")
+                }
+                elseif ($val -is [bool]) {
+                    $o[$col.Title] = if ($val) { "Sim" } else { "Não" }
+                }
+                elseif ($val -is [Microsoft.SharePoint.Client.FieldUrlValue]) {
+                    $o[$col.Title] = if ($val.Description) { $val.Description } else { $val.Url }
+                }
+                # Taxonomy (Verificação por nome para evitar erro de assembly)
+                elseif ($val.GetType().Name -like "*TaxonomyFieldValue*") {
+                    try { $o[$col.Title] = $val.Label } catch { $o[$col.Title] = $val.ToString() }
+                }
+                # Arrays (Multi-choice/User)
+                elseif ($val -is [System.Collections.IEnumerable]) {
+                    $parts = @()
+                    foreach ($sub in $val) {
+                        if ($sub -is [Microsoft.SharePoint.Client.FieldLookupValue]) { $parts += $sub.LookupValue }
+                        elseif ($sub -is [Microsoft.SharePoint.Client.FieldUserValue]) { $parts += $sub.LookupValue }
+                        elseif ($sub.GetType().Name -like "*TaxonomyFieldValue*") { try { $parts += $sub.Label } catch { $parts += $sub.ToString() } }
+                        else { $parts += $sub.ToString() }
+                    }
+                    $o[$col.Title] = $parts -join "; "
+                }
+                else {
+                    $o[$col.Title] = $val.ToString()
+                }
             }
         }
+        $dataList.Add([pscustomobject]$o)
     }
-    $dataList.Add([pscustomobject]$o)
 }
 
+if ($deltaMode) {
+    Add-Rows $items $items.Count
+}
+elseif ($StreamPath) {
+    # Uma página por vez: converte e acrescenta ao NDJSON antes de pedir a próxima
+    $total = (Get-PnPList -Identity $listGuid -Connection $conn).ItemCount
+    $utf8 = New-Object System.Text.UTF8Encoding $false
+    [System.IO.File]::WriteAllText($StreamPath, "", $utf8)
+    Write-Host "Baixando itens (streaming em $StreamPath) ..." -ForegroundColor Cyan
+    Get-PnPListItem -List $listGuid -Connection $conn -Fields $fieldsToLoad -PageSize 2000 -ScriptBlock {
+        param($page)
+        $start = $dataList.Count
+        Add-Rows $page $total
+        $lines = for ($i = $start; $i -lt $dataList.Count; $i++) { ConvertTo-Json -InputObject $dataList[$i] -Compress }
+        [System.IO.File]::AppendAllLines($StreamPath, [string[]]@($lines), $utf8)
+        Send-Progress "Baixando itens" $dataList.Count $total
+    } | Out-Null
+    $items = $dataList
+}
+else {
+    Write-Host "Baixando itens ..." -ForegroundColor Cyan
+    $items = Get-PnPListItem -List $listGuid -Connection $conn -Fields $fieldsToLoad
+    Write-Host "Processando $($items.Count) registros..." -ForegroundColor Cyan
+    Add-Rows $items $items.Count
+}
+
+# ==== EXPORT DELTA (JSON) ====
+if ($deltaMode) {
+    $payload = @{ ids = $allIds; items = @($dataList) }
+    ConvertTo-Json -InputObject $payload -Depth 4 -Compress | Out-File -FilePath $DeltaPath -Encoding utf8
+    Write-Host "Delta gerado em: $DeltaPath" -ForegroundColor Green
+    exit 0
+}
+
+Send-Progress "Processando registros" $items.Count $items.Count
+
 # ==== EXPORT TO EXCEL ====
 if (-not (Get-Module -ListAvailable -Name ImportExcel)) {
     Write-Host "ImportExcel module not found. Installing..." -ForegroundColor Yellow
@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+STREAM_POLL_SECONDS = 0.25  # Intervalo entre leituras do arquivo enquanto o exportador escreve
+SAMPLE_ROWS = 100  # Linhas olhadas antes de tentar converter uma coluna para número
+
+
+def _numeric(series):
+    """Converte para número uma coluna de texto em que todos os valores não vazios são números.
+
+    O exportador grava tudo como texto; o Export-Excel faz a mesma conversão ao
+    gerar a planilha, então os tipos ficam iguais aos da leitura do Excel. Só
+    os valores distintos são convertidos; colunas de texto (a maioria) saem
+    logo pelo primeiro valor preenchido.
+    """
+    import numpy as np
+
+    first = next((value for value in series.iloc[:SAMPLE_ROWS] if isinstance(value, str) and value), None)
+    if first is not None and pd.isna(pd.to_numeric(first, errors="coerce")):
+        return series
+    codes, uniques = pd.factorize(series.mask(series == ""))
+    if not len(uniques):
+        return series
+    numbers = pd.to_numeric(uniques, errors="coerce")
+    if pd.isna(numbers).any():
+        return series
+    values = np.asarray(numbers)
+    if (codes < 0).any():
+        # Células vazias: NaN, como na leitura do Excel
+        return pd.Series(np.where(codes < 0, np.nan, values[codes]), index=series.index)
+    return pd.Series(values[codes], index=series.index)
+
+
+def parse_lines(lines):
+    """DataFrame de linhas NDJSON ({coluna: valor} por linha), como o exportador gravou (texto)."""
+    return pd.DataFrame([json.loads(line) for line in lines])
+
+
+def convert_numbers(frame):
+    """Colunas de texto só com números viram numéricas (feito sobre todas as linhas juntas:
+    uma página sem valores em uma coluna não decide o tipo dela)."""
+    frame = frame.copy(deep=False)
+    for col in frame.columns:
+        if not pd.api.types.is_numeric_dtype(frame[col].dtype):
+            frame[col] = _numeric(frame[col])
+    return frame
+
+
+class StreamTail:
+    """Lê as linhas completas acrescentadas ao arquivo desde a última leitura.
+
+    O exportador acrescenta uma página de itens por vez; uma linha ainda sem o
+    "\\n" final fica para a próxima leitura. Arquivo ainda inexistente = nada novo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self._partial = b""
+
+    def read(self):
+        """DataFrame com as linhas novas, ou None se não há nenhuma linha completa."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        if not data:
+            return None
+        self.offset += len(data)
+        data = self._partial + data
+        complete, _, self._partial = data.rpartition(b"\n")
+        lines = [line for line in complete.decode("utf-8-sig").splitlines() if line.strip()]
+        return parse_lines(lines) if lines else None
+
+
+class StreamIngest:
+    """Thread que acompanha o arquivo do export em streaming e entrega cada bloco a on_chunk.
+
+    Cada leitura junta as linhas que chegaram desde a anterior. on_poll, se
+    informado, é chamado após cada leitura (com ou sem linhas novas), para quem
+    agrupa os blocos e processa em intervalos próprios. stop() encerra a
+    thread e lê o que ainda faltar.
+    """
+
+    def __init__(self, path, on_chunk, interval=STREAM_POLL_SECONDS, on_poll=None):
+        self.tail = StreamTail(path)
+        self.on_chunk = on_chunk
+        self.on_poll = on_poll
+        self.interval = interval
+        self.rows = 0
+        self.chunks = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self._read():
+                return
+
+    def _read(self, poll=True):
+        try:
+            frame = self.tail.read()
+            if frame is not None:
+                self.rows += len(frame)
+                self.chunks += 1
+                self.on_chunk(frame)
+            if poll and self.on_poll:
+                self.on_poll()
+            return True
+        except Exception as e:
+            self.error = e
+            return False
+
+    def stop(self, drain=True):
+        """Para a thread; com drain, lê as linhas restantes. Relança o erro da leitura, se houve."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if drain and self.error is None:
+            self._read(poll=False)
+        if drain and self.error is not None:
+            raise self.error
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+
+def _text(value):
+    # Ausentes (NaN/<NA>) entram no índice como "", como as células vazias do Excel
+    return "" if pd.isna(value) else str(value)
+
+
+def _encode(series):
+    """Códigos int32 e categorias (texto, ordenadas) de uma coluna."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Coluna categórica: reaproveita os códigos, só as categorias viram texto
+        labels = [str(c) for c in series.cat.categories] + [""]  # -1 (ausente) -> ""
+        categories = sorted(set(labels))
+        lookup = {value: code for code, value in enumerate(categories)}
+        remap = np.array([lookup[label] for label in labels], dtype=np.int32)
+        return remap[series.cat.codes.to_numpy()], categories
+
+    text = series.astype(object).where(series.notna(), "").astype(str)
+    codes, categories = pd.factorize(text, sort=True)
+    return codes.astype(np.int32), [str(c) for c in categories]
+
+
+class FilterIndex:
+    """Índice categórico para os filtros em cascata.
+
+    Construído uma vez por carga: para cada coluna de filtro guarda os códigos
+    categóricos de cada linha e, para cada valor, o array de posições das linhas
+    que o contêm. Filtrar vira interseção de posições e as opções dos combos
+    vêm da contagem de códigos — sem copiar o DataFrame nem converter strings.
+    """
+
+    def __init__(self, df, columns):
+        self.row_count = len(df)
+        self._codes = {}
+        self._categories = {}
+        self._lookup = {}
+        self._positions = {}
+
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, categories = _encode(df[col])
+            self._set_column(col, codes, categories)
+
+    def _set_column(self, col, codes, categories):
+        # Posições agrupadas por código (ordem estável = ordem original das linhas)
+        order = np.argsort(codes, kind="stable").astype(np.int64)
+        counts = np.bincount(codes, minlength=len(categories))
+        bounds = np.cumsum(counts)[:-1]
+
+        self._codes[col] = codes
+        self._categories[col] = categories
+        self._lookup[col] = {value: code for code, value in enumerate(categories)}
+        self._positions[col] = np.split(order, bounds) if len(categories) else []
+
+    def updated(self, df, kept, changed):
+        """Retorna um novo índice para df sem reprocessar as linhas que não mudaram.
+
+        df deve conter, nas primeiras len(kept) posições, as linhas kept do
+        DataFrame indexado (na mesma ordem), seguidas das linhas novas; changed
+        são as posições de df cujos valores mudaram ou foram acrescentadas. Só
+        essas linhas passam por conversão para texto.
+        """
+        index = FilterIndex.__new__(FilterIndex)
+        index.row_count = len(df)
+        index._codes, index._categories, index._lookup, index._positions = {}, {}, {}, {}
+
+        for col, old_codes in self._codes.items():
+            codes = np.zeros(len(df), dtype=np.int32)
+            codes[:len(kept)] = old_codes[kept]
+            categories, lookup = self._categories[col], self._lookup[col]
+
+            values = [_text(v) for v in df[col].iloc[changed]]
+            extra = set(values) - lookup.keys()
+            if extra:
+                # Valores novos: reordena as categorias e remapeia os códigos existentes
+                merged = sorted(categories + list(extra))
+                new_lookup = {value: code for code, value in enumerate(merged)}
+                remap = np.array([new_lookup[c] for c in categories], dtype=np.int32)
+                codes[:len(kept)] = remap[codes[:len(kept)]] if len(categories) else 0
+                categories, lookup = merged, new_lookup
+
+            codes[changed] = [lookup[v] for v in values]
+            index._set_column(col, codes, categories)
+        return index
+
+    def __contains__(self, col):
+        return col in self._codes
+
+    def filter(self, selections):
+        """Retorna as posições (ordenadas) das linhas que atendem a todas as seleções.
+
+        selections: dict {coluna: valor}. Valores vazios são ignorados.
+        """
+        wanted = []
+        for col, value in selections.items():
+            if not value or col not in self._codes:
+                continue
+            code = self._lookup[col].get(value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            wanted.append((col, code))
+
+        if not wanted:
+            return np.arange(self.row_count, dtype=np.int64)
+
+        # Começa pelo menor conjunto e refina pelos códigos das demais colunas
+        wanted.sort(key=lambda item: len(self._positions[item[0]][item[1]]))
+        col, code = wanted[0]
+        positions = self._positions[col][code]
+        for col, code in wanted[1:]:
+            positions = positions[self._codes[col][positions] == code]
+        return positions
+
+    def options(self, col, positions=None):
+        """Valores distintos (ordenados) da coluna dentro das posições informadas."""
+        if col not in self._codes:
+            return []
+        categories = self._categories[col]
+        codes = self._codes[col] if positions is None else self._codes[col][positions]
+        # Conta os códigos (categorias sem linhas, ex.: após um delta, não aparecem)
+        counts = np.bincount(codes, minlength=len(categories))
+        return [categories[code] for code in np.flatnonzero(counts)]
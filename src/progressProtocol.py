@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from collections import deque
+
+# Protocolo de progresso dos scripts PowerShell: uma linha JSON por atualização
+#   {"type": "progress", "phase": "Baixando itens", "done": 120, "total": 4000, "bytes": 0}
+# Qualquer outra linha é tratada como log.
+PROGRESS_TYPE = "progress"
+LOG_SIZE = 500  # Linhas de log mantidas (as mais antigas são descartadas)
+
+
+def parse_line(line):
+    """Retorna o dict de progresso se a linha seguir o protocolo, senão None."""
+    if not line.startswith("{"):
+        return None
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("type") == PROGRESS_TYPE:
+        return data
+    return None
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressTracker:
+    """Agrega a saída de um processo para a interface.
+
+    feed() é chamado pela thread que lê o stdout (linha a linha); poll() pela
+    thread do Tk em intervalo fixo e devolve apenas o estado mais recente — as
+    atualizações intermediárias são descartadas, então scripts "falantes" não
+    inundam a fila de eventos. Linhas fora do protocolo vão para um log limitado.
+    """
+
+    def __init__(self, log_size=LOG_SIZE):
+        self.log = deque(maxlen=log_size)
+        self._lock = threading.Lock()
+        self._phase = ""
+        self._done = 0
+        self._total = 0
+        self._bytes = 0
+        self._message = ""
+        self._phase_started = time.monotonic()
+        self._phase_done = 0
+        self._phase_bytes = 0
+        self._version = 0
+        self._polled_version = 0
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return
+        progress = parse_line(line)
+        with self._lock:
+            self._version += 1
+            if progress is None:
+                self.log.append(line)
+                self._message = line
+                return
+            phase = str(progress.get("phase", self._phase))
+            done = int(progress.get("done", 0) or 0)
+            if phase != self._phase or done < self._done:
+                # Nova fase: a taxa e o ETA recomeçam
+                self._phase_started = time.monotonic()
+                self._phase_done = done
+                self._phase_bytes = int(progress.get("bytes", 0) or 0)
+            self._phase = phase
+            self._done = done
+            self._total = int(progress.get("total", 0) or 0)
+            self._bytes = int(progress.get("bytes", 0) or 0)
+            if progress.get("message"):
+                self._message = str(progress["message"])
+
+    def snapshot(self):
+        """Estado atual: phase, done, total, bytes, message, rate, bytes_rate, eta."""
+        with self._lock:
+            elapsed = time.monotonic() - self._phase_started
+            rate = (self._done - self._phase_done) / elapsed if elapsed > 0 else 0.0
+            bytes_rate = (self._bytes - self._phase_bytes) / elapsed if elapsed > 0 else 0.0
+            remaining = self._total - self._done
+            eta = remaining / rate if rate > 0 and self._total else None
+            return {
+                "phase": self._phase,
+                "done": self._done,
+                "total": self._total,
+                "bytes": self._bytes,
+                "message": self._message,
+                "rate": rate,
+                "bytes_rate": bytes_rate,
+                "eta": eta,
+            }
+
+    def poll(self):
+        """Snapshot se houve alguma linha nova desde a última chamada, senão None."""
+        with self._lock:
+            if self._version == self._polled_version:
+                return None
+            self._polled_version = self._version
+        return self.snapshot()
+
+    def tail(self, lines=20):
+        with self._lock:
+            return "\n".join(list(self.log)[-lines:])
@@ -0,0 +1,57 @@
+#Requires -Modules PnP.PowerShell
+
+# Worker persistente: mantém o PnP.PowerShell carregado e a conexão aberta e
+# executa os scripts do projeto sob demanda, evitando o custo de abrir um
+# powershell.exe (e autenticar) a cada operação.
+#
+# Protocolo (uma linha JSON por mensagem):
+#   stdin : {"type": "run", "id": 1, "script": "C:\...\exportAllColumns.ps1", "params": {"Since": "..."}}
+#           {"type": "exit"}
+#   stdout: {"type": "ready"} quando a conexão está pronta; depois, para cada
+#           comando, a saída do script (logs e linhas de progresso) seguida de
+#           {"type": "done", "id": 1, "exit_code": 0, "error": ""}
+
+param(
+    [string]$SiteUrl = "https://vestas.sharepoint.com/sites/CC-Subcontractors-BR",
+    [string]$ClientId = $env:DOCSDOWNLOADER_CLIENT_ID,
+    [string]$Tenant = $env:DOCSDOWNLOADER_TENANT,
+    [string]$Thumbprint = $env:DOCSDOWNLOADER_THUMBPRINT
+)
+
+Import-Module PnP.PowerShell
+. (Join-Path $PSScriptRoot "connectSharePoint.ps1")
+
+# ==== CONEXÃO (uma vez por worker) ====
+$global:PnPWorkerConnection = Connect-DocsSharePoint -Url $SiteUrl -ClientId $ClientId -Tenant $Tenant -Thumbprint $Thumbprint
+
+[Console]::Out.WriteLine('{"type":"ready"}')
+
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }  # stdin fechado: a aplicação encerrou
+    if ([string]::IsNullOrWhiteSpace($line)) { continue }
+
+    $cmd = $line | ConvertFrom-Json
+    if ($cmd.type -eq "exit") { break }
+
+    # Converte os parâmetros (objeto JSON) em hashtable para splatting
+    $params = @{}
+    if ($cmd.params) {
+        foreach ($p in $cmd.params.PSObject.Properties) { $params[$p.Name] = $p.Value }
+    }
+
+    $exitCode = 0
+    $err = ""
+    try {
+        $global:LASTEXITCODE = 0
+        & $cmd.script @params | Out-Host
+        if ($LASTEXITCODE) { $exitCode = $LASTEXITCODE }
+    }
+    catch {
+        $exitCode = 1
+        $err = $_.ToString()
+    }
+
+    $done = @{ type = "done"; id = $cmd.id; exit_code = $exitCode; error = $err }
+    [Console]::Out.WriteLine((ConvertTo-Json -InputObject $done -Compress))
+}
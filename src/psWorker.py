@@ -0,0 +1,223 @@
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+from progressProtocol import parse_line
+from telemetry import TELEMETRY
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PS_WORKER_SCRIPT = os.path.join(SRC_DIR, "psWorker.ps1")
+READY_TIMEOUT = 300  # Segundos para o worker conectar (inclui o login no navegador)
+RUN_IDLE_TIMEOUT = 1800  # Segundos sem nenhuma saída durante um comando: worker travado (ex.: janela de login)
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class WorkerTimeout(WorkerCrashed):
+    """O worker parou de responder (sem saída dentro do prazo) e foi encerrado."""
+
+
+# Parâmetros [switch] dos scripts: não recebem valor; todos os outros vêm em pares (nome, valor)
+SWITCH_PARAMS = {"ListOnly"}
+
+
+def args_to_params(args):
+    """Converte ["-Ids", "1,2", "-ListOnly"] em {"Ids": "1,2", "ListOnly": True}.
+
+    Os argumentos são lidos por posição: depois de um nome que não está em
+    SWITCH_PARAMS vem sempre o valor, mesmo que comece com "-".
+    """
+    params = {}
+    i = 0
+    while i < len(args):
+        arg = str(args[i])
+        if not arg.startswith("-"):
+            raise ValueError(f"Argumento fora de posição (esperado -Nome): {arg!r}")
+        name = arg[1:]
+        if name in SWITCH_PARAMS:
+            params[name] = True
+            i += 1
+        elif i + 1 < len(args):
+            params[name] = args[i + 1]
+            i += 2
+        else:
+            raise ValueError(f"Parâmetro sem valor: {arg}")
+    return params
+
+
+def _pump(stream, lines):
+    # Thread de leitura: as esperas usam a fila com prazo, em vez de um readline() bloqueante
+    for line in stream:
+        lines.put(line)
+    lines.put("")
+
+
+def hidden_startupinfo():
+    # Oculta a janela do console no Windows
+    if os.name != "nt":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return startupinfo
+
+
+class PowerShellWorker:
+    """Processo PowerShell de longa duração que executa os scripts do projeto.
+
+    O worker importa o PnP.PowerShell e autentica uma única vez; cada run()
+    envia um comando pelo stdin e lê a saída até a mensagem "done". Se o
+    processo morrer, o próximo run() sobe um novo automaticamente. Se ele não
+    ficar pronto em ready_timeout segundos, ou um comando passar idle_timeout
+    segundos sem nenhuma saída, o processo é encerrado (WorkerCrashed) em vez
+    de prender as operações seguintes. Os tempos (subida do processo, primeira
+    saída e total de cada comando) ficam em self.timings.
+    """
+
+    def __init__(self, command=None, ready_timeout=READY_TIMEOUT, idle_timeout=RUN_IDLE_TIMEOUT):
+        self.command = command or ["powershell.exe", "-NoProfile", "-ExecutionPolicy", "Bypass",
+                                   "-File", PS_WORKER_SCRIPT]
+        self.ready_timeout = ready_timeout
+        self.idle_timeout = idle_timeout
+        self.timings = []
+        self.restarts = 0
+        self._process = None
+        self._lines = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, on_line=None):
+        """Sobe o processo e espera a mensagem "ready". Retorna o tempo de subida (s)."""
+        start = time.perf_counter()
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # Erros do PowerShell entram no log
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            startupinfo=hidden_startupinfo(),
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=_pump, args=(self._process.stdout, self._lines), daemon=True).start()
+        deadline = start + self.ready_timeout
+        while True:
+            line = self._readline(deadline - time.perf_counter())
+            if line is None:
+                self._kill()
+                self._process = None
+                raise WorkerTimeout("Tempo esgotado aguardando a conexão do worker PowerShell")
+            if not line:
+                self._process = None
+                raise WorkerCrashed("O worker PowerShell encerrou durante a inicialização")
+            message = self._message(line)
+            if message and message.get("type") == "ready":
+                break
+            if on_line and line.strip():
+                on_line(line)
+
+        elapsed = time.perf_counter() - start
+        self.timings.append({"event": "spawn", "seconds": elapsed})
+        TELEMETRY.record("powershell.spawn", elapsed, mode="worker")
+        return elapsed
+
+    def run(self, script_path, args=(), on_line=None):
+        """Executa um script no worker. Retorna o exit code; on_line recebe cada linha de saída."""
+        with self._lock:
+            if not self.alive():
+                if self._process is not None:
+                    self.restarts += 1
+                self.start(on_line)
+
+            self._next_id += 1
+            command_id = self._next_id
+            command = {"type": "run", "id": command_id, "script": script_path,
+                       "params": args_to_params(list(args))}
+
+            start = time.perf_counter()
+            first_output = None
+            try:
+                self._process.stdin.write(json.dumps(command) + "\n")
+                self._process.stdin.flush()
+                while True:
+                    line = self._readline(self.idle_timeout)
+                    if line is None:
+                        self._kill()
+                        raise WorkerTimeout(f"O worker PowerShell ficou {self.idle_timeout:.0f} s sem responder "
+                                            "e foi encerrado; ele será reiniciado na próxima operação")
+                    if not line:
+                        raise WorkerCrashed("O worker PowerShell encerrou durante a execução")
+                    if first_output is None:
+                        first_output = time.perf_counter() - start
+                    message = self._message(line)
+                    if message and message.get("type") == "done" and message.get("id") == command_id:
+                        break
+                    if on_line:
+                        on_line(line)
+            except WorkerTimeout:
+                raise
+            except (OSError, WorkerCrashed):
+                self._kill()
+                raise WorkerCrashed("O worker PowerShell encerrou durante a execução; "
+                                    "ele será reiniciado na próxima operação")
+
+            script = os.path.basename(script_path)
+            elapsed = time.perf_counter() - start
+            self.timings.append({"event": "run", "script": script, "first_output": first_output,
+                                 "seconds": elapsed})
+            if first_output is not None:
+                TELEMETRY.record("powershell.first_output", first_output, mode="worker", script=script)
+            TELEMETRY.record("powershell.total", elapsed, mode="worker", script=script)
+            if message.get("error") and on_line:
+                on_line(message["error"])
+            return int(message.get("exit_code") or 0)
+
+    def stop(self):
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.write(json.dumps({"type": "exit"}) + "\n")
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self._kill()
+        self._process = None
+
+    def _readline(self, timeout):
+        """Próxima linha da saída ("" no fim), ou None se nada chegou em timeout segundos."""
+        try:
+            return self._lines.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return None
+
+    def _kill(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        # Mantém a referência para contar a reinicialização no próximo run()
+        if self._process is not None:
+            self._process.wait()
+
+    @staticmethod
+    def _message(line):
+        line = line.strip()
+        if not line.startswith("{"):
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+        # Linhas de progresso seguem para o ProgressTracker
+        if not isinstance(message, dict) or parse_line(line) is not None:
+            return None
+        return message
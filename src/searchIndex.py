@@ -0,0 +1,160 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3           # Tamanho dos n-gramas do índice (bytes UTF-8)
+SEPARATOR = b"\x00"  # Separa os valores no texto indexado (nenhum n-grama o atravessa)
+
+
+def normalize(text):
+    """Minúsculas e sem acentos ("Análise" -> "analise"), para busca e índice."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def normalize_all(values):
+    """normalize() para muitos valores; só os que têm acento passam pelo unicodedata."""
+    series = pd.Series(values, dtype=object)
+    result = series.str.lower()
+    accented = ~series.str.isascii().to_numpy(dtype=bool)
+    if accented.any():
+        result[accented] = series[accented].map(normalize)
+    return result
+
+
+class SearchIndex:
+    """Índice invertido de trigramas para a busca livre em todas as colunas.
+
+    Construído uma vez por carga. O índice é feito sobre os valores distintos
+    (normalizados) de todas as colunas, não sobre as linhas: cada trigrama
+    aponta para os valores que o contêm e cada coluna guarda o código do valor
+    de cada linha. Buscar um termo é interseção das listas dos seus trigramas
+    (mais uma conferência de substring para termos longos) seguida de um
+    lookup por coluna — sem percorrer as linhas em Python.
+
+    Termos com menos de NGRAM caracteres são ignorados; os termos da busca são
+    combinados com E (cada um pode estar em qualquer coluna).
+    """
+
+    def __init__(self, df, columns=None):
+        self.row_count = len(df)
+        self._columns = []  # (códigos por linha, id global de cada valor da coluna)
+
+        labels, owners = [], []
+        for col in (columns if columns is not None else df.columns):
+            codes, values = self._encode(df[col])
+            owners.append((codes, len(labels), len(values)))
+            labels.extend(values)
+
+        # Valores repetidos entre colunas (ex.: datas) entram uma vez só no índice;
+        # a normalização roda só sobre os distintos e pode juntar mais alguns ("Não"/"nao")
+        raw_ids, raw_values = pd.factorize(pd.Series(labels, dtype=object), sort=False)
+        normalized_ids, self._values = pd.factorize(normalize_all(raw_values), sort=False)
+        self._values = self._values.tolist()
+        label_ids = normalized_ids[raw_ids]
+        for codes, start, count in owners:
+            # -1 no final: o código -1 (vazio) aponta para uma posição que nunca é encontrada
+            self._columns.append((codes, np.append(label_ids[start:start + count], -1).astype(np.int64)))
+
+        self._build_postings()
+
+    @staticmethod
+    def _encode(series):
+        """Códigos por linha (-1 = vazio) e os valores distintos da coluna como texto."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        return codes.astype(np.int32), pd.Index(uniques).astype(str).tolist()
+
+    def _build_postings(self):
+        encoded = [v.encode("utf-8") for v in self._values]
+        data = np.frombuffer(SEPARATOR.join(encoded), dtype=np.uint8)
+        lengths = np.fromiter((len(e) + 1 for e in encoded), dtype=np.int64, count=len(encoded))
+        owner = np.repeat(np.arange(len(encoded), dtype=np.uint64), lengths)[:len(data)]
+
+        if len(data) < NGRAM:
+            self._ranges, self._owners = {}, np.empty(0, dtype=np.int64)
+            return
+
+        # Trigrama como inteiro de 24 bits; descarta os que atravessam o separador
+        a, b, c = data[:-2].astype(np.uint32), data[1:-1].astype(np.uint32), data[2:].astype(np.uint32)
+        valid = (a != 0) & (b != 0) & (c != 0)
+        grams = ((a << 16) | (b << 8) | c)[valid]
+
+        # Ordena por (trigrama, valor) e remove repetições: cada trigrama vira uma faixa contínua
+        keys = (grams.astype(np.uint64) << np.uint64(32)) | owner[:-2][valid]
+        keys.sort()
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        grams = (keys >> np.uint64(32)).astype(np.int64)
+        self._owners = (keys & np.uint64(0xFFFFFFFF)).astype(np.int64)
+
+        # Faixa [início, fim) de cada trigrama em self._owners
+        starts = np.flatnonzero(np.concatenate(([True], grams[1:] != grams[:-1])))
+        ends = np.append(starts[1:], len(grams))
+        self._ranges = dict(zip(grams[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def _matching_values(self, term):
+        """Ids dos valores distintos que contêm o termo (já normalizado)."""
+        raw = term.encode("utf-8")
+        grams = sorted({(raw[i] << 16) | (raw[i + 1] << 8) | raw[i + 2] for i in range(len(raw) - NGRAM + 1)})
+
+        postings = []
+        for gram in grams:
+            if gram not in self._ranges:
+                return np.empty(0, dtype=np.int64)
+            lo, hi = self._ranges[gram]
+            postings.append(self._owners[lo:hi])
+
+        # Interseção começando pela menor lista
+        postings.sort(key=len)
+        matches = postings[0]
+        for other in postings[1:]:
+            matches = np.intersect1d(matches, other, assume_unique=True)
+            if not len(matches):
+                break
+
+        # Todos os trigramas presentes não garantem a sequência: confere a substring
+        if len(raw) > NGRAM:
+            matches = np.array([i for i in matches if term in self._values[i]], dtype=np.int64)
+        return matches
+
+    @staticmethod
+    def terms(query):
+        return [t for t in normalize(query).split() if len(t.encode("utf-8")) >= NGRAM]
+
+    def mask(self, query):
+        """Máscara booleana das linhas que contêm todos os termos, ou None se não há termos."""
+        terms = self.terms(query)
+        if not terms:
+            return None
+
+        result = np.ones(self.row_count, dtype=bool)
+        for term in terms:
+            hit_values = np.zeros(len(self._values) + 1, dtype=bool)  # Última posição: vazio
+            hit_values[self._matching_values(term)] = True
+            rows = np.zeros(self.row_count, dtype=bool)
+            for codes, value_ids in self._columns:
+                column_hits = hit_values[value_ids]
+                if column_hits.any():  # Em geral o termo só aparece em uma ou duas colunas
+                    rows |= column_hits[codes]
+            result &= rows
+            if not result.any():
+                break
+        return result
+
+    def search(self, query, positions=None):
+        """Posições (ordenadas) das linhas que atendem à busca.
+
+        positions: restringe o resultado (ex.: posições dos filtros em cascata).
+        Busca sem termos válidos não filtra nada.
+        """
+        mask = self.mask(query)
+        if positions is None:
+            positions = np.arange(self.row_count, dtype=np.int64)
+        if mask is None:
+            return positions
+        return positions[mask[positions]]
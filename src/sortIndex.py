@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from searchIndex import normalize_all
+
+FIXED_WIDTH_MAX = 64  # Até este tamanho o texto é ordenado como array numpy de largura fixa
+
+
+def _dense_ranks(series):
+    """Posto de cada linha na ordem crescente da coluna (iguais têm o mesmo posto).
+
+    Texto é comparado sem diferenciar maiúsculas nem acentos; vazios recebem o
+    maior posto (vão para o final). Retorna (postos int32, posto dos vazios).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), pd.Index(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Index(uniques)
+
+    if pd.api.types.is_object_dtype(uniques.dtype) or pd.api.types.is_string_dtype(uniques.dtype):
+        keys = normalize_all(uniques.astype(str).tolist()).tolist()
+        if keys and max(map(len, keys)) <= FIXED_WIDTH_MAX:
+            # Texto curto: array de largura fixa, comparado em C (bem mais rápido que objetos)
+            order = np.array(keys, dtype=str).argsort(kind="stable")
+        else:
+            order = pd.Index(keys, dtype=object).argsort()
+    else:
+        order = uniques.argsort()
+
+    missing = len(uniques)
+    rank_of_value = np.empty(missing + 1, dtype=np.int32)
+    rank_of_value[order] = np.arange(missing, dtype=np.int32)
+    rank_of_value[missing] = missing  # Código -1 (vazio) aponta para a última posição
+    return rank_of_value[codes], missing
+
+
+class SortIndex:
+    """Ordenação da tabela por permutações pré-calculadas.
+
+    Na primeira vez que uma coluna é ordenada calcula-se o posto de cada linha
+    e a permutação de todas as linhas nessa ordem; ambos ficam guardados. Com
+    uma coluna, ordenar a visão filtrada é percorrer a permutação mantendo só
+    as posições do filtro (sem sort e sem copiar o DataFrame); com várias
+    colunas (Shift+clique), um lexsort dos postos inteiros das posições.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._ranks = {}   # coluna -> (postos, posto dos vazios)
+        self._orders = {}  # (coluna, crescente) -> permutação de todas as linhas
+
+    def __contains__(self, col):
+        return col in self._df.columns
+
+    def ranks(self, col, ascending=True):
+        if col not in self._ranks:
+            self._ranks[col] = _dense_ranks(self._df[col])
+        ranks, missing = self._ranks[col]
+        if ascending:
+            return ranks
+        # Decrescente, mas com os vazios ainda no final
+        return np.where(ranks == missing, missing, missing - 1 - ranks)
+
+    def order(self, col, ascending=True):
+        key = (col, ascending)
+        if key not in self._orders:
+            self._orders[key] = np.argsort(self.ranks(col, ascending), kind="stable")
+        return self._orders[key]
+
+    def sort(self, positions, keys):
+        """Ordena as posições por keys: lista de (coluna, crescente), da principal para a última.
+
+        Empates mantêm a ordem original das linhas.
+        """
+        keys = [(col, ascending) for col, ascending in keys if col in self]
+        if not keys:
+            return positions
+
+        if len(keys) == 1:
+            order = self.order(*keys[0])
+            if len(positions) == len(self._df):
+                return order
+            wanted = np.zeros(len(self._df), dtype=bool)
+            wanted[positions] = True
+            return order[wanted[order]]
+
+        # Combina os postos em um único inteiro (base mista) quando cabe em int64:
+        # um argsort estável é bem mais rápido que o lexsort de várias chaves
+        ranks = [self.ranks(col, ascending)[positions] for col, ascending in keys]
+        sizes = [self._ranks[col][1] + 1 for col, _ in keys]
+        if np.prod([float(size) for size in sizes]) < 2 ** 62:
+            combined = np.zeros(len(positions), dtype=np.int64)
+            for rank, size in zip(ranks, sizes):
+                combined = combined * size + rank
+            return positions[np.argsort(combined, kind="stable")]
+
+        # lexsort usa a última chave como principal; posições garantem a estabilidade
+        return positions[np.lexsort([positions] + ranks[::-1])]
@@ -0,0 +1,123 @@
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+SYNC_CONCURRENCY = 4   # Exportações simultâneas
+MAX_ATTEMPTS = 3       # Tentativas por fonte antes de desistir
+BACKOFF_SECONDS = 5.0  # Espera antes da 2ª tentativa; dobra a cada nova falha
+BACKOFF_MAX = 60.0
+
+# Estados de um job (exibidos no painel de sincronização)
+PENDING = "aguardando"
+RUNNING = "executando"
+RETRYING = "nova tentativa"
+DONE = "concluído"
+FAILED = "erro"
+
+
+class SyncJob:
+    """Sincronização de uma fonte: a tarefa a executar e o seu estado.
+
+    Os atributos são escritos pela thread do agendador e lidos (sem lock) pelo
+    painel da interface, que só os exibe.
+    """
+
+    def __init__(self, name, task):
+        self.name = name
+        self.task = task  # Função sem argumentos; o retorno fica em result
+        self.status = PENDING
+        self.attempts = 0
+        self.error = None
+        self.result = None
+        self.started = None
+        self.finished = None
+        self.retry_at = None
+
+    @property
+    def seconds(self):
+        """Duração desde a primeira tentativa (inclui as esperas entre tentativas)."""
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def ok(self):
+        return self.status == DONE
+
+    def summary(self):
+        seconds = self.seconds
+        return {"ok": self.ok, "status": self.status, "attempts": self.attempts, "error": self.error,
+                "seconds": None if seconds is None else round(seconds, 3)}
+
+
+class SyncScheduler:
+    """Executa os jobs de sincronização em paralelo, com limite de concorrência.
+
+    Um job que falha volta para a fila depois de uma espera exponencial (com
+    variação aleatória de ±20%), sem ocupar uma vaga enquanto espera; as demais
+    fontes seguem normalmente. Depois de max_attempts falhas o job fica com
+    status FAILED e o erro da última tentativa.
+    """
+
+    def __init__(self, concurrency=SYNC_CONCURRENCY, max_attempts=MAX_ATTEMPTS,
+                 backoff=BACKOFF_SECONDS, backoff_max=BACKOFF_MAX):
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    def delay(self, attempts):
+        """Espera antes da próxima tentativa, após `attempts` falhas."""
+        base = min(self.backoff_max, self.backoff * 2 ** (attempts - 1))
+        return base * random.uniform(0.8, 1.2)
+
+    def run(self, jobs, on_update=None):
+        """Executa os jobs (bloqueia até todos terminarem). on_update(job) a cada mudança de estado."""
+        queue = list(jobs)
+        waiting = []   # Jobs aguardando o fim do backoff
+        running = {}   # future -> job
+
+        def notify(job):
+            if on_update:
+                on_update(job)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while queue or waiting or running:
+                now = time.monotonic()
+                for job in [job for job in waiting if job.retry_at <= now]:
+                    waiting.remove(job)
+                    queue.append(job)
+
+                while queue and len(running) < self.concurrency:
+                    job = queue.pop(0)
+                    job.status = RUNNING
+                    job.attempts += 1
+                    if job.started is None:
+                        job.started = now
+                    running[pool.submit(job.task)] = job
+                    notify(job)
+
+                timeout = min(job.retry_at for job in waiting) - now if waiting else None
+                if not running:
+                    time.sleep(max(0.0, timeout))
+                    continue
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        job.result = future.result()
+                        job.error = None
+                        job.status = DONE
+                        job.finished = time.monotonic()
+                    except Exception as e:
+                        job.error = str(e) or type(e).__name__
+                        if job.attempts < self.max_attempts:
+                            job.status = RETRYING
+                            job.retry_at = time.monotonic() + self.delay(job.attempts)
+                            waiting.append(job)
+                        else:
+                            job.status = FAILED
+                            job.finished = time.monotonic()
+                    notify(job)
+        return jobs
@@ -0,0 +1,107 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+CAPACITY = 5000  # Eventos mantidos em memória; os mais antigos são descartados
+
+
+def percentile(values, pct):
+    """Percentil (nearest-rank) de uma sequência de números; 0.0 se vazia."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Telemetry:
+    """Tempos dos caminhos críticos em um buffer circular (memória constante).
+
+    Cada evento é {"name", "ts" (epoch), "seconds", ...campos extras}. Pode ser
+    registrado de qualquer thread. Com export() os eventos também são gravados
+    em um arquivo JSONL (um por linha), para coletar traces das máquinas em
+    campo; a gravação é opcional e fica desligada por padrão. Um erro de
+    gravação (disco cheio, arquivo bloqueado) desliga a exportação e fica em
+    export_error; o buffer em memória continua e quem registrou não vê o erro.
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.events = deque(maxlen=capacity)
+        self.export_path = None
+        self.export_error = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, **fields):
+        event = {"name": name, "ts": round(time.time(), 3), "seconds": round(seconds, 6)}
+        event.update(fields)
+        with self._lock:
+            self.events.append(event)
+            if self._file is not None:
+                self._write(event)
+        return event
+
+    def timed(self, name):
+        """Decorador: registra a duração de cada chamada da função com o nome informado."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """{nome: {count, p50, p95, max, last}} (segundos), na ordem do primeiro evento de cada nome."""
+        with self._lock:
+            events = list(self.events)
+        by_name = {}
+        for event in events:
+            by_name.setdefault(event["name"], []).append(event["seconds"])
+        return {name: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95),
+                       "max": max(values), "last": values[-1]}
+                for name, values in by_name.items()}
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    # ==== Exportação (JSONL) ====
+    def export(self, path):
+        """Passa a acrescentar os eventos em path; os que já estão no buffer são gravados primeiro."""
+        with self._lock:
+            self._close()
+            self._file = open(path, "a", encoding="utf-8")
+            self.export_path = path
+            self.export_error = None
+            for event in self.events:
+                self._write(event)
+
+    def stop_export(self):
+        with self._lock:
+            self._close()
+
+    def _write(self, event):
+        try:
+            self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except OSError as e:
+            # A telemetria envolve filtros e downloads: uma falha no arquivo não pode derrubá-los
+            self.export_error = f"{self.export_path}: {e}"
+            self._close()
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self.export_path = None
+
+
+TELEMETRY = Telemetry()  # Instância única, compartilhada pela interface, pelo núcleo e pela CLI
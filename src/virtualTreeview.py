@@ -0,0 +1,384 @@
+import tkinter as tk
+from collections import Counter
+from tkinter import ttk
+
+KEY_SEPARATOR = "|"
+
+
+def display_rows(frame):
+    """Linhas como listas para a tabela, com ausentes (NaN/<NA>) exibidos como ""."""
+    return frame.astype(object).where(frame.notna(), "").values.tolist()
+
+
+def row_keys(df, columns):
+    """Chave estável (texto) de cada linha: valores das colunas unidos por KEY_SEPARATOR.
+
+    Colunas ausentes são ignoradas; sem colunas, ou com chaves repetidas, a
+    chave é a posição da linha no DataFrame.
+    """
+    import numpy as np
+
+    columns = [col for col in columns if col in df.columns]
+    if columns:
+        keys = df[columns[0]].astype(str)
+        for col in columns[1:]:
+            keys = keys + KEY_SEPARATOR + df[col].astype(str)
+        keys = keys.to_numpy(dtype=object)
+        if len(set(keys)) == len(keys):
+            return keys
+    return np.arange(len(df)).astype(str).astype(object)
+
+
+def diff_window(attached, wanted, detached=()):
+    """Operações que levam os itens da janela de `attached` para `wanted` (listas de iids).
+
+    Retorna [(operação, iid, índice)], com operação em "detach" (sai da janela),
+    "move" (item existente, inclusive desanexado, vai para o índice) e "insert"
+    (item novo). Itens que já estão na ordem certa não geram operação.
+    """
+    wanted_set = set(wanted)
+    ops = [("detach", iid, None) for iid in attached if iid not in wanted_set]
+    remaining = [iid for iid in attached if iid in wanted_set]
+    remaining_set = set(remaining)
+
+    placed = set()
+    pointer = 0
+    for index, iid in enumerate(wanted):
+        while pointer < len(remaining) and remaining[pointer] in placed:
+            pointer += 1
+        if pointer < len(remaining) and remaining[pointer] == iid:
+            pointer += 1
+        elif iid in remaining_set or iid in detached:
+            ops.append(("move", iid, index))
+        else:
+            ops.append(("insert", iid, index))
+        placed.add(iid)
+    return ops
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview em modo virtual (janela deslizante).
+
+    Apenas as linhas visíveis (mais um pequeno buffer) existem como itens do Tk;
+    o restante fica no DataFrame e é preenchido conforme o usuário rola a tabela.
+    A visão é o DataFrame original mais um array de posições (resultado do
+    filtro), então nenhuma cópia do DataFrame é feita.
+
+    Os iids são chaves estáveis das linhas (key_columns, em geral o ID), de
+    modo que a seleção, o foco e a rolagem sobrevivem a filtros, ordenação e
+    deltas. Ao trocar a visão, a janela é atualizada pela diferença
+    (diff_window): itens que saem são desanexados (e reaproveitados se
+    voltarem), os que mudam de lugar são movidos e só os novos são inseridos.
+    selection(), get_children() e item(iid, "values") respondem por todas as
+    linhas da visão, inclusive as que estão fora da janela.
+    """
+
+    BUFFER = 2          # Linhas extras além da área visível
+    DETACHED_MAX = 500  # Itens desanexados guardados para reaproveitamento
+
+    def __init__(self, master=None, key_columns=(), **kw):
+        self._yscrollcommand = kw.pop("yscrollcommand", None)
+        super().__init__(master, **kw)
+
+        self.key_columns = tuple(key_columns)
+        self.widget_ops = Counter()  # Operações feitas nos itens do Tk (benchmarks)
+
+        self._df = None
+        self._keys = None         # Chave de cada linha do DataFrame
+        self._keys_columns = None  # key_columns usadas para calcular self._keys
+        self._key_positions = None  # Chave -> linha do DataFrame (montado sob demanda)
+        self._positions = None    # Linhas do DataFrame na visão
+        self._view_index = None   # Linha do DataFrame -> posição na visão (-1 = fora)
+        self._detached = set()    # Itens fora da janela mantidos no Tk
+        self._first = 0           # Posição da primeira linha visível
+        self._selected = set()    # Chaves selecionadas (dentro e fora da janela)
+        self._anchor = None       # Chave da âncora para seleção com Shift
+        self._cursor = None       # Chave da linha com foco (navegação por teclado)
+        self._last_count = 0
+
+        self.bind("<<TreeviewSelect>>", self._on_native_select, add="+")
+        self.bind("<Configure>", self._on_configure, add="+")
+        self.bind("<Button-1>", self._on_click, add="+")
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.bind("<Up>", lambda e: self._move_cursor(-1, e))
+        self.bind("<Down>", lambda e: self._move_cursor(1, e))
+        self.bind("<Prior>", lambda e: self._move_cursor(-self._visible_count(), e))
+        self.bind("<Next>", lambda e: self._move_cursor(self._visible_count(), e))
+
+    # ==== API compatível com ttk.Treeview ====
+    def configure(self, cnf=None, **kw):
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def set_data(self, df, positions=None):
+        """Define o DataFrame exibido (opcionalmente restrito às posições).
+
+        Limpa seleção e volta ao topo (ex.: troca das colunas da tabela).
+        """
+        self._clear_items()
+        self._set_frame(df)
+        self._set_view(positions)
+        self._first = 0
+        self._selected = set()
+        self._anchor = None
+        self._cursor = None
+        self._render()
+
+    def update_data(self, df, positions=None):
+        """Troca a visão (filtro, busca, ordenação ou delta) aplicando só a diferença.
+
+        A rolagem acompanha a primeira linha da janela que continua na visão
+        (ou volta ao topo se nenhuma continua); seleção, âncora e foco ficam
+        com as linhas que continuam na visão.
+        """
+        window = list(super().get_children())
+        same_frame = df is self._df
+        old_window = self._positions[self._first:self._first + len(window)] if same_frame else None
+        if not same_frame:
+            # Os valores dos itens existentes podem ter mudado (delta): são recriados
+            self._clear_items()
+            self._set_frame(df)
+        self._set_view(positions)
+
+        # Mesmo DataFrame: as linhas da janela são conhecidas pela posição (sem consultar chaves)
+        if same_frame:
+            indexes = self._view_index[old_window].tolist()
+        else:
+            indexes = [self._index_of(key) for key in window]
+        self._first = 0
+        for offset, index in enumerate(indexes):
+            if index is not None and index >= 0:
+                self._first = max(0, index - offset)
+                break
+
+        if self._selected:
+            self._selected = {key for key in self._selected if self._index_of(key) is not None}
+        if self._anchor is not None and self._index_of(self._anchor) is None:
+            self._anchor = None
+        if self._cursor is not None and self._index_of(self._cursor) is None:
+            self._cursor = None
+        self._render()
+
+    def refresh(self):
+        """Redesenha a janela (ex.: após mudança de zoom/altura da linha)."""
+        self._render()
+
+    def get_children(self, item=None):
+        if item or self._df is None:
+            return ()
+        return tuple(self._keys[self._positions].tolist())
+
+    def selection(self):
+        indexes = sorted(index for index in map(self._index_of, self._selected) if index is not None)
+        return tuple(self._keys[self._positions[indexes]].tolist()) if indexes else ()
+
+    def view_positions(self):
+        """Posições (no DataFrame) das linhas da visão, na ordem exibida."""
+        import numpy as np
+
+        return np.empty(0, dtype=np.int64) if self._df is None else self._positions
+
+    def selected_positions(self):
+        """Posições (no DataFrame) das linhas selecionadas, na ordem exibida."""
+        import numpy as np
+
+        indexes = sorted(index for index in map(self._index_of, self._selected) if index is not None)
+        return self._positions[indexes] if indexes else np.empty(0, dtype=np.int64)
+
+    def item(self, item, option=None, **kw):
+        if option == "values" and not kw and self._df is not None:
+            position = self._position_of(item)
+            return tuple(display_rows(self._df.iloc[position:position + 1])[0])
+        return super().item(item, option, **kw)
+
+    def yview(self, *args):
+        total = self._row_count()
+        if not args:
+            return self._fractions(total)
+
+        if args[0] == "moveto":
+            self._first = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2].startswith("page"):
+                amount *= self._visible_count()
+            self._first += amount
+        self._render()
+
+    # ==== Dados ====
+    def _set_frame(self, df):
+        if df is self._df and self._keys_columns == self.key_columns:
+            return  # Mesmo DataFrame: as chaves continuam valendo
+        self._df = df
+        self._keys = row_keys(df, self.key_columns)
+        self._keys_columns = self.key_columns
+        self._key_positions = None
+
+    def _set_view(self, positions):
+        import numpy as np
+
+        self._positions = np.arange(len(self._df)) if positions is None else positions
+        self._view_index = np.full(len(self._df), -1, dtype=np.int64)
+        self._view_index[self._positions] = np.arange(len(self._positions))
+
+    def _position_of(self, key):
+        """Linha do DataFrame da chave (ou None se a chave não existe)."""
+        if self._key_positions is None:
+            self._key_positions = {key: pos for pos, key in enumerate(self._keys.tolist())}
+        return self._key_positions.get(key)
+
+    def _index_of(self, key):
+        """Posição da chave na visão atual (ou None se está fora)."""
+        position = self._position_of(key)
+        if position is None:
+            return None
+        index = int(self._view_index[position])
+        return index if index >= 0 else None
+
+    # ==== Renderização ====
+    def _row_count(self):
+        return 0 if self._df is None else len(self._positions)
+
+    def _visible_count(self):
+        try:
+            rowheight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            rowheight = 20
+        # Desconta o cabeçalho (aproximadamente uma linha)
+        return max(1, self.winfo_height() // rowheight - 1)
+
+    def _fractions(self, total):
+        if total == 0:
+            return (0.0, 1.0)
+        last = min(total, self._first + self._visible_count())
+        return (self._first / total, last / total)
+
+    def _clear_items(self):
+        items = list(super().get_children()) + list(self._detached)
+        if items:
+            super().delete(*items)
+            self.widget_ops["delete"] += len(items)
+        self._detached = set()
+
+    def _render(self):
+        total = self._row_count()
+        visible = self._visible_count()
+        self._first = max(0, min(self._first, total - visible))
+        last = min(total, self._first + visible + self.BUFFER)
+
+        window = self._positions[self._first:last] if last > self._first else self._positions[:0]
+        wanted = self._keys[window].tolist()
+        ops = diff_window(list(super().get_children()), wanted, self._detached)
+
+        detach = [iid for op, iid, _ in ops if op == "detach"]
+        if detach:
+            super().detach(*detach)
+            self._detached.update(detach)
+
+        new_rows = [(iid, index) for op, iid, index in ops if op == "insert"]
+        values = display_rows(self._df.iloc[window[[index for _, index in new_rows]]]) if new_rows else []
+        new_values = dict(zip((iid for iid, _ in new_rows), values))
+        for op, iid, index in ops:
+            if op == "move":
+                super().move(iid, "", index)  # Também reanexa itens desanexados
+                self._detached.discard(iid)
+            elif op == "insert":
+                super().insert("", index, iid=iid, values=new_values[iid])
+        self.widget_ops.update(op for op, _, _ in ops)
+
+        if len(self._detached) > self.DETACHED_MAX:
+            super().delete(*self._detached)
+            self.widget_ops["delete"] += len(self._detached)
+            self._detached = set()
+
+        if wanted:
+            super().selection_set([iid for iid in wanted if iid in self._selected])
+            if self._cursor is not None and self._cursor in set(wanted):
+                super().focus(self._cursor)
+
+        # Garante que o Tk não role os itens da janela por conta própria
+        super().yview_moveto(0)
+
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._fractions(total))
+
+    def _scroll_by(self, rows):
+        self._first += rows
+        self._render()
+        return "break"
+
+    def _scroll_to(self, index):
+        visible = self._visible_count()
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + visible:
+            self._first = index - visible + 1
+        self._render()
+
+    def _keys_between(self, low, high):
+        return set(self._keys[self._positions[low:high + 1]].tolist())
+
+    # ==== Eventos ====
+    def _on_configure(self, event):
+        count = self._visible_count()
+        if count != self._last_count:
+            self._last_count = count
+            self._render()
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_native_select(self, event):
+        # Sincroniza apenas as linhas da janela; as de fora mantêm o estado
+        native = set(super().selection())
+        for iid in super().get_children():
+            if iid in native:
+                self._selected.add(iid)
+            else:
+                self._selected.discard(iid)
+
+    def _on_click(self, event):
+        if self.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None
+        iid = self.identify_row(event.y)
+        if not iid:
+            return None
+
+        anchor = self._index_of(self._anchor) if self._anchor is not None else None
+        if event.state & 0x0001 and anchor is not None:  # Shift
+            low, high = sorted((anchor, self._index_of(iid)))
+            self._selected = self._keys_between(low, high)
+            self._cursor = iid
+            self._render()
+            return "break"
+
+        if not event.state & 0x0004:  # Clique simples (sem Ctrl) substitui a seleção
+            self._selected = set()
+        self._anchor = iid
+        self._cursor = iid
+        return None
+
+    def _move_cursor(self, delta, event):
+        total = self._row_count()
+        if total == 0:
+            return "break"
+        cursor = self._index_of(self._cursor) if self._cursor is not None else None
+        start = cursor if cursor is not None else self._first - (1 if delta > 0 else 0)
+        index = max(0, min(total - 1, start + delta))
+        key = self._keys[self._positions[index]]
+
+        anchor = self._index_of(self._anchor) if self._anchor is not None else None
+        if event.state & 0x0001 and anchor is not None:
+            low, high = sorted((anchor, index))
+            self._selected = self._keys_between(low, high)
+        else:
+            self._selected = {key}
+            self._anchor = key
+        self._cursor = key
+        self._scroll_to(index)
+        return "break"